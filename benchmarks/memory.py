@@ -0,0 +1,301 @@
+""" Benchmark peak memory of lapped and core transforms
+
+Each case transforms a random signal (or the spectrogram of one) in a fresh
+process, and reports
+
+ - the peak of memory traced by :mod:`tracemalloc` during the call, which
+   includes the output and all temporaries,
+ - the ratio of the traced peak to the size of the input, i.e. the bytes
+   allocated per input byte, and
+ - the growth of the peak resident set size during the call.
+
+Sizes are given as bytes of input, so that the ratios are comparable across
+data types and channel counts.
+
+.. code-block:: bash
+
+    python benchmarks/memory.py --sizes 16M,256M,4G --channels 1,2
+    python benchmarks/memory.py --functions mdct,imdct --budget 4
+
+The exit status is 1 if any case exceeds the budgets given by
+:code:`--budget` or :code:`--max-rss`. The budget defaults to 3 bytes per
+input byte, the peak of :func:`mdct.mdct` on float64 signals before frames
+were transformed in blocks. Data types widened by the transforms, e.g.
+:code:`int16` input, need a larger budget.
+
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+
+import numpy
+
+lapped = ('mdct', 'imdct', 'mdst', 'imdst', 'cmdct', 'icmdct')
+core = tuple('core.' + name for name in lapped)
+
+units = {'': 1, 'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30, 'T': 2 ** 40}
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+
+    cases = [
+        {
+            'function': function,
+            'size': size,
+            'channels': channels,
+            'framelength': framelength,
+            'dtype': dtype,
+        }
+        for function in args.functions
+        for size in args.sizes
+        for channels in args.channels
+        for framelength in args.framelengths
+        for dtype in args.dtypes
+        if not (function.startswith('core.') and channels > 1)
+    ]
+
+    # A fresh process per case keeps peaks independent of previous cases
+    context = multiprocessing.get_context('spawn')
+    results = []
+    failures = []
+    for case in cases:
+        pool = context.Pool(1)
+        try:
+            result = pool.apply(measure, (case,))
+        finally:
+            pool.close()
+            pool.join()
+
+        result.update(case)
+        result['ratio'] = result['traced'] / result['input']
+        results.append(result)
+
+        violations = _violations(result, args.budget, args.max_rss)
+        if violations:
+            failures.append((result, violations))
+
+        if not args.json:
+            _report(result, violations)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=1, sort_keys=True)
+        print()
+
+    for result, violations in failures:
+        print(
+            "Budget exceeded by {0}: {1}".format(
+                _describe(result), ', '.join(violations)
+            ),
+            file=sys.stderr,
+        )
+
+    return 1 if failures else 0
+
+
+def measure(case):
+    """ Measure peak memory of one case, run in its own process
+
+    """
+    import mdct
+
+    function, x = _setup(mdct, case)
+
+    # Compile or load any Numba kernels before measuring
+    warmup, small = _setup(mdct, dict(case, size=0))
+    warmup(small)
+
+    baseline = _rss()
+    tracemalloc.start()
+    try:
+        function(x)
+        traced = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'input': getattr(x, 'data', x).nbytes,
+        'traced': traced,
+        'rss': max(_rss() - baseline, 0),
+    }
+
+
+def _setup(mdct, case):
+    """ Return the function of a case and its input
+
+    """
+    name = case['function']
+    framelength = case['framelength']
+    dtype = numpy.dtype(case['dtype'])
+
+    kind = name.split('.')[-1]
+    inverse = kind.startswith('i')
+    if inverse:
+        kind = kind[1:]
+
+    # Size inverse inputs like their forward inputs, so that both directions
+    # transform signals of the same length
+    samples = max(
+        case['size'] // case['channels'] // dtype.itemsize // framelength, 1
+    ) * framelength
+    x = _signal(samples, case['channels'], dtype)
+
+    if name.startswith('core.'):
+        function = getattr(mdct.fast.transforms, kind)
+        x = x.reshape(-1, framelength)
+        if inverse:
+            x = function(x)
+            function = getattr(mdct.fast.transforms, 'i' + kind)
+        return function, x
+
+    forward = getattr(mdct, kind)
+    if inverse:
+        x = forward(x, framelength=framelength)
+        return getattr(mdct, 'i' + kind), x
+    else:
+        return (
+            lambda x: forward(x, framelength=framelength, save_settings=False),
+            x,
+        )
+
+
+def _signal(samples, channels, dtype, blocksize=2 ** 20):
+    """ Return random signal, generated block by block to avoid temporaries
+    larger than the signal
+
+    """
+    shape = (samples,) if channels == 1 else (samples, channels)
+    x = numpy.empty(shape, dtype=dtype)
+    random = numpy.random.RandomState(0)
+
+    for start in range(0, samples, blocksize):
+        block = x[start:start + blocksize]
+        if numpy.issubdtype(dtype, numpy.integer):
+            block[...] = random.randint(-1000, 1000, size=block.shape)
+        else:
+            block[...] = random.uniform(-1, 1, size=block.shape)
+
+    return x
+
+
+def _rss():
+    """ Return the peak resident set size of this process in bytes
+
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _violations(result, budget, max_rss):
+    violations = []
+    if budget is not None and result['ratio'] > budget:
+        violations.append(
+            "{0:.2f} bytes per input byte > {1:.2f}".format(
+                result['ratio'], budget
+            )
+        )
+    if max_rss is not None and result['rss'] > max_rss:
+        violations.append(
+            "RSS {0} > {1}".format(_format(result['rss']), _format(max_rss))
+        )
+    return violations
+
+
+def _describe(result):
+    return "{0} ({1} {2}, {3} ch, framelength {4})".format(
+        result['function'], _format(result['input']), result['dtype'],
+        result['channels'], result['framelength'],
+    )
+
+
+def _report(result, violations):
+    print(
+        "{0:<12} {1:>9} {2:>8} {3:>3} ch {4:>6} | traced {5:>9} "
+        "({6:5.2f} x input) | RSS +{7:>9}{8}".format(
+            result['function'], _format(result['input']), result['dtype'],
+            result['channels'], result['framelength'],
+            _format(result['traced']), result['ratio'],
+            _format(result['rss']), '  FAIL' if violations else '',
+        )
+    )
+    sys.stdout.flush()
+
+
+def _format(size):
+    for unit in ('T', 'G', 'M', 'K'):
+        if size >= units[unit]:
+            return "{0:.1f}{1}B".format(size / units[unit], unit)
+    return "{0}B".format(int(size))
+
+
+def _size(text):
+    """ Parse sizes like :code:`512K` or :code:`4G`
+
+    """
+    text = text.strip().upper().rstrip('B')
+    unit = text[-1:] if text[-1:] in units else ''
+    try:
+        return int(float(text[:len(text) - len(unit)]) * units[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid size {0!r}".format(text))
+
+
+def _list(parse):
+    def function(text):
+        return [parse(item) for item in text.split(',') if item]
+    return function
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark peak memory of lapped and core transforms",
+    )
+    parser.add_argument(
+        '--functions', type=_list(str), default=list(lapped[:2]),
+        help="comma separated functions, any of {0} (default: "
+        "mdct,imdct)".format(','.join(lapped + core)),
+    )
+    parser.add_argument(
+        '--sizes', type=_list(_size), default=[_size(s) for s in (
+            '1M', '16M', '256M',
+        )],
+        help="comma separated input sizes in bytes, e.g. 16M,4G "
+        "(default: 1M,16M,256M)",
+    )
+    parser.add_argument(
+        '--channels', type=_list(int), default=[1, 2],
+        help="comma separated channel counts (default: 1,2)",
+    )
+    parser.add_argument(
+        '--framelengths', type=_list(int), default=[256, 2048],
+        help="comma separated frame lengths (default: 256,2048)",
+    )
+    parser.add_argument(
+        '--dtypes', type=_list(str), default=['float64'],
+        help="comma separated input data types of forward transforms, e.g. "
+        "float32,int16 (default: float64)",
+    )
+    parser.add_argument(
+        '--budget', type=float, default=3,
+        help="fail if more bytes than this are allocated per input byte "
+        "(default: 3)",
+    )
+    parser.add_argument(
+        '--max-rss', type=_size,
+        help="fail if the peak resident set size grows by more than this",
+    )
+    parser.add_argument(
+        '--json', action='store_true',
+        help="print results as JSON instead of a table",
+    )
+    return parser
+
+
+if __name__ == '__main__':
+    sys.exit(main())
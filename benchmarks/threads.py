@@ -0,0 +1,203 @@
+""" Benchmark throughput scaling of concurrent transforms across threads
+
+Each thread transforms its own signal repeatedly, so the work per thread is
+constant and ideal throughput grows linearly with the number of threads.
+For every thread count the benchmark reports the throughput, the speedup
+over one thread and the parallel efficiency, i.e. the speedup divided by
+the number of threads. It also checks that all threads computed the same
+results as a serial transform.
+
+.. code-block:: bash
+
+    python benchmarks/threads.py --threads 1,2,4,8
+    python3.13t benchmarks/threads.py --min-efficiency 0.8
+
+Runs on both GIL and free-threaded CPython builds. With the GIL, only the
+parts of the transforms releasing it, e.g. the FFTs, run in parallel, so
+efficiency is expected to drop with small frames. The exit status is 1 if
+the efficiency at any thread count is below :code:`--min-efficiency`.
+
+Threading inside BLAS and FFT libraries is disabled, so that threads only
+come from the benchmark itself.
+
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+for variable in (
+    'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+):
+    os.environ.setdefault(variable, '1')
+
+import numpy  # noqa: E402
+
+functions = ('mdct', 'mdst', 'cmdct', 'imdct', 'imdst', 'icmdct')
+
+
+def main(argv=None):
+    import mdct
+
+    args = _parser().parse_args(argv)
+
+    print(
+        "Python {0}, GIL {1}, {2} CPUs".format(
+            sys.version.split()[0],
+            'enabled' if _gil() else 'disabled',
+            os.cpu_count(),
+        )
+    )
+
+    function, inputs = _setup(mdct, args)
+    reference = [function(x) for x in inputs]
+
+    baseline = None
+    failures = []
+    for count in args.threads:
+        results, seconds = _run(function, inputs[:count], args.repeat)
+
+        for result, expected in zip(results, reference):
+            if not numpy.array_equal(result, expected):
+                failures.append(
+                    "{0} threads computed differing results".format(count)
+                )
+                break
+
+        throughput = count * args.repeat / seconds
+        if baseline is None:
+            baseline = throughput / count
+        speedup = throughput / baseline
+        efficiency = speedup / count
+
+        below = (
+            args.min_efficiency is not None and
+            efficiency < args.min_efficiency
+        )
+        if below:
+            failures.append(
+                "{0} threads at {1:.0%} efficiency".format(count, efficiency)
+            )
+
+        print(
+            "{0:>3} threads: {1:9.1f} transforms/s, speedup {2:5.2f}, "
+            "efficiency {3:4.0%}{4}".format(
+                count, throughput, speedup, efficiency,
+                '  FAIL' if below else '',
+            )
+        )
+        sys.stdout.flush()
+
+    for failure in failures:
+        print("Failed: {0}".format(failure), file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+def _setup(mdct, args):
+    """ Return the transform and one input per thread
+
+    """
+    random = numpy.random.RandomState(0)
+    inverse = args.function.startswith('i')
+    forward = getattr(mdct, args.function[1:] if inverse else args.function)
+
+    inputs = []
+    for i in range(max(args.threads)):
+        x = random.uniform(-1, 1, size=args.length)
+        if inverse:
+            x = forward(x, framelength=args.framelength)
+        inputs.append(x)
+
+    if inverse:
+        return getattr(mdct, args.function), inputs
+    else:
+        return (
+            lambda x: forward(
+                x, framelength=args.framelength, save_settings=False
+            ),
+            inputs,
+        )
+
+
+def _run(function, inputs, repeat):
+    """ Transform each input repeat times in its own thread
+
+    Returns the last result of each thread and the wall time from the
+    simultaneous start of all threads to the end of the last one.
+
+    """
+    barrier = threading.Barrier(len(inputs) + 1)
+    results = [None] * len(inputs)
+
+    def work(i):
+        barrier.wait()
+        for _ in range(repeat):
+            results[i] = function(inputs[i])
+
+    threads = [
+        threading.Thread(target=work, args=(i,)) for i in range(len(inputs))
+    ]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+
+    return results, time.perf_counter() - start
+
+
+def _gil():
+    """ Return whether the GIL is enabled
+
+    """
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+def _list(text):
+    return [int(item) for item in text.split(',') if item]
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark throughput scaling of concurrent transforms",
+    )
+    parser.add_argument(
+        '--function', choices=functions, default='mdct',
+        help="transform to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--threads', type=_list,
+        default=[
+            count for count in (1, 2, 4, 8) if count <= (os.cpu_count() or 1)
+        ],
+        help="comma separated thread counts, starting with the baseline "
+        "(default: powers of two up to the number of CPUs, at most 8)",
+    )
+    parser.add_argument(
+        '--length', type=int, default=2 ** 18,
+        help="samples per signal (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--framelength', type=int, default=2048,
+        help="signal frame length (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=20,
+        help="transforms per thread (default: %(default)s)",
+    )
+    parser.add_argument(
+        '--min-efficiency', type=float,
+        help="fail if the parallel efficiency drops below this fraction",
+    )
+    return parser
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,9 @@
 from . import windows
 from . import fast
 from .fast import cmdct, icmdct, mclt, imclt, mdct, imdct, mdst, imdst
+from .fast import multiresolution, mdct2, imdct2
+from .plan import MDCTPlan
+from .streaming import iter_mdct, iter_mdst, iter_cmdct
 
 """ Module for calculating lapped MDCT
 
@@ -14,4 +17,8 @@ __all__ = [
     'mdst', 'imdst',
     'cmdct', 'icmdct',
     'mclt', 'imclt',
+    'multiresolution',
+    'mdct2', 'imdct2',
+    'iter_mdct', 'iter_mdst', 'iter_cmdct',
+    'MDCTPlan',
 ]
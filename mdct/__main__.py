@@ -0,0 +1,8 @@
+""" Run the command line interface, see :mod:`mdct.cli`
+
+"""
+
+from .cli import main
+
+if __name__ == '__main__':
+    main()
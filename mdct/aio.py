@@ -0,0 +1,333 @@
+""" Module for calculating lapped MDCT on asynchronous streams
+
+All functions in this module return asynchronous generators consuming an
+asynchronous iterator of chunks and yielding blocks of results. The
+numerical work is run in an executor so the event loop is never blocked.
+
+.. code-block:: python
+
+    async for frames in mdct.aio.mdct(chunks, framelength=1024):
+        ...
+
+"""
+
+import asyncio
+
+from . import streaming
+
+__all__ = [
+    'mdct', 'imdct',
+    'mdst', 'imdst',
+    'cmdct', 'icmdct',
+    'mclt', 'imclt',
+]
+
+_done = object()
+
+
+async def _read(chunks, queue):
+    """ Read chunks into queue, blocking while the queue is full
+
+    """
+    try:
+        async for chunk in chunks:
+            await queue.put(chunk)
+    except Exception as e:
+        await queue.put(e)
+    else:
+        await queue.put(_done)
+
+
+async def _run(processor, chunks, executor, maxsize):
+    """ Feed chunks through a streaming processor in an executor
+
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=maxsize)
+    reader = asyncio.ensure_future(_read(chunks, queue))
+
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _done:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+
+            out = await loop.run_in_executor(
+                executor, processor.process, chunk
+            )
+            if out.size:
+                yield out
+
+        out = await loop.run_in_executor(executor, processor.flush)
+        if out.size:
+            yield out
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+
+
+def mdct(
+    chunks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped MDCT of asynchronous stream
+
+    Parameters
+    ----------
+    chunks : async iterable
+        The signal chunks. Each chunk may be a 1D vector of samples or a 2D
+        matrix of :code:`samples x channels`, and may be of arbitrary length.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of chunks read ahead while the previous chunk is being
+        transformed. Reading from :code:`chunks` is suspended while this
+        many chunks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+
+    See Also
+    --------
+    mdct.fast.mdct : lapped MDCT
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    analyzer = streaming.Analyzer('mdct', odd=odd, **kwargs)
+
+    return _run(analyzer, chunks, executor, maxsize)
+
+
+def imdct(
+    blocks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped inverse MDCT of asynchronous stream
+
+    Parameters
+    ----------
+    blocks : async iterable
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of blocks read ahead while the previous block is being
+        transformed. Reading from :code:`blocks` is suspended while this
+        many blocks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Synthesizer`
+
+    Yields
+    ------
+    out : array_like
+        Chunks of the output signal.
+
+    See Also
+    --------
+    mdct.fast.imdct : lapped inverse MDCT
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    synthesizer = streaming.Synthesizer('imdct', odd=odd, **kwargs)
+
+    return _run(synthesizer, blocks, executor, maxsize)
+
+
+def mdst(
+    chunks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped MDST of asynchronous stream
+
+    Parameters
+    ----------
+    chunks : async iterable
+        The signal chunks. Each chunk may be a 1D vector of samples or a 2D
+        matrix of :code:`samples x channels`, and may be of arbitrary length.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of chunks read ahead while the previous chunk is being
+        transformed. Reading from :code:`chunks` is suspended while this
+        many chunks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+
+    See Also
+    --------
+    mdct.fast.mdst : lapped MDST
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    analyzer = streaming.Analyzer('mdst', odd=odd, **kwargs)
+
+    return _run(analyzer, chunks, executor, maxsize)
+
+
+def imdst(
+    blocks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped inverse MDST of asynchronous stream
+
+    Parameters
+    ----------
+    blocks : async iterable
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of blocks read ahead while the previous block is being
+        transformed. Reading from :code:`blocks` is suspended while this
+        many blocks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Synthesizer`
+
+    Yields
+    ------
+    out : array_like
+        Chunks of the output signal.
+
+    See Also
+    --------
+    mdct.fast.imdst : lapped inverse MDST
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    synthesizer = streaming.Synthesizer('imdst', odd=odd, **kwargs)
+
+    return _run(synthesizer, blocks, executor, maxsize)
+
+
+def cmdct(
+    chunks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped complex MDCT/MCLT of asynchronous stream
+
+    Parameters
+    ----------
+    chunks : async iterable
+        The signal chunks. Each chunk may be a 1D vector of samples or a 2D
+        matrix of :code:`samples x channels`, and may be of arbitrary length.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of chunks read ahead while the previous chunk is being
+        transformed. Reading from :code:`chunks` is suspended while this
+        many chunks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+
+    See Also
+    --------
+    mdct.fast.cmdct : lapped complex MDCT
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    analyzer = streaming.Analyzer('cmdct', odd=odd, **kwargs)
+
+    return _run(analyzer, chunks, executor, maxsize)
+
+
+def icmdct(
+    blocks,
+    odd=True,
+    executor=None,
+    maxsize=1,
+    **kwargs
+):
+    """ Calculate lapped inverse complex MDCT/MCLT of asynchronous stream
+
+    Parameters
+    ----------
+    blocks : async iterable
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the transforms in. Defaults to the event loop's
+        default executor.
+    maxsize : int, optional
+        Number of blocks read ahead while the previous block is being
+        transformed. Reading from :code:`blocks` is suspended while this
+        many blocks are pending. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Synthesizer`
+
+    Yields
+    ------
+    out : array_like
+        Chunks of the output signal.
+
+    See Also
+    --------
+    mdct.fast.icmdct : lapped inverse complex MDCT
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    synthesizer = streaming.Synthesizer('icmdct', odd=odd, **kwargs)
+
+    return _run(synthesizer, blocks, executor, maxsize)
+
+
+mclt = cmdct
+imclt = icmdct
@@ -0,0 +1,361 @@
+""" Module for picking the fastest core transforms per configuration
+
+Core transforms can be computed using different strategies, see
+:mod:`mdct.fast.engines`. Which one is the fastest depends on the frame
+length, the data type and the host. Once enabled, the autotuner
+micro-benchmarks all engines supporting a configuration when it is first
+used, and routes all lapped transforms called without explicit
+:code:`transforms` to the winner.
+
+.. code-block:: python
+
+    mdct.autotune.enable('~/.cache/mdct-autotune.json')
+    mdct.autotune.warmup([256, 2048])
+    spectrum = mdct.mdct(signal, framelength=2048)
+
+Winners are cached in memory and, if a path is given, on disk, so that the
+benchmarks only run once per host.
+
+"""
+
+from __future__ import division
+
+import collections
+import json
+import os
+import platform
+import threading
+import timeit
+
+import numpy
+
+from . import framing
+from .fast import engines as engines_default
+from .fast import transforms as transforms_default
+
+__all__ = [
+    'Autotuner', 'enable', 'disable', 'warmup',
+]
+
+kinds = ('mdct', 'imdct', 'mdst', 'imdst', 'cmdct', 'icmdct')
+forward = ('mdct', 'mdst', 'cmdct')
+
+# The autotuner used by the lapped transforms, if enabled
+tuner = None
+
+
+class _FFT(object):
+    """ Wrapper around :mod:`mdct.fast.transforms` acting as an engine
+
+    """
+    name = 'fft'
+
+    def supports(self, framelength, odd):
+        return True
+
+    def __getattr__(self, kind):
+        return getattr(transforms_default, kind)
+
+
+def _engines():
+    return collections.OrderedDict(
+        (engine.name, engine) for engine in (
+            _FFT(), engines_default.DCT4(), engines_default.GEMM(),
+        )
+    )
+
+
+class Autotuner(object):
+    """ Core transforms dispatching to the fastest engine per configuration
+
+    An autotuner can be passed as :code:`transforms` to all lapped
+    transforms, or be enabled globally using :func:`enable`.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file caching the winners on disk. Winners found on other hosts
+        are ignored. Defaults to caching in memory only.
+    frames : int, optional
+        Number of frames transformed in each benchmark. Defaults to
+        :code:`64`.
+    repeat : int, optional
+        Number of repetitions of each benchmark, the fastest one counts.
+        Defaults to :code:`5`.
+
+    """
+    def __init__(self, path=None, frames=64, repeat=5):
+        self.path = None if path is None else os.path.expanduser(path)
+        self.frames = frames
+        self.repeat = repeat
+        self.engines = _engines()
+        self.winners = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None and os.path.exists(self.path):
+            self.load(self.path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def select(self, kind, framelength, odd, dtype):
+        """ Return the fastest engine for a configuration, benchmarking
+        all engines on first use
+
+        Parameters
+        ----------
+        kind : str
+            The core transform, e.g. :code:`'mdct'` or :code:`'icmdct'`.
+        framelength : int
+            The signal frame length.
+        odd : boolean
+            Oddly stacked transform.
+        dtype : numpy.dtype
+            Data type of the frames.
+
+        Returns
+        -------
+        engine : object
+            The engine providing the core transforms.
+
+        """
+        key = _key(kind, framelength, odd, dtype)
+
+        # Winners are only ever added, so known ones are read without taking
+        # the lock. Benchmarks run one at a time, to not skew each other.
+        name = self.winners.get(key)
+        if name is None:
+            with self._lock:
+                name = self.winners.get(key)
+                if name is None:
+                    name = self._benchmark(kind, framelength, odd, dtype)
+                    self.winners[key] = name
+                    if self.path is not None:
+                        self.save(self.path)
+
+        return self.engines[name]
+
+    def warmup(
+        self,
+        framelengths,
+        odd=(True, False),
+        kinds=kinds,
+        dtypes=(numpy.float64,),
+    ):
+        """ Benchmark all given configurations in advance
+
+        Parameters
+        ----------
+        framelengths : list of int
+            The signal frame lengths.
+        odd : list of boolean, optional
+            The stackings. Defaults to both.
+        kinds : list of str, optional
+            The core transforms. Defaults to all.
+        dtypes : list of numpy.dtype, optional
+            Data types of the frames. Defaults to :code:`numpy.float64`.
+
+        """
+        for framelength in framelengths:
+            for stacking in odd:
+                for kind in kinds:
+                    for dtype in dtypes:
+                        self.select(kind, framelength, stacking, dtype)
+
+    def load(self, path):
+        """ Load winners cached on disk by this host
+
+        """
+        with open(path) as f:
+            cache = json.load(f)
+
+        if cache.get('host') == _host():
+            self.winners.update(
+                (key, name) for key, name in cache['winners'].items()
+                if name in self.engines
+            )
+
+    def save(self, path):
+        """ Cache winners on disk
+
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(path, 'w') as f:
+            json.dump(
+                {'host': _host(), 'winners': dict(self.winners)}, f,
+                indent=1, sort_keys=True,
+            )
+
+    def _benchmark(self, kind, framelength, odd, dtype):
+        """ Return name of the fastest engine agreeing with the FFT engine
+
+        """
+        frames = _frames(kind, framelength, odd, dtype, self.frames)
+        reference = getattr(transforms_default, kind)(frames, odd=odd)
+        tolerance = numpy.finfo(dtype).resolution * 1e3
+
+        timings = {}
+        for name, engine in self.engines.items():
+            if not engine.supports(framelength, odd):
+                continue
+
+            function = getattr(engine, kind)
+            try:
+                result = function(frames, odd=odd)
+            except ValueError:
+                continue
+
+            if not numpy.allclose(
+                result, reference, rtol=tolerance, atol=tolerance
+            ):
+                continue
+
+            timings[name] = min(timeit.repeat(
+                lambda: function(frames, odd=odd),
+                repeat=self.repeat, number=1,
+            ))
+
+        return min(timings, key=timings.get)
+
+    def _dispatch(self, kind, x, odd, padding=0):
+        x = framing._asarray(x)
+
+        # Only the FFT engine skips the zeros of padded frames
+        if padding:
+            return getattr(transforms_default, kind)(
+                x, odd=odd, padding=padding
+            )
+
+        if kind in forward:
+            framelength = x.shape[-1]
+        elif odd:
+            framelength = x.shape[-1] * 2
+        else:
+            framelength = (x.shape[-1] - 1) * 2
+
+        engine = self.select(kind, framelength, odd, x.dtype)
+        return getattr(engine, kind)(x, odd=odd)
+
+    def mdct(self, x, odd=True, padding=0):
+        return self._dispatch('mdct', x, odd, padding)
+
+    def imdct(self, X, odd=True):
+        return self._dispatch('imdct', X, odd)
+
+    def mdst(self, x, odd=True, padding=0):
+        return self._dispatch('mdst', x, odd, padding)
+
+    def imdst(self, X, odd=True):
+        return self._dispatch('imdst', X, odd)
+
+    def cmdct(self, x, odd=True, padding=0):
+        return self._dispatch('cmdct', x, odd, padding)
+
+    def icmdct(self, X, odd=True):
+        return self._dispatch('icmdct', X, odd)
+
+    mclt = cmdct
+    imclt = icmdct
+
+
+def enable(path=None, **kwargs):
+    """ Route all lapped transforms to the fastest engines
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file caching the winners on disk.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`Autotuner`
+
+    Returns
+    -------
+    tuner : Autotuner
+        The enabled autotuner.
+
+    """
+    global tuner
+    tuner = Autotuner(path, **kwargs)
+    return tuner
+
+
+def disable():
+    """ Route all lapped transforms to :mod:`mdct.fast.transforms` again
+
+    """
+    global tuner
+    tuner = None
+
+
+def warmup(framelengths, **kwargs):
+    """ Benchmark configurations in advance, enabling the autotuner if needed
+
+    Parameters
+    ----------
+    framelengths : list of int
+        The signal frame lengths.
+    **kwargs, optional
+        Additional keyword arguments passed to :meth:`Autotuner.warmup`
+
+    """
+    if tuner is None:
+        enable()
+
+    tuner.warmup(framelengths, **kwargs)
+
+
+def _resolve(transforms):
+    """ Return transforms, or the default core transforms if None
+
+    """
+    if transforms is not None:
+        return transforms
+    elif tuner is not None:
+        return tuner
+    else:
+        return transforms_default
+
+
+def _key(kind, framelength, odd, dtype):
+    return '{0}/{1}/{2}/{3}'.format(
+        kind, framelength, 'odd' if odd else 'even',
+        numpy.finfo(numpy.result_type(dtype, numpy.float16)).dtype.name,
+    )
+
+
+def _host():
+    return {
+        'machine': platform.machine(),
+        'node': platform.node(),
+        'processor': platform.processor(),
+        'numpy': numpy.__version__,
+    }
+
+
+def _frames(kind, framelength, odd, dtype, count):
+    """ Return random frames to benchmark a core transform on
+
+    """
+    random = numpy.random.RandomState(0)
+    dtype = numpy.finfo(numpy.result_type(dtype, numpy.float16)).dtype
+
+    if kind in forward:
+        return random.randn(count, framelength).astype(dtype)
+
+    bins = framelength // 2 + (0 if odd else 1)
+    X = random.randn(count, bins).astype(dtype)
+    if kind == 'icmdct':
+        X = X + 1j * random.randn(count, bins).astype(dtype)
+        if not odd:
+            X[:, [0, -1]] = X[:, [0, -1]].real
+
+    return X
@@ -0,0 +1,276 @@
+""" Module for transforming many signals in parallel processes
+
+Signals and spectrograms are exchanged with the worker processes through
+:code:`multiprocessing.shared_memory` blocks instead of being pickled. Each
+worker receives one :class:`mdct.MDCTPlan` when it starts and reuses it for
+all signals.
+
+.. code-block:: python
+
+    with mdct.batch.forward(signals, framelength=1024) as spectra:
+        for spectrum in spectra:
+            ...
+
+.. note::
+    Shared memory requires Python 3.8 or newer.
+
+"""
+
+from __future__ import division
+
+import multiprocessing
+import multiprocessing.util
+
+import numpy
+
+from . import framing
+from .plan import MDCTPlan
+from .types import Spectrogram
+
+__all__ = [
+    'forward', 'Batch',
+]
+
+alignment = 64
+
+# Plan and shared memory blocks of the current worker process
+_state = {}
+
+
+class Batch(object):
+    """ Spectrograms of a batch transform, as views into shared memory
+
+    The spectrograms are not copied out of the shared memory, which is only
+    released once the batch is closed using :meth:`close` or by leaving it
+    as a context manager. The shared memory cannot be released while any
+    view into it is alive, so all references to the spectrograms must be
+    dropped before closing the batch. Copy spectrograms to keep them any
+    longer.
+
+    Parameters
+    ----------
+    memory : multiprocessing.shared_memory.SharedMemory
+        The shared memory block holding all spectrograms.
+    results : list of array_like
+        The spectrograms.
+
+    """
+    def __init__(self, memory, results):
+        self._memory = memory
+        self._results = results
+
+    def close(self):
+        """ Release the shared memory
+
+        Raises :code:`BufferError` if spectrograms or other views into the
+        shared memory are still referenced elsewhere. The shared memory stays
+        allocated in that case, call :meth:`close` again once they are
+        dropped.
+
+        """
+        if self._memory is not None:
+            results, self._results = self._results, []
+            del results
+            try:
+                self._memory.close()
+            except BufferError:
+                raise BufferError(
+                    "Cannot close batch while its spectrograms are "
+                    "referenced, please drop or copy them first"
+                )
+            self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def __iter__(self):
+        return iter(self._results)
+
+
+def forward(
+    signals,
+    processes=None,
+    scale=None,
+    save_settings=True,
+    layout='channels_last',
+    frames_first=None,
+    **kwargs
+):
+    """ Calculate the lapped transforms of many signals in parallel
+
+    Parameters
+    ----------
+    signals : list of array_like
+        The signals to be transformed, may differ in length and number of
+        channels, see :func:`mdct.mdct`.
+    processes : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale.
+    save_settings : boolean, optional
+        Return :class:`mdct.types.Spectrogram` objects carrying the settings
+        of the transform. Defaults to :code:`True`.
+    layout : str, optional
+        Memory layout of multichannel data, see :func:`mdct.mdct`.
+        Defaults to :code:`'channels_last'`.
+    frames_first : boolean, optional
+        Return :code:`frames x bins` instead of :code:`bins x frames`
+        spectrograms. Defaults to :code:`True` for
+        :code:`'channels_first'` layout and :code:`False` otherwise.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`mdct.MDCTPlan`, e.g.
+        :code:`kind`, :code:`framelength` and :code:`window`.
+
+    Returns
+    -------
+    out : Batch
+        The spectrograms, as views into shared memory.
+
+    """
+    from multiprocessing import shared_memory
+
+    if frames_first is None:
+        frames_first = layout == 'channels_first'
+
+    plan = MDCTPlan(**kwargs)
+    dtype = plan.result_type
+
+    signals = [
+        framing._canonical(framing._signed(framing._asarray(x)), layout)
+        for x in signals
+    ]
+    sources = _layout(
+        (x.dtype, x.shape) for x in signals
+    )
+    targets = _layout(
+        (dtype, x.shape[:-1] + (framing._total(
+            x.shape[-1], plan.framelength, plan.hopsize, plan.centered
+        ), plan.bins))
+        for x in signals
+    )
+
+    source = shared_memory.SharedMemory(create=True, size=_size(sources))
+    try:
+        for x, block in zip(signals, sources):
+            _view(source, *block)[...] = x
+
+        target = shared_memory.SharedMemory(
+            create=True, size=_size(targets)
+        )
+        try:
+            tasks = [
+                (s, t, framing._scale(x.dtype, scale))
+                for x, s, t in zip(signals, sources, targets)
+            ]
+            pool = multiprocessing.Pool(
+                processes, _initialize, (plan, source.name, target.name)
+            )
+            try:
+                pool.map(_work, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        except BaseException:
+            target.close()
+            raise
+        finally:
+            # The mapping stays valid until closed, even after unlinking
+            target.unlink()
+    finally:
+        source.close()
+        source.unlink()
+
+    results = []
+    for x, block in zip(signals, targets):
+        out = framing._orient(_view(target, *block), layout, frames_first)
+
+        if save_settings:
+            out = Spectrogram(
+                out, plan._settings(x.shape[-1], layout, frames_first)
+            )
+
+        results.append(out)
+
+    return Batch(target, results)
+
+
+def _layout(arrays):
+    """ Return aligned offsets, dtypes and shapes of consecutive arrays
+
+    """
+    blocks = []
+    offset = 0
+    for dtype, shape in arrays:
+        blocks.append((offset, numpy.dtype(dtype).str, tuple(shape)))
+        offset += int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize
+        offset += -offset % alignment
+
+    return blocks
+
+
+def _size(blocks):
+    """ Return number of bytes needed to hold blocks
+
+    """
+    if not blocks:
+        return 1
+
+    offset, dtype, shape = blocks[-1]
+    return offset + int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize or 1
+
+
+def _view(memory, offset, dtype, shape):
+    """ Return array view of block in shared memory
+
+    The view holds a buffer export of the shared memory, so that closing the
+    shared memory raises :code:`BufferError` instead of unmapping it while
+    the view is alive.
+
+    """
+    dtype = numpy.dtype(dtype)
+    size = int(numpy.prod(shape)) * dtype.itemsize
+    return numpy.asarray(
+        memory.buf[offset:offset + size]
+    ).view(dtype).reshape(shape)
+
+
+def _initialize(plan, source, target):
+    """ Attach worker process to plan and shared memory blocks
+
+    """
+    from multiprocessing import shared_memory
+
+    _state['plan'] = plan
+    for key, name in (('source', source), ('target', target)):
+        _state[key] = shared_memory.SharedMemory(name)
+        multiprocessing.util.Finalize(
+            None, _state[key].close, exitpriority=0
+        )
+
+
+def _work(task):
+    """ Transform one signal from and to shared memory
+
+    """
+    source, target, scale = task
+    x = _view(_state['source'], *source)
+    out = _view(_state['target'], *target)
+
+    _state['plan'].forward(
+        x,
+        scale=scale,
+        save_settings=False,
+        layout='channels_first',
+        frames_first=True,
+        out=out,
+    )
@@ -0,0 +1,338 @@
+""" Module for the command line interface
+
+Transforms WAV and :code:`.npy` files to spectrogram files, see
+:mod:`mdct.storage`, and back. Signals and spectrograms are read and written
+in blocks of frames, so that files of any length can be transformed.
+
+.. code-block:: bash
+
+    python -m mdct forward --framelength 1024 --dtype int16 -o specs/ audio/
+    python -m mdct inverse --jobs 4 -o audio/ specs/
+
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import functools
+import multiprocessing
+import os
+import sys
+import time
+import wave
+
+import numpy
+import scipy.io.wavfile
+
+from . import framing, storage, streaming, windows
+from .types import Settings
+
+__all__ = [
+    'main',
+]
+
+kinds = ('mdct', 'mdst', 'cmdct')
+formats = ('wav', 'npy')
+
+window_functions = {
+    'cosine': None,
+    'kbd': functools.partial(windows.kaiser_derived, beta=4),
+    'none': False,
+}
+
+
+def main(argv=None):
+    """ Run the command line interface
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command line arguments. Defaults to :code:`sys.argv[1:]`.
+
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'forward':
+        jobs = [
+            (_forward, source, _target(source, args.output, 'mdct'), args)
+            for source in _sources(args.inputs, ('.wav', '.npy'))
+        ]
+    else:
+        jobs = [
+            (_inverse, source, _target(source, args.output, args.format), args)
+            for source in _sources(args.inputs, ('.mdct',))
+        ]
+
+    collisions = _collisions(jobs)
+    if collisions:
+        parser.error(collisions)
+
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+
+    if args.jobs > 1:
+        pool = multiprocessing.Pool(args.jobs)
+        try:
+            results = pool.imap_unordered(_run, jobs)
+            for result in results:
+                _report(*result)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for job in jobs:
+            _report(*_run(job))
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='mdct',
+        description="Transform audio files to spectrogram files and back",
+    )
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    forward = commands.add_parser(
+        'forward', help="transform WAV or .npy files to spectrogram files"
+    )
+    forward.add_argument(
+        '--kind', choices=kinds, default='mdct',
+        help="transform to use (default: %(default)s)",
+    )
+    forward.add_argument(
+        '--framelength', type=int, default=2048,
+        help="signal frame length (default: %(default)s)",
+    )
+    forward.add_argument(
+        '--even', dest='odd', action='store_false',
+        help="use evenly stacked transform",
+    )
+    forward.add_argument(
+        '--window', choices=sorted(window_functions), default='cosine',
+        help="window function (default: %(default)s)",
+    )
+    forward.add_argument(
+        '--dtype', choices=storage.dtypes, default='float16',
+        help="storage type of the coefficients, quantizing to integers "
+        "transforms each file twice (default: %(default)s)",
+    )
+
+    inverse = commands.add_parser(
+        'inverse', help="transform spectrogram files to WAV or .npy files"
+    )
+    inverse.add_argument(
+        '--format', choices=formats, default='wav',
+        help="output format, WAV files are written as 16 bit PCM "
+        "(default: %(default)s)",
+    )
+    inverse.add_argument(
+        '--samplerate', type=int, default=44100,
+        help="sample rate of WAV files, if not stored in the spectrogram "
+        "file (default: %(default)s)",
+    )
+
+    for command in (forward, inverse):
+        command.add_argument(
+            'inputs', nargs='+',
+            help="input files or directories containing input files",
+        )
+        command.add_argument(
+            '-o', '--output', required=True, help="output directory",
+        )
+        command.add_argument(
+            '-j', '--jobs', type=int, default=1,
+            help="number of files transformed in parallel "
+            "(default: %(default)s)",
+        )
+        command.add_argument(
+            '--blocksize', type=int, default=256,
+            help="number of frames held in memory (default: %(default)s)",
+        )
+
+    return parser
+
+
+def _sources(inputs, extensions):
+    """ Return input files, expanding directories to the files they contain
+
+    """
+    sources = []
+    for path in inputs:
+        if os.path.isdir(path):
+            sources.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if os.path.splitext(name)[1].lower() in extensions
+            )
+        else:
+            sources.append(path)
+
+    return sources
+
+
+def _target(source, output, extension):
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(output, name + '.' + extension)
+
+
+def _collisions(jobs):
+    """ Return message listing inputs written to the same output file
+
+    """
+    sources = {}
+    for _, source, target, _ in jobs:
+        sources.setdefault(os.path.normcase(target), []).append(source)
+
+    return '; '.join(
+        "{0} would all be written to {1}".format(', '.join(names), target)
+        for target, names in sorted(sources.items()) if len(names) > 1
+    )
+
+
+def _run(job):
+    function, source, target, args = job
+
+    start = time.time()
+    samples = function(source, target, args)
+    return source, target, samples, time.time() - start
+
+
+def _report(source, target, samples, seconds):
+    print(
+        "{0} -> {1}: {2} samples in {3:.3f} s ({4:.2f} Msamples/s)".format(
+            source, target, samples, seconds,
+            samples / max(seconds, 1e-9) / 1e6,
+        )
+    )
+    sys.stdout.flush()
+
+
+def _read(source):
+    """ Return memory mapped signal and sample rate of WAV or .npy file
+
+    """
+    if source.lower().endswith('.npy'):
+        return numpy.load(source, mmap_mode='r'), None
+    else:
+        samplerate, x = scipy.io.wavfile.read(source, mmap=True)
+        return x, samplerate
+
+
+def _forward(source, target, args):
+    x, samplerate = _read(source)
+    window = window_functions[args.window]
+
+    def blocks():
+        return getattr(streaming, 'iter_' + args.kind)(
+            x, odd=args.odd, blocksize=args.blocksize,
+            framelength=args.framelength, window=window,
+        )
+
+    settings = Settings(
+        kind=args.kind,
+        odd=args.odd,
+        framelength=args.framelength,
+        hopsize=framing._hopsize(args.framelength, None, None),
+        window=window,
+        centered=True,
+        padding=0,
+        outlength=len(x),
+        layout='channels_last',
+        frames_first=False,
+    )
+    is_complex = args.kind == 'cmdct'
+
+    # Quantization needs the peak of every bin before the first frame is
+    # stored, which requires a first pass over the signal
+    peak = None
+    if args.dtype != 'float16':
+        for block in blocks():
+            block = framing._canonical(block, 'channels_last', spectral=True)
+            if is_complex:
+                block = numpy.ascontiguousarray(block).view(numpy.float64)
+
+            if peak is None:
+                peak = storage._peak(block)
+            else:
+                numpy.maximum(peak, storage._peak(block), out=peak)
+
+    bins = args.framelength // 2 + (0 if args.odd else 1)
+    spectrogram = storage.open_memmap(
+        target,
+        settings,
+        x.shape[1:] + (
+            framing._total(
+                len(x), args.framelength, settings.hopsize, True
+            ),
+            bins,
+        ),
+        complex=is_complex,
+        dtype=args.dtype,
+        peak=peak,
+        metadata={'samplerate': samplerate},
+    )
+
+    start = 0
+    for block in blocks():
+        spectrogram.quantize(block, start)
+        start += block.shape[1]
+
+    spectrogram.codes.flush()
+    return len(x)
+
+
+def _inverse(source, target, args):
+    spectrogram = storage.load(source)
+    settings = spectrogram.settings
+    samplerate = spectrogram.metadata.get('samplerate') or args.samplerate
+    channels = spectrogram.codes.shape[:-2]
+    pcm = args.format == 'wav'
+
+    synthesizer = streaming.Synthesizer(
+        'i' + settings.kind,
+        odd=settings.odd,
+        framelength=settings.framelength,
+        hopsize=settings.hopsize,
+        centered=settings.centered,
+        window=settings.window,
+        outlength=settings.outlength,
+        dtype=numpy.int16 if pcm else None,
+    )
+
+    if pcm:
+        out = wave.open(target, 'wb')
+        out.setnchannels(int(numpy.prod(channels)))
+        out.setsampwidth(2)
+        out.setframerate(samplerate)
+
+        def write(y, start):
+            out.writeframes(numpy.ascontiguousarray(y, dtype='<i2').tobytes())
+    else:
+        out = numpy.lib.format.open_memmap(
+            target, mode='w+', dtype=numpy.float64,
+            shape=(settings.outlength,) + channels,
+        )
+
+        def write(y, start):
+            out[start:start + len(y)] = y
+
+    count = spectrogram.codes.shape[-2]
+    samples = 0
+    try:
+        for start in range(0, count, args.blocksize):
+            y = synthesizer.process(
+                spectrogram.dequantize(start, start + args.blocksize)
+            )
+            write(y, samples)
+            samples += len(y)
+
+        y = synthesizer.flush()
+        write(y, samples)
+        samples += len(y)
+    finally:
+        if pcm:
+            out.close()
+        else:
+            out.flush()
+
+    return samples
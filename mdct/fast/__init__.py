@@ -8,14 +8,15 @@
 
 import functools
 
-import stft
-from . import transforms as transforms_default
+from .. import autotune, framing
 
 __all__ = [
     'mdct', 'imdct',
     'mdst', 'imdst',
     'cmdct', 'icmdct',
     'mclt', 'imclt',
+    'multiresolution',
+    'mdct2', 'imdct2',
 ]
 
 
@@ -23,6 +24,7 @@ def mdct(
     x,
     odd=True,
     transforms=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped MDCT of input signal
@@ -34,7 +36,8 @@ def mdct(
         a 2D matrix for multi channel data. In case of a mono signal, the data
         is must be a 1D vector of length :code:`samples`. In case of a multi
         channel signal, the data must be in the shape of :code:`samples x
-        channels`.
+        channels`. Arrays implementing the buffer protocol,
+        :code:`__array__` or DLPack on the CPU are used without copying.
     odd : boolean, optional
         Switch to oddly stacked transform. Defaults to :code:`True`.
     framelength : int
@@ -51,20 +54,48 @@ def mdct(
         the beginning of the signal. Defaults to :code:`True`.
         Disabling this will result in aliasing
         in the first and last half-frame.
-    window : callable, array_like
+    window : callable, array_like, tuple
         Window to be used for deringing. Can be :code:`False` to disable
-        windowing. Defaults to :code:`scipy.signal.cosine`.
+        windowing, or a pair of analysis and synthesis windows such as
+        :func:`mdct.windows.low_delay`. Defaults to
+        :code:`scipy.signal.cosine`.
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale, e.g. :code:`1 / 32768` for
+        :code:`int16` input, and to :code:`1` for floating point input.
     padding : int
         Zero-pad signal with x times the number of samples.
         Defaults to :code:`0`.
     save_settings : boolean
-        Save settings used here in attribute :code:`out.stft_settings` so that
-        :func:`ispectrogram` can infer these settings without the developer
-        having to pass them again.
+        Return a :class:`mdct.types.Spectrogram` carrying the settings used
+        here, so that :func:`imdct` can infer these settings without the
+        developer having to pass them again. Defaults to :code:`True`.
+    layout : str, optional
+        Memory layout of multichannel data. Use :code:`'channels_first'` to
+        pass :code:`channels x samples` data and receive a C-contiguous
+        :code:`channels x frames x bins` tensor without any transposition.
+        Defaults to :code:`'channels_last'`.
+    frames_first : boolean, optional
+        Return :code:`frames x bins` instead of :code:`bins x frames`
+        spectrograms. Frames-first mono output is C-contiguous, so frame-wise
+        consumers can read rows without transposing. Defaults to :code:`True`
+        for :code:`'channels_first'` layout and :code:`False` otherwise.
+    axis : int, optional
+        Transform along this axis of an N-D signal, e.g. of images or
+        feature maps, without transposing it. The axis is replaced by the
+        bins and frames axes, all other axes are transformed as a batch.
+        Overrides :code:`layout`. Defaults to the sample axis of
+        :code:`layout`.
+    like : array_like, optional
+        Return the spectrogram as array of the same library as :code:`like`,
+        e.g. the input signal, found using its Array API namespace. Arrays
+        are exchanged using DLPack where possible, and returned without
+        settings. Defaults to NumPy arrays.
 
     Returns
     -------
@@ -79,34 +110,39 @@ def mdct(
     mdct.fast.transforms.mdct : MDCT
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
 
     kwargs.setdefault('framelength', 2048)
 
     if not odd:
-        return stft.spectrogram(
+        return framing.spectrogram(
             x,
+            scale=scale,
+            kind='mdct',
+            odd=odd,
             transform=[
                 functools.partial(transforms.mdct, odd=False),
                 functools.partial(transforms.mdst, odd=False),
             ],
-            halved=False,
             **kwargs
         )
     else:
-        return stft.spectrogram(
+        return framing.spectrogram(
             x,
+            scale=scale,
+            kind='mdct',
+            odd=odd,
             transform=transforms.mdct,
-            halved=False,
             **kwargs
         )
 
 
 def imdct(
     X,
-    odd=True,
+    odd=None,
     transforms=None,
+    dtype=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped inverse MDCT of input signal
@@ -120,7 +156,8 @@ def imdct(
         channel signal, the data must be in the shape of :code:`bins x frames x
         channels`.
     odd : boolean, optional
-        Switch to oddly stacked transform. Defaults to :code:`True`.
+        Switch to oddly stacked transform. Defaults to infer from data, or
+        :code:`True`.
     framelength : int
         The signal frame length. Defaults to infer from data.
     hopsize : int
@@ -136,16 +173,21 @@ def imdct(
         the beginning of the signal. Defaults to to infer from data.
         The first and last half-frame will have aliasing, so using
         centering during forward MDCT is recommended.
-    window : callable, array_like
+    window : callable, array_like, tuple
         Window to be used for deringing. Can be :code:`False` to disable
-        windowing. Defaults to to infer from data.
-    halved : boolean
-        Switch to reconstruct the other halve of the spectrum if the forward
-        transform has been truncated. Defaults to to infer from data.
+        windowing. If a pair of analysis and synthesis windows is given,
+        the synthesis window is used. Defaults to to infer from data.
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
     padding : int
         Zero-pad signal with x times the number of samples. Defaults to infer
         from data.
@@ -154,6 +196,21 @@ def imdct(
         did not fit into framelength and input data had to be padded. Not
         setting this value will disable cropping, the output data may be
         longer than expected.
+    layout : str, optional
+        Memory layout of multichannel data. Use :code:`'channels_first'` to
+        pass :code:`channels x frames x bins` data and receive
+        :code:`channels x samples` output. Defaults to infer from data.
+    frames_first : boolean, optional
+        The spectrogram is in the shape of :code:`frames x bins` instead of
+        :code:`bins x frames`. Defaults to infer from data.
+    axis : int, optional
+        Position of the bins axis of an N-D spectrogram computed using
+        :code:`axis`, see :func:`mdct`. Defaults to infer from data.
+    like : array_like, optional
+        Return the signal as array of the same library as :code:`like`,
+        e.g. the input signal, found using its Array API namespace. Arrays
+        are exchanged using DLPack where possible, and returned without
+        settings. Defaults to NumPy arrays.
 
     Returns
     -------
@@ -165,26 +222,30 @@ def imdct(
     mdct.fast.transforms.imdct : inverse MDCT
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
 
-    kwargs.setdefault('framelength', 2048)
+    if odd is None:
+        odd = framing._infer(X, 'odd', True)
+
+    kwargs.setdefault('framelength', framing._infer(X, 'framelength', 2048))
 
     if not odd:
-        return stft.ispectrogram(
+        return framing.ispectrogram(
             X,
+            dtype=dtype,
+            scale=scale,
             transform=[
                 functools.partial(transforms.imdct, odd=False),
                 functools.partial(transforms.imdst, odd=False),
             ],
-            halved=False,
             **kwargs
         )
     else:
-        return stft.ispectrogram(
+        return framing.ispectrogram(
             X,
+            dtype=dtype,
+            scale=scale,
             transform=transforms.imdct,
-            halved=False,
             **kwargs
         )
 
@@ -193,6 +254,7 @@ def mdst(
     x,
     odd=True,
     transforms=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped MDST of input signal
@@ -206,8 +268,13 @@ def mdst(
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
-        Additional keyword arguments passed to :code:`stft.spectrogram`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale, e.g. :code:`1 / 32768` for
+        :code:`int16` input, and to :code:`1` for floating point input.
+        Additional keyword arguments passed to :func:`mdct.framing.spectrogram`
 
     Returns
     -------
@@ -219,34 +286,39 @@ def mdst(
     mdct.fast.transforms.mdst : MDST
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
 
     kwargs.setdefault('framelength', 2048)
 
     if not odd:
-        return stft.spectrogram(
+        return framing.spectrogram(
             x,
+            scale=scale,
+            kind='mdst',
+            odd=odd,
             transform=[
                 functools.partial(transforms.mdst, odd=False),
                 functools.partial(transforms.mdct, odd=False),
             ],
-            halved=False,
             **kwargs
         )
     else:
-        return stft.spectrogram(
+        return framing.spectrogram(
             x,
+            scale=scale,
+            kind='mdst',
+            odd=odd,
             transform=transforms.mdst,
-            halved=False,
             **kwargs
         )
 
 
 def imdst(
     X,
-    odd=True,
+    odd=None,
     transforms=None,
+    dtype=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped inverse MDST of input signal
@@ -256,12 +328,20 @@ def imdst(
     x : array_like
         The input signal
     odd : boolean, optional
-        Switch to oddly stacked transform. Defaults to :code:`True`.
+        Switch to oddly stacked transform. Defaults to infer from data, or
+        :code:`True`.
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
-        Additional keyword arguments passed to :code:`stft.spectrogram`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+        Additional keyword arguments passed to :func:`mdct.framing.spectrogram`
 
     Returns
     -------
@@ -273,26 +353,30 @@ def imdst(
     mdct.fast.transforms.imdst : inverse MDST
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
 
-    kwargs.setdefault('framelength', 2048)
+    if odd is None:
+        odd = framing._infer(X, 'odd', True)
+
+    kwargs.setdefault('framelength', framing._infer(X, 'framelength', 2048))
 
     if not odd:
-        return stft.ispectrogram(
+        return framing.ispectrogram(
             X,
+            dtype=dtype,
+            scale=scale,
             transform=[
                 functools.partial(transforms.imdst, odd=False),
                 functools.partial(transforms.imdct, odd=False),
             ],
-            halved=False,
             **kwargs
         )
     else:
-        return stft.ispectrogram(
+        return framing.ispectrogram(
             X,
+            dtype=dtype,
+            scale=scale,
             transform=transforms.imdst,
-            halved=False,
             **kwargs
         )
 
@@ -301,6 +385,7 @@ def cmdct(
     x,
     odd=True,
     transforms=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped complex MDCT/MCLT of input signal
@@ -314,9 +399,14 @@ def cmdct(
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale, e.g. :code:`1 / 32768` for
+        :code:`int16` input, and to :code:`1` for floating point input.
     **kwargs, optional
-        Additional keyword arguments passed to :code:`stft.spectrogram`
+        Additional keyword arguments passed to :func:`mdct.framing.spectrogram`
 
     Returns
     -------
@@ -328,21 +418,24 @@ def cmdct(
     mdct.fast.transforms.cmdct : complex MDCT
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
 
-    return stft.spectrogram(
+    return framing.spectrogram(
         x,
+        scale=scale,
+        kind='cmdct',
+        odd=odd,
         transform=functools.partial(transforms.cmdct, odd=odd),
-        halved=False,
         **kwargs
     )
 
 
 def icmdct(
     X,
-    odd=True,
+    odd=None,
     transforms=None,
+    dtype=None,
+    scale=None,
     **kwargs
 ):
     """ Calculate lapped inverse complex MDCT/MCLT of input signal
@@ -352,12 +445,20 @@ def icmdct(
     x : array_like
         The input signal
     odd : boolean, optional
-        Switch to oddly stacked transform. Defaults to :code:`True`.
+        Switch to oddly stacked transform. Defaults to infer from data, or
+        :code:`True`.
     transforms : module, optional
         Module reference to core transforms. Mostly used to replace
         fast with slow core transforms, for testing. Defaults to
-        :mod:`mdct.fast`
-        Additional keyword arguments passed to :code:`stft.spectrogram`
+        :mod:`mdct.fast`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+        Additional keyword arguments passed to :func:`mdct.framing.spectrogram`
 
     Returns
     -------
@@ -369,16 +470,213 @@ def icmdct(
     mdct.fast.transforms.icmdct : inverse complex MDCT
 
     """
-    if transforms is None:
-        transforms = transforms_default
+    transforms = autotune._resolve(transforms)
+
+    if odd is None:
+        odd = framing._infer(X, 'odd', True)
 
-    return stft.ispectrogram(
+    return framing.ispectrogram(
         X,
+        dtype=dtype,
+        scale=scale,
         transform=functools.partial(transforms.icmdct, odd=odd),
-        halved=False,
         **kwargs
     )
 
 
+def multiresolution(
+    x,
+    framelengths,
+    kind='mdct',
+    odd=True,
+    transforms=None,
+    scale=None,
+    **kwargs
+):
+    """ Calculate lapped transforms of input signal using several frame
+    lengths at once
+
+    The input signal is converted only once, and the frames of all frame
+    lengths are cut from the same signal. This is cheaper than calling
+    :func:`mdct` once per frame length.
+
+    Parameters
+    ----------
+    x : array_like
+        The signal to be transformed, see :func:`mdct`.
+    framelengths : list of int
+        The signal frame lengths, e.g. :code:`[256, 1024, 4096]`.
+    kind : str, optional
+        The transform to use, one of :code:`'mdct'`, :code:`'mdst'` and
+        :code:`'cmdct'`. Defaults to :code:`'mdct'`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :func:`mdct.framing.spectrograms`. The window must be callable.
+
+    Returns
+    -------
+    out : list of array_like
+        One spectrogram per frame length, equal to the results of the
+        respective lapped transform. Each can be inverted by its inverse
+        transform on its own.
+
+    """
+    transforms = autotune._resolve(transforms)
+
+    if kind not in ('mdct', 'mdst', 'cmdct'):
+        raise ValueError("Unknown kind {0!r}".format(kind))
+
+    return framing.spectrograms(
+        x,
+        scale=scale,
+        kind=kind,
+        odd=odd,
+        transform=framing._transforms(transforms, kind, odd),
+        framelengths=framelengths,
+        **kwargs
+    )
+
+
+def mdct2(
+    x,
+    axes=(-2, -1),
+    odd=True,
+    transforms=None,
+    scale=None,
+    **kwargs
+):
+    """ Calculate separable lapped MDCT along several axes of input signal
+
+    Each axis is transformed in turn by :func:`mdct`, starting with the
+    last one. All frames of one pass, across all other axes, are transformed
+    by a single batched FFT over contiguous memory.
+
+    Parameters
+    ----------
+    x : array_like
+        The N-D signal to be transformed, e.g. an image.
+    axes : tuple of int, optional
+        The axes to transform. Defaults to the last two axes.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale.
+    **kwargs, optional
+        Additional keyword arguments passed to :func:`mdct`, used for all
+        axes.
+
+    Returns
+    -------
+    out : array_like
+        The spectrogram as plain array, with each transformed axis replaced
+        by its bins and frames axes. For an image of :code:`height x width`
+        this is :code:`bins x frames x bins x frames`.
+
+    """
+    x = framing._asarray(x)
+    axes = _axes(axes, x.ndim)
+    kwargs['save_settings'] = False
+
+    for axis in axes[::-1]:
+        x = mdct(
+            x, odd=odd, transforms=transforms, scale=scale, axis=axis,
+            **kwargs
+        )
+        scale = None
+
+    return x
+
+
+def imdct2(
+    X,
+    axes=(-2, -1),
+    outlength=None,
+    odd=True,
+    transforms=None,
+    dtype=None,
+    scale=None,
+    **kwargs
+):
+    """ Calculate separable inverse lapped MDCT along several axes of input
+    spectrogram
+
+    Parameters
+    ----------
+    X : array_like
+        The spectrogram computed using :func:`mdct2`.
+    axes : tuple of int, optional
+        The axes of the signal that were transformed. Defaults to the last
+        two axes.
+    outlength : tuple of int, optional
+        Lengths of the signal along :code:`axes`. Defaults to no cropping,
+        the output data may be longer than expected.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+    **kwargs, optional
+        Additional keyword arguments passed to :func:`imdct`, used for all
+        axes.
+
+    Returns
+    -------
+    out : array_like
+        The output signal
+
+    """
+    X = framing._asarray(getattr(X, 'data', X))
+    axes = _axes(axes, X.ndim - len(_tuple(axes)))
+    if outlength is None:
+        outlength = (None,) * len(axes)
+
+    # Transformed axis i is preceded by the frames axes of the i axes
+    # before it
+    for i in range(len(axes))[::-1]:
+        X = imdct(
+            X, odd=odd, transforms=transforms, axis=axes[i] + i,
+            outlength=outlength[i],
+            dtype=dtype if i == 0 else None, scale=scale,
+            **kwargs
+        )
+
+    return X
+
+
+def _tuple(axes):
+    return tuple(axes) if isinstance(axes, (list, tuple)) else (axes,)
+
+
+def _axes(axes, ndim):
+    """ Return sorted non-negative unique axes
+
+    """
+    axes = sorted(framing._axis(axis, ndim) for axis in _tuple(axes))
+    if len(set(axes)) != len(axes):
+        raise ValueError("Axes must be unique")
+    return axes
+
+
 mclt = cmdct
 imclt = icmdct
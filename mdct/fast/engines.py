@@ -0,0 +1,162 @@
+""" Module for alternative core transforms
+
+Each engine provides the same core transforms as
+:mod:`mdct.fast.transforms` with the same results, computed using a
+different strategy. Which one is the fastest depends on the frame length,
+the data type and the host, see :mod:`mdct.autotune`.
+
+.. warning::
+    Functions defined in this module are used by :mod:`mdct.autotune`,
+    please do not use this module directly.
+
+"""
+
+from __future__ import division
+
+import numpy
+import scipy.fft
+
+from .. import framing
+from . import transforms
+
+__all__ = [
+    'DCT4', 'GEMM',
+]
+
+
+class DCT4(object):
+    """ Core transforms folding frames into a DCT-IV of half their length
+
+    Only oddly stacked transforms of frame lengths divisible by four are
+    supported.
+
+    """
+    name = 'dct4'
+
+    def supports(self, framelength, odd):
+        return odd and framelength % 4 == 0
+
+    def _check(self, odd):
+        if not odd:
+            raise ValueError("DCT-IV engine only supports odd stacking")
+
+    def mdct(self, x, odd=True):
+        self._check(odd)
+        a, b, c, d = numpy.split(x, 4, axis=-1)
+
+        return scipy.fft.dct(
+            numpy.concatenate(
+                (-c[..., ::-1] - d, a - b[..., ::-1]), axis=-1
+            ),
+            type=4, norm='ortho', axis=-1,
+        )
+
+    def imdct(self, X, odd=True):
+        self._check(odd)
+        y = scipy.fft.dct(X, type=4, norm='ortho', axis=-1)
+        u, v = numpy.split(y, 2, axis=-1)
+
+        return numpy.concatenate(
+            (v, -v[..., ::-1], -u[..., ::-1], -u), axis=-1
+        )
+
+    def mdst(self, x, odd=True):
+        # Reversing the frame turns the cosine into an alternating sine
+        # modulation
+        X = self.mdct(x[..., ::-1], odd=odd)
+        X[..., 0::2] *= -1
+        return X
+
+    def imdst(self, X, odd=True):
+        X = numpy.array(X)
+        X[..., 0::2] *= -1
+        return self.imdct(X, odd=odd)[..., ::-1]
+
+    def cmdct(self, x, odd=True):
+        return (
+            self.mdct(x, odd=odd) - 1j * self.mdst(x, odd=odd)
+        ) * numpy.sqrt(0.5)
+
+    def icmdct(self, X, odd=True):
+        X = numpy.asarray(X)
+        return (
+            self.imdct(X.real, odd=odd) - self.imdst(X.imag, odd=odd)
+        ) * numpy.sqrt(0.5)
+
+
+class GEMM(object):
+    """ Core transforms as matrix products with the cached transform matrices
+
+    Matrices are computed by transforming the identity matrix using
+    :mod:`mdct.fast.transforms`, and shared read-only by all threads. Only
+    frame lengths up to :attr:`maxlength` are supported, as the matrices
+    grow quadratically.
+
+    """
+    name = 'gemm'
+    maxlength = 1024
+
+    def __init__(self):
+        self._matrices = {}
+
+    def supports(self, framelength, odd):
+        return framelength <= self.maxlength
+
+    def _matrix(self, kind, length, odd, dtype, imaginary=False):
+        """ Return the matrix of transform kind for inputs of length
+
+        """
+        def compute():
+            eye = numpy.eye(length)
+            if imaginary:
+                eye = eye * 1j
+
+            matrix = getattr(transforms, kind)(eye, odd=odd)
+            if numpy.iscomplexobj(matrix):
+                return numpy.ascontiguousarray(matrix, dtype=dtype)
+            else:
+                return numpy.ascontiguousarray(
+                    matrix, dtype=numpy.finfo(dtype).dtype
+                )
+
+        return framing._cached(
+            self._matrices,
+            (kind, length, odd, numpy.dtype(dtype).char, imaginary),
+            compute,
+        )
+
+    def _product(self, kind, x, odd, dtype):
+        return numpy.dot(
+            x, self._matrix(kind, x.shape[-1], odd, dtype)
+        )
+
+    def mdct(self, x, odd=True):
+        return self._product('mdct', x, odd, x.dtype)
+
+    def imdct(self, X, odd=True):
+        return self._product('imdct', X, odd, X.dtype)
+
+    def mdst(self, x, odd=True):
+        return self._product('mdst', x, odd, x.dtype)
+
+    def imdst(self, X, odd=True):
+        return self._product('imdst', X, odd, X.dtype)
+
+    def cmdct(self, x, odd=True):
+        return self._product(
+            'cmdct', x, odd, numpy.result_type(x.dtype, numpy.complex64)
+        )
+
+    def icmdct(self, X, odd=True):
+        # The inverse is not complex linear, as it returns a real signal
+        X = numpy.asarray(X)
+        dtype = numpy.finfo(X.dtype).dtype
+        real = numpy.dot(
+            numpy.ascontiguousarray(X.real),
+            self._matrix('icmdct', X.shape[-1], odd, dtype),
+        )
+        real += numpy.dot(
+            numpy.ascontiguousarray(X.imag),
+            self._matrix('icmdct', X.shape[-1], odd, dtype, imaginary=True),
+        )
+        return real
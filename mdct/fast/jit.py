@@ -0,0 +1,207 @@
+""" Module for fused kernels compiled using Numba
+
+Each kernel replaces several passes of NumPy operations over the frames by
+a single compiled loop. If Numba is not installed, or :code:`enabled` is
+set to :code:`False`, equivalent NumPy operations are used instead, giving
+the same numerical results. Compiled kernels are cached on disk, so that
+new processes, e.g. the workers of :mod:`mdct.batch`, do not compile them
+again.
+
+.. warning::
+    Functions defined in this module are used by :class:`mdct.MDCTPlan`,
+    the core transforms in :mod:`mdct.fast.transforms` and the lapped
+    inverse transforms, please do not use this module directly.
+
+"""
+
+from __future__ import division
+
+import numpy
+
+from .. import framing
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+__all__ = [
+    'multiply', 'postmultiply', 'overlap_add',
+]
+
+available = numba is not None
+enabled = available
+
+
+def _jit(function):
+    """ Compile function if Numba is available
+
+    """
+    if numba is None:
+        return None
+
+    return numba.njit(nogil=True, cache=True)(function)
+
+
+def _multiply(frames, table, out):
+    channels, count, length = out.shape
+    for c in range(channels):
+        for i in range(count):
+            for n in range(length):
+                out[c, i, n] = frames[c, i, n] * table[n]
+            for n in range(length, frames.shape[2]):
+                out[c, i, n % length] += frames[c, i, n] * table[n]
+
+
+def _postmultiply(X, table, out):
+    channels, count, length = out.shape
+    for c in range(channels):
+        for i in range(count):
+            for k in range(length):
+                out[c, i, k] = (X[c, i, k % X.shape[2]] * table[k]).real
+
+
+def _overlap_add(frames, table, hopsize, out):
+    channels, count, length = frames.shape
+    for c in range(channels):
+        for i in range(count):
+            start = i * hopsize
+            for n in range(len(table)):
+                out[c, start + n] += (frames[c, i, n % length] * table[n]).real
+
+
+_multiply_jit = _jit(_multiply)
+_postmultiply_jit = _jit(_postmultiply)
+_overlap_add_jit = _jit(_overlap_add)
+
+
+def _use_jit(*arrays):
+    return enabled and available and all(a.ndim <= 3 for a in arrays)
+
+
+def _3d(a):
+    """ Return view of a with exactly three axes
+
+    """
+    return a.reshape((1,) * (3 - a.ndim) + a.shape)
+
+
+def _wrap(X, length):
+    """ Return X repeated or cropped to length on the last axis
+
+    """
+    if X.shape[-1] >= length:
+        return X[..., :length]
+    else:
+        return X[..., numpy.arange(length) % X.shape[-1]]
+
+
+def multiply(frames, table, out):
+    """ Multiply frames by a table, e.g. window and pre-twiddle factors, and
+    fold them
+
+    Parameters
+    ----------
+    frames : array_like
+        Frames in the shape of :code:`... x frames x framelength`, may be a
+        strided view.
+    table : array_like
+        Table of length :code:`framelength`.
+    out : array_like
+        Output array in the shape of :code:`... x frames x length`. If
+        :code:`length` is a fraction of :code:`framelength`, consecutive
+        segments of the products are summed up.
+
+    Returns
+    -------
+    out : array_like
+        The output array.
+
+    """
+    length = out.shape[-1]
+
+    if _use_jit(frames, out):
+        _multiply_jit(_3d(frames), table, _3d(out))
+    else:
+        numpy.multiply(frames[..., :length], table[:length], out=out)
+        for start in range(length, frames.shape[-1], length):
+            out += frames[..., start:start + length] * table[
+                start:start + length
+            ]
+
+    return out
+
+
+def postmultiply(X, table, out):
+    """ Multiply spectra by a table, e.g. post-twiddle factors, and take
+    the real part
+
+    Parameters
+    ----------
+    X : array_like
+        Spectra in the shape of :code:`... x frames x bins`, repeated
+        periodically if shorter than :code:`table`.
+    table : array_like
+        Table of length :code:`length`.
+    out : array_like
+        Real output array in the shape of :code:`... x frames x length`.
+
+    Returns
+    -------
+    out : array_like
+        The output array.
+
+    """
+    if _use_jit(X, out):
+        _postmultiply_jit(_3d(X), table, _3d(out))
+    else:
+        # Real part of the products, without complex temporaries
+        period = X.shape[-1]
+        for start in range(0, len(table), period):
+            segment = table[start:start + period]
+            part = X[..., :len(segment)]
+            view = out[..., start:start + len(segment)]
+            numpy.multiply(part.real, segment.real, out=view)
+            if numpy.iscomplexobj(part) and numpy.iscomplexobj(segment):
+                view -= part.imag * segment.imag
+
+    return out
+
+
+def overlap_add(frames, table, hopsize):
+    """ Multiply frames by a table, e.g. post-twiddle factors and window,
+    take the real part and overlap-add them
+
+    Parameters
+    ----------
+    frames : array_like
+        Frames in the shape of :code:`... x frames x length`, repeated
+        periodically if shorter than :code:`table`.
+    table : array_like
+        Table of length :code:`framelength`.
+    hopsize : int
+        The signal frame hopsize.
+
+    Returns
+    -------
+    out : array_like
+        The signal in the shape of :code:`... x samples`.
+
+    """
+    framelength = len(table)
+
+    if not _use_jit(frames):
+        return framing._overlap_add(
+            numpy.real(_wrap(frames, framelength) * table), hopsize
+        )
+
+    count = frames.shape[-2]
+    out = numpy.zeros(
+        frames.shape[:-2] + (framelength + max(count - 1, 0) * hopsize,),
+        dtype=numpy.result_type(frames.real.dtype, table.real.dtype)
+    )
+    _overlap_add_jit(_3d(frames), table, hopsize, out.reshape(
+        (-1, out.shape[-1])
+    ))
+
+    return out
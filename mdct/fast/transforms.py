@@ -10,6 +10,9 @@ from __future__ import division
 import numpy
 import scipy
 
+from .. import framing
+from . import jit
+
 __all__ = [
     'mdct', 'imdct',
     'mdst', 'imdst',
@@ -18,7 +21,7 @@ __all__ = [
 ]
 
 
-def mdct(x, odd=True):
+def mdct(x, odd=True, padding=0):
     """ Calculate modified discrete cosine transform of input signal
 
     Parameters
@@ -27,6 +30,9 @@ def mdct(x, odd=True):
         The input signal
     odd : boolean, optional
         Switch to oddly stacked transform. Defaults to :code:`True`.
+    padding : int, optional
+        Transform frames as if zero-padded with x times their length, without
+        padding them. Defaults to :code:`0`.
 
     Returns
     -------
@@ -34,7 +40,7 @@ def mdct(x, odd=True):
         The output signal
 
     """
-    return numpy.real(cmdct(x, odd=odd)) * numpy.sqrt(2)
+    return _real(x, odd, padding, numpy.sqrt(2))
 
 
 def imdct(X, odd=True):
@@ -53,10 +59,10 @@ def imdct(X, odd=True):
         The output signal
 
     """
-    return icmdct(X, odd=odd) * numpy.sqrt(2)
+    return _inverse(X, odd, numpy.sqrt(2))
 
 
-def mdst(x, odd=True):
+def mdst(x, odd=True, padding=0):
     """ Calculate modified discrete sine transform of input signal
 
     Parameters
@@ -65,6 +71,9 @@ def mdst(x, odd=True):
         The input signal
     odd : boolean, optional
         Switch to oddly stacked transform. Defaults to :code:`True`.
+    padding : int, optional
+        Transform frames as if zero-padded with x times their length, without
+        padding them. Defaults to :code:`0`.
 
     Returns
     -------
@@ -72,7 +81,8 @@ def mdst(x, odd=True):
         The output signal
 
     """
-    return -1 * numpy.imag(cmdct(x, odd=odd)) * numpy.sqrt(2)
+    # The real part of 1j * X is the negative imaginary part of X
+    return _real(x, odd, padding, 1j * numpy.sqrt(2))
 
 
 def imdst(X, odd=True):
@@ -91,18 +101,22 @@ def imdst(X, odd=True):
         The output signal
 
     """
-    return -1 * icmdct(X * 1j, odd=odd) * numpy.sqrt(2)
+    return _inverse(X, odd, -1j * numpy.sqrt(2))
 
 
-def cmdct(x, odd=True):
+def cmdct(x, odd=True, padding=0):
     """ Calculate complex MDCT/MCLT of input signal
 
     Parameters
     ----------
     x : array_like
-        The input signal
+        The input signal. Multidimensional input is transformed along the
+        last axis.
     odd : boolean, optional
         Switch to oddly stacked transform. Defaults to :code:`True`.
+    padding : int, optional
+        Transform frames as if zero-padded with x times their length, without
+        padding them. Defaults to :code:`0`.
 
     Returns
     -------
@@ -110,28 +124,21 @@ def cmdct(x, odd=True):
         The output signal
 
     """
-    N = len(x) // 2
-    n0 = (N + 1) / 2
+    A, N = _spectrum(x, odd, padding)
+    modulation = _modulation(-1, N, odd)
+
     if odd:
-        outlen = N
-        pre_twiddle = numpy.exp(-1j * numpy.pi * numpy.arange(N * 2) / (N * 2))
-        offset = 0.5
+        X = numpy.empty(A.shape, dtype=A.dtype)
+        numpy.multiply(
+            A[..., :(N + 1) // 2], modulation[0::2], out=X[..., 0::2]
+        )
+        tail = numpy.conjugate(A[..., :(N - 1) // 2:-1], out=X[..., 1::2])
+        tail *= modulation[1::2]
     else:
-        outlen = N + 1
-        pre_twiddle = 1.0
-        offset = 0.0
-
-    post_twiddle = numpy.exp(
-        -1j * numpy.pi * n0 * (numpy.arange(outlen) + offset) / N
-    )
-
-    X = scipy.fft.fft(x * pre_twiddle)[:outlen]
-
-    if not odd:
-        X[0] *= numpy.sqrt(0.5)
-        X[-1] *= numpy.sqrt(0.5)
+        X = A
+        X *= modulation
 
-    return X * post_twiddle * numpy.sqrt(1 / N)
+    return X
 
 
 def icmdct(X, odd=True):
@@ -140,7 +147,8 @@ def icmdct(X, odd=True):
     Parameters
     ----------
     X : array_like
-        The input signal
+        The input signal. Multidimensional input is transformed along the
+        last axis.
     odd : boolean, optional
         Switch to oddly stacked transform. Defaults to :code:`True`.
 
@@ -150,44 +158,201 @@ def icmdct(X, odd=True):
         The output signal
 
     """
-    if not odd and len(X) % 2 == 0:
+    return _inverse(X, odd, 1)
+
+
+def _spectrum(x, odd, padding):
+    """ Return the FFT of the pre-twiddled frames, before post-twiddling,
+    and the number of bins N
+
+    """
+    x = framing._asarray(x)
+    length = x.shape[-1]
+    N = length * (padding + 1) // 2
+
+    if not odd:
+        return scipy.fft.rfft(x, n=length * (padding + 1), axis=-1), N
+
+    # Fold both halves of the real frame into one complex sequence of length
+    # N, whose FFT yields the even bins directly and the odd bins by
+    # conjugate symmetry. Padded frames leave the second half empty, and the
+    # tail of the sequence zero.
+    z = numpy.empty(
+        x.shape[:-1] + (N,), dtype=numpy.result_type(x.dtype, numpy.complex128)
+    )
+    if padding:
+        z[..., length:] = 0
+        jit.multiply(x, _twiddle(-1, length, N * 4), z[..., :length])
+    else:
+        jit.multiply(x, _folding(N), z)
+
+    return scipy.fft.fft(z, axis=-1, overwrite_x=True), N
+
+
+def _real(x, odd, padding, factor):
+    """ Return the real part of the complex MDCT multiplied by factor
+
+    The modulation, the factor and the real part are applied in one pass by
+    :func:`mdct.fast.jit.postmultiply`.
+
+    """
+    A, N = _spectrum(x, odd, padding)
+    table = _postmodulation(N, odd, factor)
+    out = numpy.empty(A.shape[:-1] + (len(table),), dtype=A.real.dtype)
+
+    if odd:
+        jit.postmultiply(A[..., :(N + 1) // 2], table[0::2], out[..., 0::2])
+        jit.postmultiply(
+            A[..., :(N - 1) // 2:-1], table[1::2], out[..., 1::2]
+        )
+    else:
+        jit.postmultiply(A, table, out)
+
+    return out
+
+
+def _inverse(X, odd, factor):
+    """ Return the inverse complex MDCT of X multiplied by factor
+
+    Real transforms are inverted by multiplying their coefficients by a
+    complex factor before unfolding them. Oddly stacked frames are unfolded
+    by :func:`mdct.fast.jit.postmultiply`.
+
+    """
+    X = framing._asarray(X)
+    if not odd and X.shape[-1] % 2 == 0:
         raise ValueError(
             "Even inverse CMDCT requires an odd number "
             "of coefficients"
         )
 
-    X = X.copy()
+    N = X.shape[-1] - (0 if odd else 1)
+    table = _demodulation(N, odd, factor)
 
-    if odd:
-        N = len(X)
-        n0 = (N + 1) / 2
+    if not odd:
+        return scipy.fft.irfft(X * table, n=N * 2, axis=-1, overwrite_x=True)
+
+    # Unfold the bins into the length N sequence of the forward transform
+    # and unfold its inverse FFT into both halves of the frame
+    B = numpy.empty(X.shape, dtype=numpy.result_type(X.dtype, table.dtype))
+    numpy.multiply(X[..., 0::2], table[0::2], out=B[..., :(N + 1) // 2])
+    tail = numpy.multiply(
+        X[..., 1::2][..., ::-1], table[1::2][::-1],
+        out=B[..., (N + 1) // 2:],
+    )
+    numpy.conjugate(tail, out=tail)
 
-        post_twiddle = numpy.exp(
-            1j * numpy.pi * (numpy.arange(N * 2) + n0) / (N * 2)
-        )
+    b = scipy.fft.ifft(B, axis=-1, overwrite_x=True)
+    out = numpy.empty(X.shape[:-1] + (N * 2,), dtype=b.real.dtype)
+    return jit.postmultiply(b, _unfolding(N), out)
 
-        Y = numpy.zeros(N * 2, dtype=X.dtype)
-        Y[:N] = X
-        Y[N:] = -1 * numpy.conj(X[::-1])
-    else:
-        N = len(X) - 1
-        n0 = (N + 1) / 2
 
-        post_twiddle = 1.0
+def _twiddle(sign, length, period):
+    """ Return cached factors :code:`exp(sign * 2j * pi * n / period)`
+
+    """
+    return framing._cached(
+        _twiddles, ('twiddle', sign, length, period),
+        lambda: numpy.exp(
+            sign * 2j * numpy.pi * numpy.arange(length) / period
+        ),
+    )
+
+
+def _folding(N):
+    """ Return cached pre-twiddle factors folding a frame of length
+    :code:`2 * N` into :code:`x[:N] - 1j * x[N:]`
+
+    """
+    def compute():
+        twiddle = _twiddle(-1, N, N * 4)
+        return numpy.concatenate((twiddle, -1j * twiddle))
+
+    return framing._cached(_twiddles, ('folding', N), compute)
+
+
+def _unfolding(N):
+    """ Return cached post-twiddle factors unfolding the inverse FFT of
+    length :code:`N` into :code:`concatenate((real(b), -imag(b)))`, including
+    the normalization
+
+    """
+    def compute():
+        twiddle = _twiddle(1, N, N * 4) * numpy.sqrt(N)
+        return numpy.concatenate((twiddle, 1j * twiddle))
 
-        X[0] *= numpy.sqrt(2)
-        X[-1] *= numpy.sqrt(2)
+    return framing._cached(_twiddles, ('unfolding', N), compute)
 
-        Y = numpy.zeros(N * 2, dtype=X.dtype)
-        Y[:N+1] = X
-        Y[N+1:] = -1 * numpy.conj(X[-2:0:-1])
 
-    pre_twiddle = numpy.exp(1j * numpy.pi * n0 * numpy.arange(N * 2) / N)
+def _postmodulation(N, odd, factor):
+    """ Return cached modulation factors of the forward transform multiplied
+    by factor
+
+    Oddly stacked odd bins are computed from the conjugated FFT, their
+    factors are conjugated, too, as :code:`real(conj(a) * b)` equals
+    :code:`real(a * conj(b))`.
+
+    """
+    def compute():
+        factors = _modulation(-1, N, odd) * factor
+        if odd:
+            factors[1::2] = numpy.conj(factors[1::2])
+        return factors
+
+    return framing._cached(
+        _twiddles, ('postmodulation', N, odd, factor), compute
+    )
+
+
+def _demodulation(N, odd, factor):
+    """ Return cached modulation factors of the inverse transform multiplied
+    by factor
+
+    The evenly stacked inverse weighs the first and last bin by
+    :code:`sqrt(0.5)`, all others by :code:`0.5`, and includes the
+    normalization of the inverse FFT.
+
+    """
+    def compute():
+        factors = _modulation(1, N, odd) * factor
+        if not odd:
+            factors[[0, -1]] *= numpy.sqrt(0.5)
+            factors[1:-1] *= 0.5
+            factors *= 2 * numpy.sqrt(N)
+        return factors
+
+    return framing._cached(
+        _twiddles, ('demodulation', N, odd, factor), compute
+    )
+
+
+def _modulation(sign, N, odd):
+    """ Return cached modulation factors of the bins, including the
+    normalization of the forward transform
+
+    The first and last bin of the evenly stacked forward transform are
+    scaled by :code:`sqrt(0.5)`.
+
+    """
+    def compute():
+        n0 = (N + 1) / 2
+        if odd:
+            k = numpy.arange(N) + 0.5
+        else:
+            k = numpy.arange(N + 1)
+
+        factors = numpy.exp(sign * 1j * numpy.pi * n0 * k / N)
+        if sign < 0:
+            factors *= numpy.sqrt(1 / N)
+            if not odd:
+                factors[[0, -1]] *= numpy.sqrt(0.5)
+        return factors
 
-    y = scipy.fft.ifft(Y * pre_twiddle)
+    return framing._cached(_twiddles, ('modulation', sign, N, odd), compute)
 
-    return numpy.real(y * post_twiddle) * numpy.sqrt(N)
 
+# Twiddle factors shared by all threads, see :func:`mdct.framing._cached`
+_twiddles = {}
 
 mclt = cmdct
 imclt = icmdct
@@ -0,0 +1,279 @@
+""" Module for frame-wise features of lapped transforms
+
+Features are reduced from blocks of frames as they are computed, see
+:func:`mdct.iter_mdct`, so that the full spectrogram is never held in
+memory. Several features can be computed in a single pass using
+:func:`reduce`.
+
+.. code-block:: python
+
+    edges = mdct.features.bands(2048, 24, samplerate=44100, scale='bark')
+    energy, flux = mdct.features.reduce(
+        signal, [mdct.features.BandEnergy(edges), mdct.features.Flux()],
+        framelength=2048,
+    )
+
+"""
+
+from __future__ import division
+
+import numpy
+
+from . import streaming
+
+__all__ = [
+    'reduce', 'band_energy', 'rms', 'flux', 'bands',
+    'BandEnergy', 'RMS', 'Flux',
+]
+
+scales = ('linear', 'mel', 'bark')
+
+
+class BandEnergy(object):
+    """ Energy of bands of adjacent bins
+
+    Parameters
+    ----------
+    edges : array_like
+        Strictly increasing bin indices, band :code:`i` contains bins
+        :code:`edges[i]` up to, but excluding, :code:`edges[i + 1]`. See
+        :func:`bands`.
+
+    """
+    def __init__(self, edges):
+        edges = numpy.asarray(edges, dtype=numpy.intp)
+        if edges.ndim != 1 or len(edges) < 2 or numpy.any(edges[:-1] < 0) \
+                or numpy.any(numpy.diff(edges) <= 0):
+            raise ValueError("Band edges must be strictly increasing")
+
+        self.edges = edges
+
+    axis = 1
+
+    def reset(self):
+        pass
+
+    def __call__(self, X):
+        power = _power(X[:self.edges[-1]])
+        return numpy.add.reduceat(power, self.edges[:-1], axis=0)
+
+
+class RMS(object):
+    """ Root mean square of the coefficients of each frame
+
+    """
+    axis = 0
+
+    def reset(self):
+        pass
+
+    def __call__(self, X):
+        return numpy.sqrt(numpy.mean(_power(X), axis=0))
+
+
+class Flux(object):
+    """ Spectral flux, the sum of increases of the magnitudes of all bins
+    from the previous frame to each frame
+
+    The first frame is compared to silence.
+
+    """
+    axis = 0
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._previous = None
+
+    def __call__(self, X):
+        magnitude = numpy.abs(X)
+        if self._previous is None:
+            self._previous = numpy.zeros_like(magnitude[:, :1])
+
+        difference = numpy.diff(
+            numpy.concatenate((self._previous, magnitude), axis=1), axis=1
+        )
+        self._previous = magnitude[:, -1:]
+
+        return numpy.sum(numpy.maximum(difference, 0), axis=0)
+
+
+def reduce(x, reducers, kind='mdct', odd=True, blocksize=256, **kwargs):
+    """ Compute features of the lapped transform of a signal, block by block
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed, see :func:`mdct.iter_mdct`.
+    reducers : list of callables
+        Features to compute, e.g. :class:`BandEnergy`, :class:`RMS` and
+        :class:`Flux`. Each is called with consecutive blocks of frames in the
+        shape of :code:`bins x frames` or :code:`bins x frames x channels`
+        and reduces the bins axis. Reduced blocks are concatenated along
+        the :code:`axis` attribute of the reducer, and :code:`reset()` is
+        called before the first block.
+    kind : str, optional
+        The transform to use, one of :code:`'mdct'`, :code:`'mdst'` and
+        :code:`'cmdct'`. Defaults to :code:`'mdct'`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    blocksize : int, optional
+        Number of frames transformed at once. Defaults to :code:`256`.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`mdct.streaming.Analyzer`
+
+    Returns
+    -------
+    out : list of array_like
+        One feature matrix per reducer.
+
+    """
+    for reducer in reducers:
+        reducer.reset()
+
+    results = [[] for reducer in reducers]
+    for block in getattr(streaming, 'iter_' + kind)(
+        x, odd=odd, blocksize=blocksize, **kwargs
+    ):
+        for reducer, result in zip(reducers, results):
+            result.append(reducer(block))
+
+    return [
+        numpy.concatenate(result, axis=reducer.axis)
+        for reducer, result in zip(reducers, results)
+    ]
+
+
+def band_energy(x, edges, **kwargs):
+    """ Compute the energy of bands of the lapped transform of a signal
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed, see :func:`mdct.iter_mdct`.
+    edges : array_like
+        Strictly increasing bin indices of the band edges, see :func:`bands`.
+    **kwargs, optional
+        Additional keyword arguments passed to :func:`reduce`
+
+    Returns
+    -------
+    out : array_like
+        The band energies in the shape of :code:`bands x frames` or
+        :code:`bands x frames x channels`.
+
+    """
+    return reduce(x, [BandEnergy(edges)], **kwargs)[0]
+
+
+def rms(x, **kwargs):
+    """ Compute the root mean square of each frame of the lapped transform of
+    a signal
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed, see :func:`mdct.iter_mdct`.
+    **kwargs, optional
+        Additional keyword arguments passed to :func:`reduce`
+
+    Returns
+    -------
+    out : array_like
+        The RMS in the shape of :code:`frames` or :code:`frames x channels`.
+
+    """
+    return reduce(x, [RMS()], **kwargs)[0]
+
+
+def flux(x, **kwargs):
+    """ Compute the spectral flux of the lapped transform of a signal
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed, see :func:`mdct.iter_mdct`.
+    **kwargs, optional
+        Additional keyword arguments passed to :func:`reduce`
+
+    Returns
+    -------
+    out : array_like
+        The flux in the shape of :code:`frames` or :code:`frames x channels`.
+
+    """
+    return reduce(x, [Flux()], **kwargs)[0]
+
+
+def bands(framelength, count, samplerate=44100, scale='mel', odd=True):
+    """ Return bin edges of bands equally spaced on a perceptual scale
+
+    Parameters
+    ----------
+    framelength : int
+        The signal frame length.
+    count : int
+        Number of bands.
+    samplerate : float, optional
+        The sample rate of the signal. Defaults to :code:`44100`.
+    scale : str, optional
+        The frequency scale, one of :code:`'linear'`, :code:`'mel'` and
+        :code:`'bark'`. Defaults to :code:`'mel'`.
+    odd : boolean, optional
+        Oddly stacked transform. Defaults to :code:`True`.
+
+    Returns
+    -------
+    edges : array_like
+        :code:`count + 1` strictly increasing bin indices. Bands narrower
+        than a bin are widened to one bin.
+
+    """
+    if scale not in scales:
+        raise ValueError(
+            "Unknown scale {0!r}, must be one of {1}".format(scale, scales)
+        )
+
+    bins = framelength // 2 + (0 if odd else 1)
+    if count > bins:
+        raise ValueError(
+            "Cannot split {0} bins into {1} bands".format(bins, count)
+        )
+
+    forward, inverse = {
+        'linear': (lambda f: f, lambda z: z),
+        'mel': (
+            lambda f: 2595 * numpy.log10(1 + f / 700),
+            lambda z: 700 * (10 ** (z / 2595) - 1),
+        ),
+        'bark': (
+            lambda f: 26.81 * f / (1960 + f) - 0.53,
+            lambda z: 1960 * (z + 0.53) / (26.28 - z),
+        ),
+    }[scale]
+
+    frequencies = inverse(numpy.linspace(
+        forward(0.), forward(samplerate / 2), count + 1
+    ))
+    # Bin k is centered at (k + 1/2) or k times samplerate / framelength
+    offset = 0.5 if odd else 0
+    edges = numpy.ceil(frequencies * framelength / samplerate - offset)
+    edges = numpy.clip(edges, 0, bins).astype(numpy.intp)
+    edges[0] = 0
+    edges[-1] = bins
+
+    # Widen bands narrower than a bin, starting from the low frequencies
+    for i in range(1, count + 1):
+        edges[i] = max(edges[i], edges[i - 1] + 1)
+    for i in range(count - 1, 0, -1):
+        edges[i] = min(edges[i], edges[i + 1] - 1)
+
+    return edges
+
+
+def _power(X):
+    if numpy.iscomplexobj(X):
+        return X.real ** 2 + X.imag ** 2
+    else:
+        return X ** 2
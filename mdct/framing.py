@@ -0,0 +1,1031 @@
+""" Module for framing, windowing and overlap-adding signals
+
+All frames of a signal are cut from the signal as strided views and
+transformed in blocks of frames, with the samples on the last axis, so that
+the core transforms always run over contiguous memory.
+
+.. warning::
+    Functions defined in this module are used by the lapped transforms in
+    :py:mod:`mdct`, please do not use this module directly.
+
+"""
+
+from __future__ import division
+
+import functools
+import inspect
+import sys
+
+import numpy
+import stft
+from numpy.lib.stride_tricks import as_strided
+
+from .types import Settings, SparseSpectrogram, Spectrogram
+
+__all__ = [
+    'spectrogram', 'spectrograms', 'ispectrogram',
+]
+
+layouts = ('channels_last', 'channels_first')
+
+# Samples per channel windowed and transformed at once
+blocksize = 2 ** 16
+
+
+def spectrogram(
+    x,
+    transform,
+    framelength=1024,
+    hopsize=None,
+    overlap=None,
+    centered=True,
+    window=None,
+    padding=0,
+    save_settings=True,
+    scale=None,
+    layout='channels_last',
+    frames_first=None,
+    kind=None,
+    odd=None,
+    axis=None,
+    like=None,
+):
+    """ Calculate the lapped transform of a signal
+
+    Parameters
+    ----------
+    x : array_like
+        The signal to be transformed. See :code:`layout` for the supported
+        shapes.
+    transform : callable, list of callables
+        The core transform operating on the last axis. If a list is given,
+        the transforms are used for consecutive frames in turn.
+    framelength : int
+        The signal frame length. Defaults to :code:`1024`.
+    hopsize : int
+        The signal frame hopsize. Defaults to :code:`None`. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Value :code:`x` means
+        :code:`1/x` overlap. Defaults to :code:`2`.
+    centered : boolean
+        Pad input signal so that the first and last window are centered around
+        the beginning of the signal. Defaults to :code:`True`.
+    window : callable, array_like, tuple
+        Window to be used for deringing. Can be :code:`False` to disable
+        windowing, or a pair of analysis and synthesis windows. Defaults to
+        :code:`scipy.signal.cosine`.
+    padding : int
+        Zero-pad frames with x times the number of samples.
+        Defaults to :code:`0`.
+    save_settings : boolean
+        Return a :class:`mdct.types.Spectrogram` carrying the settings used
+        here, so that :func:`ispectrogram` can infer these settings without
+        the developer having to pass them again. Otherwise, return a plain
+        array.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale, e.g. :code:`1 / 32768` for
+        :code:`int16` input, and to :code:`1` for floating point input.
+    layout : str, optional
+        Memory layout of multichannel data. For :code:`'channels_last'` the
+        signal is :code:`samples x channels` and the output :code:`bins x
+        frames x channels`. For :code:`'channels_first'` the signal is
+        :code:`channels x samples` and the output a C-contiguous
+        :code:`channels x frames x bins` tensor. Mono signals are
+        transformed into :code:`bins x frames` and :code:`frames x bins`,
+        respectively. Defaults to :code:`'channels_last'`.
+    frames_first : boolean, optional
+        Put the frames axis before the bins axis. Defaults to :code:`True`
+        for :code:`'channels_first'` layout and :code:`False` otherwise.
+    kind : str, optional
+        Name of the transform, only recorded in the settings.
+    odd : boolean, optional
+        Oddly stacked transform, only recorded in the settings.
+    axis : int, optional
+        Transform along this axis of an N-D signal, overriding
+        :code:`layout`. The axis is replaced by the bins and frames axes, in
+        the order given by :code:`frames_first`, while all other axes are
+        transformed as a batch. Defaults to the sample axis of
+        :code:`layout`.
+    like : array_like, optional
+        Return the spectrogram as array of the same library as :code:`like`,
+        e.g. the input signal, found using its Array API namespace. Arrays
+        are exchanged using DLPack where possible, and returned without
+        settings. Defaults to NumPy arrays.
+
+    Returns
+    -------
+    out : array_like
+        The spectrogram (or tensor of spectrograms).
+
+    Notes
+    -----
+    Frames are windowed and transformed in blocks, which are written into an
+    output that is C-contiguous in the requested layout.
+
+    """
+    return spectrograms(
+        x,
+        transform,
+        [framelength],
+        hopsize=hopsize,
+        overlap=overlap,
+        centered=centered,
+        window=window,
+        padding=padding,
+        save_settings=save_settings,
+        scale=scale,
+        layout=layout,
+        frames_first=frames_first,
+        kind=kind,
+        odd=odd,
+        axis=axis,
+        like=like,
+    )[0]
+
+
+def spectrograms(
+    x,
+    transform,
+    framelengths,
+    hopsize=None,
+    overlap=None,
+    centered=True,
+    window=None,
+    padding=0,
+    save_settings=True,
+    scale=None,
+    layout='channels_last',
+    frames_first=None,
+    kind=None,
+    odd=None,
+    axis=None,
+    like=None,
+):
+    """ Calculate the lapped transform of a signal using several frame lengths
+
+    The signal is converted only once, frames of all frame lengths are cut
+    from the same signal.
+
+    Parameters
+    ----------
+    x : array_like
+        The signal to be transformed.
+    transform : callable, list of callables
+        The core transform operating on the last axis.
+    framelengths : list of int
+        The signal frame lengths.
+    hopsize : int
+        The signal frame hopsize, for all frame lengths. Defaults to
+        :code:`None`. Setting this value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Defaults to :code:`2`.
+    **kwargs, optional
+        See :func:`spectrogram` for all other parameters. :code:`window`
+        must be callable if more than one frame length is given.
+
+    Returns
+    -------
+    out : list of array_like
+        One spectrogram per frame length, each equal to the result of
+        :func:`spectrogram`.
+
+    """
+    if frames_first is None:
+        frames_first = layout == 'channels_first'
+
+    if axis is None:
+        x = _canonical(_signed(_asarray(x)), layout)
+    else:
+        x = _signed(_asarray(x))
+        axis = _axis(axis, x.ndim)
+        x = numpy.moveaxis(x, axis, -1)
+    outlength = x.shape[-1]
+    factor = _scale(x.dtype, scale)
+    transforms = _cycle(transform)
+
+    if axis is None:
+        place = functools.partial(
+            _orient, layout=layout, frames_first=frames_first
+        )
+        unplace = functools.partial(
+            _canonical, layout=layout, frames_first=frames_first,
+            spectral=True,
+        )
+    else:
+        place = functools.partial(
+            _place, axis=axis, frames_first=frames_first
+        )
+        unplace = functools.partial(
+            _unplace, axis=axis, frames_first=frames_first
+        )
+
+    if window is None:
+        window = stft.stft.cosine
+
+    result = []
+    for framelength in framelengths:
+        framehop = _hopsize(framelength, hopsize, overlap)
+        out = _analysis(
+            _chunks(x, framelength, framehop, centered),
+            _window(window, framelength) * factor,
+            transforms,
+            padding=padding,
+            empty=functools.partial(_empty, place=place, unplace=unplace),
+        )
+        _normalize(out, framelength, framehop)
+        out = place(out)
+
+        if save_settings:
+            out = Spectrogram(
+                out,
+                Settings(
+                    kind=kind,
+                    odd=odd,
+                    framelength=framelength,
+                    hopsize=framehop,
+                    window=window,
+                    centered=centered,
+                    padding=padding,
+                    outlength=outlength,
+                    layout=layout,
+                    frames_first=frames_first,
+                    axis=axis,
+                )
+            )
+
+        result.append(_like(out, like))
+
+    return result
+
+
+def ispectrogram(
+    X,
+    transform,
+    framelength=None,
+    hopsize=None,
+    overlap=None,
+    centered=None,
+    window=None,
+    padding=None,
+    outlength=None,
+    dtype=None,
+    scale=None,
+    layout=None,
+    frames_first=None,
+    axis=None,
+    like=None,
+):
+    """ Calculate the inverse lapped transform of a spectrogram
+
+    Parameters
+    ----------
+    X : array_like
+        The spectrogram to be inverted. See :code:`layout` for the supported
+        shapes. A :class:`mdct.types.SparseSpectrogram` is inverted with all
+        coefficients it does not store set to zero.
+    transform : callable, list of callables
+        The inverse core transform operating on the last axis. If a list is
+        given, the transforms are used for consecutive frames in turn.
+    framelength : int
+        The signal frame length. Defaults to infer from data.
+    hopsize : int
+        The signal frame hopsize. Defaults to infer from data. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Value :code:`x` means
+        :code:`1/x` overlap. Defaults to infer from data.
+    centered : boolean
+        Remove the padding added by a centered forward transform. Defaults to
+        infer from data.
+    window : callable, array_like, tuple
+        Window to be used for deringing. Can be :code:`False` to disable
+        windowing. If a pair of analysis and synthesis windows is given,
+        the synthesis window is used. Defaults to infer from data.
+    padding : int
+        Frames were zero-padded with x times the number of samples. Defaults
+        to infer from data.
+    outlength : int
+        Crop output signal to length. Not setting this value will disable
+        cropping, the output data may be longer than expected.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+    layout : str, optional
+        Memory layout of multichannel data, see :func:`spectrogram`. Defaults
+        to infer from data.
+    frames_first : boolean, optional
+        The frames axis is before the bins axis. Defaults to infer from data.
+    axis : int, optional
+        Position of the first of the bins and frames axes of an N-D
+        spectrogram, which are replaced by the sample axis, see
+        :func:`spectrogram`. Overrides :code:`layout`. Defaults to infer from
+        data.
+    like : array_like, optional
+        Return the signal as array of the same library as :code:`like`,
+        e.g. the input signal, found using its Array API namespace. Arrays
+        are exchanged using DLPack where possible, and returned without
+        settings. Defaults to NumPy arrays.
+
+    Returns
+    -------
+    out : array_like
+        The signal (or matrix of signals).
+
+    """
+    settings = _settings(X)
+    if framelength is None:
+        framelength = settings.get('framelength', 1024)
+    if hopsize is None:
+        hopsize = settings.get('hopsize')
+    if overlap is None:
+        overlap = settings.get('overlap')
+    if centered is None:
+        centered = settings.get('centered', True)
+    if window is None:
+        window = settings.get('window')
+    if padding is None:
+        padding = settings.get('padding', 0)
+    if outlength is None:
+        outlength = settings.get('outlength')
+    if layout is None:
+        layout = settings.get('layout', 'channels_last')
+    if frames_first is None:
+        frames_first = settings.get(
+            'frames_first', layout == 'channels_first'
+        )
+    if axis is None:
+        axis = settings.get('axis')
+
+    if isinstance(X, SparseSpectrogram):
+        X = X.toarray()
+
+    X = _asarray(getattr(X, 'data', X))
+    if axis is None:
+        X = _canonical(X, layout, frames_first, spectral=True)
+    else:
+        axis = _axis(axis, X.ndim - 1)
+        X = _unplace(X, axis, frames_first)
+    hopsize = _hopsize(framelength, hopsize, overlap)
+
+    if window is None:
+        window = stft.stft.cosine
+
+    out = _resynthesis(
+        X,
+        _window(window, framelength, synthesis=True),
+        _cycle(transform),
+        framelength,
+        hopsize,
+    )
+
+    if centered:
+        out = out[..., framelength // 2:-framelength // 2]
+
+    out = out[..., :outlength]
+
+    if axis is not None:
+        out = numpy.moveaxis(out, -1, axis)
+    elif layout == 'channels_last':
+        out = out.T
+
+    if dtype is not None:
+        out = _pcm(out, dtype, scale)
+
+    return _like(out, like)
+
+
+def _settings(X):
+    """ Return settings carried by spectrogram as dict
+
+    Supports both :class:`mdct.types.Spectrogram` and arrays with
+    :code:`stft_settings` attribute.
+
+    """
+    settings = getattr(X, 'settings', None)
+    if isinstance(settings, Settings):
+        return settings._asdict()
+    else:
+        return getattr(X, 'stft_settings', None) or {}
+
+
+def _infer(X, key, default):
+    """ Return setting carried by spectrogram, or default
+
+    """
+    value = _settings(X).get(key)
+    if value is None:
+        return default
+    else:
+        return value
+
+
+def _cached(cache, key, function, maxsize=128):
+    """ Return value of key in cache dict, computing it on first use
+
+    Lookups take no lock. Threads missing the same key concurrently may each
+    compute the value, but all of them return the one stored first, as
+    :code:`dict.setdefault` is atomic on both GIL and free-threaded builds.
+    Arrays are stored read-only, as they are shared between threads. The
+    cache is emptied once it holds more than :code:`maxsize` values.
+
+    """
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    value = function()
+    if isinstance(value, numpy.ndarray):
+        value.setflags(write=False)
+
+    if len(cache) >= maxsize:
+        cache.clear()
+    return cache.setdefault(key, value)
+
+
+def _asarray(x):
+    """ Return x as NumPy array, without copying if possible
+
+    Supports arrays implementing the buffer protocol, :code:`__array__` or
+    :code:`__array_interface__`, DLPack producers on the CPU and Arrow
+    arrays.
+
+    """
+    if isinstance(x, numpy.ndarray):
+        return x
+
+    if type(x).__module__.partition('.')[0] == 'pyarrow':
+        return _arrow(x)
+
+    from_dlpack = getattr(numpy, 'from_dlpack', None)
+    if from_dlpack is not None and hasattr(x, '__dlpack__'):
+        try:
+            return from_dlpack(x)
+        except (BufferError, RuntimeError, TypeError, ValueError):
+            # E.g. tensors on other devices or requiring gradients
+            pass
+
+    return numpy.asarray(x)
+
+
+def _arrow(x):
+    """ Return Arrow array as NumPy array, copying only arrays with nulls or
+    several chunks
+
+    """
+    chunks = getattr(x, 'chunks', None)
+    if chunks is not None and len(chunks) == 1:
+        x = chunks[0]
+
+    try:
+        return x.to_numpy(zero_copy_only=True)
+    except (TypeError, ValueError):
+        # ArrowInvalid is a ValueError
+        return numpy.asarray(x)
+
+
+def _like(out, like):
+    """ Return out as array of the library of like, without copying if
+    possible
+
+    The library is found using the Array API namespace of like, or the
+    module defining its type. Arrays are exchanged using DLPack, or the
+    :code:`asarray` function of the library.
+
+    """
+    if like is None or isinstance(like, (numpy.ndarray, Spectrogram)):
+        return out
+
+    out = numpy.asarray(getattr(out, 'data', out))
+
+    if hasattr(like, '__array_namespace__'):
+        namespace = like.__array_namespace__()
+    else:
+        namespace = sys.modules.get(type(like).__module__.partition('.')[0])
+
+    if hasattr(out, '__dlpack__') and hasattr(namespace, 'from_dlpack'):
+        return namespace.from_dlpack(out)
+    elif hasattr(namespace, 'asarray'):
+        return namespace.asarray(out)
+    else:
+        raise TypeError(
+            "Cannot return arrays like {0}".format(type(like).__name__)
+        )
+
+
+def _canonical(x, layout, frames_first=False, spectral=False):
+    """ Return view of x with samples (or frames and bins) on the last axes
+
+    """
+    if layout not in layouts:
+        raise ValueError(
+            "Unknown layout {0!r}, must be one of {1}".format(layout, layouts)
+        )
+
+    if spectral:
+        if x.ndim not in (2, 3):
+            raise ValueError("Only 2D or 3D input data allowed")
+
+        if layout == 'channels_last' and x.ndim == 3:
+            x = numpy.moveaxis(x, -1, 0)
+        if not frames_first:
+            x = numpy.swapaxes(x, -1, -2)
+
+        return x
+    else:
+        if layout == 'channels_last':
+            x = numpy.squeeze(x)
+        if x.ndim not in (1, 2):
+            raise ValueError("Only 1D or 2D input data allowed")
+
+    if layout == 'channels_last':
+        return x.T
+    else:
+        return x
+
+
+def _orient(X, layout, frames_first):
+    """ Return view of canonical :code:`channels x frames x bins` data in
+    the requested layout
+
+    """
+    if not frames_first:
+        X = numpy.swapaxes(X, -1, -2)
+    if layout == 'channels_last' and X.ndim == 3:
+        X = numpy.moveaxis(X, 0, -1)
+
+    return X
+
+
+def _axis(axis, ndim):
+    """ Return non-negative index of axis of an array of ndim dimensions
+
+    """
+    if not -ndim <= axis < ndim:
+        raise ValueError(
+            "Axis {0} is out of bounds for {1}D data".format(axis, ndim)
+        )
+    return axis % ndim
+
+
+def _place(X, axis, frames_first):
+    """ Return view of :code:`... x frames x bins` data with the bins and
+    frames axes at axis
+
+    """
+    if not frames_first:
+        X = numpy.swapaxes(X, -1, -2)
+    return numpy.moveaxis(X, (-2, -1), (axis, axis + 1))
+
+
+def _unplace(X, axis, frames_first):
+    """ Return view of data with the bins and frames axes at axis as
+    :code:`... x frames x bins`, the inverse of :func:`_place`
+
+    """
+    X = numpy.moveaxis(X, (axis, axis + 1), (-2, -1))
+    if not frames_first:
+        X = numpy.swapaxes(X, -1, -2)
+    return X
+
+
+def _cycle(transform):
+    if isinstance(transform, (list, tuple)):
+        return list(transform)
+    else:
+        return [transform]
+
+
+def _transforms(transforms, kind, odd):
+    """ Return the list of core transforms to be cycled over consecutive frames
+
+    Evenly stacked MDCT and MDST alternate between cosine and sine modulation
+    in every other frame, hence more than one transform may be returned.
+
+    """
+    if kind in ('cmdct', 'icmdct'):
+        return [functools.partial(getattr(transforms, kind), odd=odd)]
+
+    other = {
+        'mdct': 'mdst', 'mdst': 'mdct',
+        'imdct': 'imdst', 'imdst': 'imdct',
+    }[kind]
+
+    if odd:
+        return [getattr(transforms, kind)]
+    else:
+        return [
+            functools.partial(getattr(transforms, kind), odd=False),
+            functools.partial(getattr(transforms, other), odd=False),
+        ]
+
+
+def _hopsize(framelength, hopsize, overlap):
+    if hopsize is None:
+        if overlap is None:
+            overlap = 2
+        hopsize = framelength // overlap
+    return hopsize
+
+
+def _window(window, framelength, synthesis=False):
+    """ Return window as array, resolving callables and disabled windows
+
+    Windows may also be given as a pair of analysis and synthesis windows,
+    or a callable returning such a pair.
+
+    """
+    if window is None:
+        window = stft.stft.cosine
+
+    if window is False:
+        return numpy.ones(framelength)
+    elif isinstance(window, tuple):
+        return _window(window[1 if synthesis else 0], framelength)
+    elif callable(window):
+        return _window(window(framelength), framelength, synthesis)
+
+    window = numpy.asarray(window)
+    if window.shape != (framelength,):
+        raise ValueError(
+            "Window of shape {0} does not match the frame length {1}, pass "
+            "a callable to use several frame lengths".format(
+                window.shape, framelength
+            )
+        )
+    return window
+
+
+def _support(window):
+    """ Return number of leading and trailing zeros of window
+
+    """
+    nonzero = numpy.flatnonzero(window)
+    if len(nonzero) == 0:
+        return len(window), len(window)
+
+    return nonzero[0], len(window) - 1 - nonzero[-1]
+
+
+def _scale(dtype, scale=None):
+    """ Return factor mapping samples of dtype to floating point
+
+    Unsigned samples are mapped like the signed samples of the same size
+    they are centered to, see :func:`_signed`.
+
+    """
+    if scale is not None:
+        return scale
+    elif numpy.issubdtype(dtype, numpy.integer):
+        return 1 / 2 ** (8 * numpy.dtype(dtype).itemsize - 1)
+    else:
+        return 1
+
+
+def _signed(x):
+    """ Return unsigned integer PCM centered around zero, as signed integers
+    of the same size
+
+    Unsigned PCM, e.g. 8 bit WAV, has its zero at half the range, so that
+    :code:`128` of :code:`uint8` becomes :code:`0` of :code:`int8`. Other
+    arrays are returned unchanged.
+
+    """
+    if not numpy.issubdtype(x.dtype, numpy.unsignedinteger):
+        return x
+
+    signed = numpy.dtype(x.dtype.str.replace('u', 'i'))
+    return numpy.bitwise_xor(x, _offset(x.dtype)).view(signed)
+
+
+def _offset(dtype):
+    """ Return the zero of unsigned integer PCM of dtype
+
+    """
+    return dtype.type(1 << (8 * dtype.itemsize - 1))
+
+
+def _pcm(y, dtype, scale=None):
+    """ Convert floating point samples to clipped samples of dtype
+
+    """
+    dtype = numpy.dtype(dtype)
+    scale = _scale(dtype, scale)
+
+    if numpy.issubdtype(dtype, numpy.unsignedinteger):
+        signed = numpy.dtype(dtype.str.replace('u', 'i'))
+        out = _pcm(y, signed, scale).view(dtype)
+        return numpy.bitwise_xor(out, _offset(dtype), out=out)
+    elif not numpy.issubdtype(dtype, numpy.integer):
+        return (y / scale).astype(dtype)
+
+    info = numpy.iinfo(dtype)
+    y = numpy.rint(y / scale)
+    numpy.clip(y, info.min, info.max, out=y)
+    return y.astype(dtype)
+
+
+def _count(length, framelength, hopsize):
+    """ Return number of frames needed to cover a padded signal of length
+
+    """
+    return max(-(-(length - framelength + hopsize) // hopsize), 0)
+
+
+def _total(length, framelength, hopsize, centered):
+    """ Return number of frames of a signal of length
+
+    When centered, half a frame of zeros is added to both ends of the signal
+    first. The signal is then padded to a multiple of framelength.
+
+    """
+    front = framelength // 2 if centered else 0
+    length += 2 * front
+    return _count(length + -length % framelength, framelength, hopsize)
+
+
+def _segment(x, start, stop, front):
+    """ Return samples start to stop of the padded signal, with front zeros
+    before the signal and as many zeros after it as needed
+
+    """
+    out = numpy.zeros(x.shape[:-1] + (stop - start,), dtype=x.dtype)
+    begin = min(max(start - front, 0), x.shape[-1])
+    end = min(max(stop - front, 0), x.shape[-1])
+    out[..., begin + front - start:end + front - start] = x[..., begin:end]
+    return out
+
+
+def _chunks(x, framelength, hopsize, centered):
+    """ Return frames of the signal padded as in :func:`_total`, without
+    padding the signal
+
+    Only the frames overlapping the padding at either end are cut from
+    small padded copies of the signal. All interior frames are a strided
+    view of the signal.
+
+    Returns
+    -------
+    count : int
+        Total number of frames.
+    chunks : list of tuples
+        Tuples of the index of the first frame and the frames of a chunk.
+
+    """
+    front = framelength // 2 if centered else 0
+    count = _total(x.shape[-1], framelength, hopsize, centered)
+
+    # Interior frames lo to hi, exclusive, lie entirely within the signal
+    lo = min(-(-front // hopsize), count)
+    hi = min((x.shape[-1] + front - framelength) // hopsize + 1, count)
+    hi = max(hi, lo)
+
+    chunks = []
+    if lo > 0:
+        chunks.append((0, _frames(
+            _segment(x, 0, (lo - 1) * hopsize + framelength, front),
+            framelength, hopsize, lo
+        )))
+    if hi > lo:
+        chunks.append((lo, _frames(
+            x[..., lo * hopsize - front:], framelength, hopsize, hi - lo
+        )))
+    if count > hi or not chunks:
+        chunks.append((hi, _frames(
+            _segment(
+                x, hi * hopsize, (count - 1) * hopsize + framelength, front
+            ),
+            framelength, hopsize, count - hi
+        )))
+
+    return count, chunks
+
+
+def _frames(x, framelength, hopsize, count=None):
+    """ Return read-only strided view of frames of the last axis of x
+
+    """
+    if count is None:
+        count = _count(x.shape[-1], framelength, hopsize)
+
+    return as_strided(
+        x,
+        shape=x.shape[:-1] + (count, framelength),
+        strides=x.strides[:-1] + (x.strides[-1] * hopsize, x.strides[-1]),
+        writeable=False,
+    )
+
+
+def _apply(transforms, data, first=0):
+    """ Apply transforms to consecutive frames on the second to last axis
+
+    """
+    if len(transforms) == 1:
+        return transforms[0](data)
+
+    out = None
+    for i, transform in enumerate(transforms):
+        which = (i - first) % len(transforms)
+        tmp = transform(data[..., which::len(transforms), :])
+
+        if out is None:
+            out = numpy.empty(
+                data.shape[:-1] + tmp.shape[-1:], dtype=tmp.dtype
+            )
+        out[..., which::len(transforms), :] = tmp
+
+    return out
+
+
+def _analysis(
+    frames, window, transforms, padding=0, first=0, empty=numpy.empty
+):
+    """ Window and transform frames
+
+    Frames are windowed and transformed in blocks of at most
+    :code:`blocksize` samples per channel, written into the output one after
+    the other. Only one block of frames is held in the data type of the
+    transform, e.g. integer PCM is converted block by block.
+
+    Parameters
+    ----------
+    frames : array_like, tuple
+        Frames in the shape of :code:`... x frames x framelength`, or the
+        number of frames and chunks of frames as returned by
+        :func:`_chunks`.
+    window : array_like
+        Window, including any scaling of the samples.
+    transforms : list of callables
+        Core transforms, cycled over consecutive frames.
+    padding : int
+        Zero-pad frames with x times the number of samples.
+    first : int
+        Index of the first frame, used to continue the transform cycle.
+    empty : callable
+        Allocates the output, given its shape and dtype. Defaults to
+        :func:`numpy.empty`.
+
+    Returns
+    -------
+    out : array_like
+        Coefficients in the shape of :code:`... x frames x bins`.
+
+    """
+    if isinstance(frames, tuple):
+        count, chunks = frames
+    else:
+        count, chunks = frames.shape[-2], [(0, frames)]
+
+    # Core transforms accepting padding skip the zeros themselves
+    if padding and all(_pads(transform) for transform in transforms):
+        transforms = [
+            functools.partial(transform, padding=padding)
+            for transform in transforms
+        ]
+        padding = 0
+
+    framelength = chunks[0][1].shape[-1]
+    step = max(blocksize // (framelength * (padding + 1)), 1)
+
+    out = None
+    for start, chunk in chunks:
+        # Transform empty chunks too, to find the output shape
+        for offset in range(0, chunk.shape[-2] or 1, step):
+            frames = chunk[..., offset:offset + step, :]
+            data = (numpy.zeros if padding else numpy.empty)(
+                frames.shape[:-1] + (framelength * (padding + 1),),
+                dtype=numpy.result_type(frames.dtype, window.dtype),
+            )
+            numpy.multiply(frames, window, out=data[..., :framelength])
+            block = _apply(transforms, data, first + start + offset)
+
+            if out is None:
+                out = empty(
+                    block.shape[:-2] + (count,) + block.shape[-1:],
+                    dtype=block.dtype,
+                )
+            out[..., start + offset:start + offset + block.shape[-2], :] = (
+                block
+            )
+
+    return out
+
+
+def _empty(shape, dtype, place, unplace):
+    """ Return uninitialized :code:`... x frames x bins` data as view of an
+    array that is C-contiguous once placed in the requested layout
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the data.
+    dtype : numpy.dtype
+        Data type of the data.
+    place, unplace : callable
+        Return views of the data in the requested layout and back, e.g.
+        :func:`_orient` and :func:`_canonical`.
+
+    """
+    placed = place(numpy.broadcast_to(numpy.empty((), dtype=dtype), shape))
+    return unplace(numpy.empty(placed.shape, dtype=dtype))
+
+
+def _pads(transform):
+    """ Return whether a core transform accepts the padding argument
+
+    """
+    try:
+        return 'padding' in inspect.signature(transform).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _normalize(out, framelength, hopsize):
+    norm = framelength // hopsize // 2
+    if norm > 1:
+        out /= norm
+
+
+def _resynthesis(X, window, transforms, framelength, hopsize, first=0):
+    """ Inverse transform, window and overlap-add frames
+
+    Frames are synthesized and overlap-added in blocks of at most
+    :code:`blocksize` samples per channel, so that only one block of frames
+    is held at once.
+
+    Parameters
+    ----------
+    X : array_like
+        Coefficients in the shape of :code:`... x frames x bins`.
+    window : array_like
+        Window.
+    transforms : list of callables
+        Inverse core transforms, cycled over consecutive frames.
+    framelength : int
+        Frame length, any zero-padding of the frames will be removed.
+    hopsize : int
+        Frame hopsize.
+    first : int
+        Index of the first frame, used to continue the transform cycle.
+
+    Returns
+    -------
+    out : array_like
+        Signal in the shape of :code:`... x samples`.
+
+    """
+    # Imported here, as the kernels fall back to this module
+    from .fast import jit
+
+    count = X.shape[-2]
+    step = max(blocksize // framelength, 1)
+
+    out = None
+    for start in range(0, count or 1, step):
+        # Frames are cropped to framelength, removing any zero-padding, and
+        # windowed while being overlap-added
+        block = jit.overlap_add(
+            _apply(transforms, X[..., start:start + step, :], first + start),
+            window,
+            hopsize,
+        )
+
+        if out is None:
+            out = numpy.zeros(
+                block.shape[:-1] +
+                (framelength + max(count - 1, 0) * hopsize,),
+                dtype=block.dtype,
+            )
+        out[..., start * hopsize:start * hopsize + block.shape[-1]] += block
+
+    return out
+
+
+def _overlap_add(frames, hopsize):
+    """ Overlap-add frames on the second to last axis
+
+    """
+    count, framelength = frames.shape[-2:]
+    out = numpy.zeros(
+        frames.shape[:-2] + (framelength + max(count - 1, 0) * hopsize,),
+        dtype=frames.dtype
+    )
+
+    for start in range(0, framelength, hopsize):
+        segment = frames[..., start:start + hopsize]
+        view = out[..., start:]
+        view = as_strided(
+            view,
+            shape=view.shape[:-1] + segment.shape[-2:],
+            strides=view.strides[:-1] + (
+                view.strides[-1] * hopsize, view.strides[-1]
+            ),
+        )
+        view += segment
+
+    return out
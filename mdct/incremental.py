@@ -0,0 +1,201 @@
+""" Module for updating spectrograms and signals after local edits
+
+Editing a region of a long signal changes only the frames overlapping that
+region, and those frames change only the samples they overlap. Instead of
+transforming the whole signal again, :func:`update` recomputes the affected
+frames of a spectrogram in place, and :func:`iupdate` re-synthesizes the
+affected samples of the inverse transformed signal in place.
+
+.. code-block:: python
+
+    spectrum = mdct.mdct(signal)
+    signal[1000:2000] *= 0.5
+    frames = mdct.incremental.update(spectrum, signal, 1000, 2000)
+
+    spectrum[:, frames[0]:frames[1]] *= gains
+    mdct.incremental.iupdate(output, spectrum, *frames)
+
+"""
+
+from __future__ import division
+
+import numpy
+
+from . import autotune, framing
+
+__all__ = [
+    'update', 'iupdate',
+]
+
+
+def update(X, x, start, stop, scale=None, transforms=None):
+    """ Recompute the frames of a spectrogram overlapping edited samples
+
+    Parameters
+    ----------
+    X : array_like
+        The spectrogram to update in place, carrying the settings of the
+        forward transform, e.g. a :class:`mdct.types.Spectrogram`.
+    x : array_like
+        The edited signal, of the same length and layout as the transformed
+        signal.
+    start : int
+        Index of the first edited sample.
+    stop : int
+        Index after the last edited sample.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+
+    Returns
+    -------
+    frames : tuple of int
+        Indices of the first and after the last recomputed frame, see
+        :func:`iupdate`.
+
+    """
+    settings = _check(X)
+    framelength = settings['framelength']
+    hopsize = settings['hopsize']
+    front = framelength // 2 if settings['centered'] else 0
+
+    x = framing._canonical(
+        framing._signed(framing._asarray(x)), settings['layout']
+    )
+    data = _data(X, settings)
+    count = data.shape[-2]
+    if framing._total(
+        x.shape[-1], framelength, hopsize, settings['centered']
+    ) != count:
+        raise ValueError(
+            "Edited signal of length {0} does not fit the spectrogram of "
+            "{1} frames".format(x.shape[-1], count)
+        )
+
+    first, last = _affected(
+        max(start, 0), min(stop, x.shape[-1]), framelength, hopsize, front,
+        count,
+    )
+    if first >= last:
+        return first, first
+
+    out = framing._analysis(
+        framing._frames(
+            framing._segment(
+                x, first * hopsize, (last - 1) * hopsize + framelength, front
+            ),
+            framelength, hopsize, last - first,
+        ),
+        framing._window(settings['window'], framelength) *
+        framing._scale(x.dtype, scale),
+        framing._transforms(
+            autotune._resolve(transforms), settings['kind'], settings['odd']
+        ),
+        padding=settings.get('padding') or 0,
+        first=first,
+    )
+    framing._normalize(out, framelength, hopsize)
+    data[..., first:last, :] = out
+
+    return first, last
+
+
+def iupdate(y, X, first, last, scale=None, transforms=None):
+    """ Re-synthesize the samples of a signal overlapping changed frames
+
+    Parameters
+    ----------
+    y : array_like
+        The inverse transformed signal to update in place, in the layout of
+        the transformed signal. Integer signals are updated with rounded and
+        clipped PCM.
+    X : array_like
+        The spectrogram, carrying the settings of the forward transform.
+    first : int
+        Index of the first changed frame.
+    last : int
+        Index after the last changed frame.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of integer signals.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+
+    Returns
+    -------
+    samples : tuple of int
+        Indices of the first and after the last re-synthesized sample.
+
+    """
+    settings = _check(X)
+    framelength = settings['framelength']
+    hopsize = settings['hopsize']
+    front = framelength // 2 if settings['centered'] else 0
+
+    y = framing._canonical(y, settings['layout'])
+    data = _data(X, settings)
+    count = data.shape[-2]
+
+    first = max(first, 0)
+    last = min(last, count)
+    start = max(first * hopsize - front, 0)
+    stop = min((last - 1) * hopsize - front + framelength, y.shape[-1])
+    if first >= last or start >= stop:
+        return start, start
+
+    # Samples overlapped by the changed frames also sum unchanged frames
+    lo, hi = _affected(start, stop, framelength, hopsize, front, count)
+    out = framing._resynthesis(
+        data[..., lo:hi, :],
+        framing._window(settings['window'], framelength, synthesis=True),
+        framing._transforms(
+            autotune._resolve(transforms), 'i' + settings['kind'],
+            settings['odd'],
+        ),
+        framelength,
+        hopsize,
+        first=lo,
+    )
+    offset = lo * hopsize - front
+    out = out[..., start - offset:stop - offset]
+
+    if numpy.issubdtype(y.dtype, numpy.integer):
+        out = framing._pcm(out, y.dtype, scale)
+    y[..., start:stop] = out
+
+    return start, stop
+
+
+def _check(X):
+    settings = framing._settings(X)
+    if not settings:
+        raise TypeError(
+            "Spectrogram must carry its settings, please compute it using "
+            "save_settings=True"
+        )
+    return settings
+
+
+def _data(X, settings):
+    """ Return writeable canonical view of the spectrogram
+
+    """
+    return framing._canonical(
+        getattr(X, 'data', X), settings['layout'], settings['frames_first'],
+        spectral=True,
+    )
+
+
+def _affected(start, stop, framelength, hopsize, front, count):
+    """ Return range of frames overlapping samples start to stop
+
+    """
+    first = max((start + front - framelength) // hopsize + 1, 0)
+    last = min(-(-(stop + front) // hopsize), count)
+    return first, last
@@ -0,0 +1,502 @@
+""" Module for reusable transform plans
+
+A plan precomputes everything that only depends on the configuration of a
+lapped transform, so that repeatedly transforming signals of the same
+configuration does not pay the setup costs again.
+
+.. code-block:: python
+
+    plan = mdct.plan.MDCTPlan(framelength=1024)
+    spectrum = plan.forward(signal)
+    output = plan.inverse(spectrum)
+
+"""
+
+from __future__ import division
+
+import numpy
+import scipy.fft
+
+from . import framing
+from .fast import jit
+from .types import Settings, Spectrogram
+
+__all__ = [
+    'MDCTPlan',
+]
+
+kinds = ('mdct', 'mdst', 'cmdct')
+
+
+class MDCTPlan(object):
+    """ Precomputed lapped MDCT, MDST or complex MDCT
+
+    The window, the pre-twiddle factors and all scaling are fused into a
+    single table applied to the frames before the FFT. The post-twiddle
+    factors, the normalization and the real or imaginary part extraction
+    are fused into a table applied after the FFT. Plans hold arrays only
+    and can be pickled, e.g. to be shipped to worker processes.
+
+    If Numba is installed, applying the tables, extracting the real part and
+    overlap-adding the frames each run as a single compiled loop, see
+    :mod:`mdct.fast.jit`.
+
+    Parameters
+    ----------
+    framelength : int, optional
+        The signal frame length. Defaults to :code:`2048`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    window : callable, array_like, tuple
+        Window to be used for deringing. Can be :code:`False` to disable
+        windowing, or a pair of analysis and synthesis windows. Defaults to
+        :code:`scipy.signal.cosine`.
+    dtype : numpy.dtype, optional
+        Floating point precision of the computation, either
+        :code:`numpy.float64` or :code:`numpy.float32`. Defaults to
+        :code:`numpy.float64`.
+    kind : str, optional
+        The transform to use, one of :code:`'mdct'`, :code:`'mdst'` and
+        :code:`'cmdct'`. Defaults to :code:`'mdct'`.
+    hopsize : int
+        The signal frame hopsize. Defaults to :code:`None`. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Defaults to :code:`2`.
+    centered : boolean
+        Pad input signal so that the first and last window are centered around
+        the beginning of the signal. Defaults to :code:`True`.
+
+    Notes
+    -----
+    The results equal those of :func:`mdct.mdct`, :func:`mdct.mdst` and
+    :func:`mdct.cmdct` and their inverses using the same settings.
+
+    """
+    def __init__(
+        self,
+        framelength=2048,
+        odd=True,
+        window=None,
+        dtype=numpy.float64,
+        kind='mdct',
+        hopsize=None,
+        overlap=None,
+        centered=True,
+    ):
+        if kind not in kinds:
+            raise ValueError(
+                "Unknown kind {0!r}, must be one of {1}".format(kind, kinds)
+            )
+
+        self.framelength = framelength
+        self.odd = odd
+        self.kind = kind
+        self.dtype = numpy.dtype(dtype)
+        self.hopsize = framing._hopsize(framelength, hopsize, overlap)
+        self.centered = centered
+
+        analysis = framing._window(window, framelength)
+        synthesis = framing._window(window, framelength, synthesis=True)
+        if numpy.array_equal(analysis, synthesis):
+            self.window = analysis
+        else:
+            self.window = (analysis, synthesis)
+
+        self._tables(analysis, synthesis)
+
+    @property
+    def bins(self):
+        """ Number of coefficients per frame
+
+        """
+        return self.framelength // 2 + (0 if self.odd else 1)
+
+    def _tables(self, analysis, synthesis):
+        """ Precompute the fused pre- and post-processing tables
+
+        """
+        N = self.framelength // 2
+        n = numpy.arange(N)
+        k = numpy.arange(self.bins) + (0.5 if self.odd else 0)
+        n0 = (N + 1) / 2
+        complex_dtype = numpy.result_type(self.dtype, numpy.complex64)
+
+        norm = self.framelength // self.hopsize // 2
+        scale = numpy.sqrt(1 / N) / max(norm, 1)
+
+        # Factors extracting the transform from the complex MDCT by taking
+        # the real part, one per frame parity as evenly stacked transforms
+        # alternate between cosine and sine modulation
+        if self.kind == 'cmdct':
+            factors = [1, 1]
+        elif self.kind == 'mdct':
+            factors = [numpy.sqrt(2), 1j * numpy.sqrt(2)]
+        else:
+            factors = [1j * numpy.sqrt(2), numpy.sqrt(2)]
+        if self.odd:
+            factors = factors[:1]
+
+        post = numpy.exp(-1j * numpy.pi * n0 * k / N) * scale
+        ipre = numpy.exp(1j * numpy.pi * n0 * k / N)
+
+        if self.odd:
+            # Oddly stacked frames are folded into complex sequences of
+            # length N, whose FFT yields the even bins directly and the odd
+            # bins conjugated in reverse order, see
+            # :func:`mdct.fast.transforms.cmdct`
+            twiddle = numpy.exp(-1j * numpy.pi * n / (2 * N))
+            self._pre = (
+                numpy.concatenate((twiddle, -1j * twiddle)) * analysis
+            ).astype(complex_dtype)
+
+            twiddle = numpy.conj(twiddle) * numpy.sqrt(N)
+            self._ipost = (
+                numpy.concatenate((twiddle, 1j * twiddle)) * synthesis
+            ).astype(complex_dtype)
+        else:
+            self._pre = analysis.astype(self.dtype)
+            post[[0, -1]] *= numpy.sqrt(0.5)
+
+            ipre[[0, -1]] *= numpy.sqrt(0.5)
+            ipre[1:-1] *= 0.5
+            self._ipost = (synthesis * 2 * numpy.sqrt(N)).astype(self.dtype)
+
+        self._post = [
+            (post * factor).astype(complex_dtype) for factor in factors
+        ]
+        self._ipre = [
+            (ipre * numpy.conj(factor)).astype(complex_dtype)
+            for factor in factors
+        ]
+
+    @property
+    def result_type(self):
+        """ Data type of the coefficients
+
+        """
+        if self.kind == 'cmdct':
+            return self._post[0].dtype
+        else:
+            return self.dtype
+
+    def forward_frames(self, frames, first=0, scale=1, out=None):
+        """ Window and transform frames
+
+        Parameters
+        ----------
+        frames : array_like
+            Frames in the shape of :code:`... x frames x framelength`, or a
+            single frame of length :code:`framelength`.
+        first : int, optional
+            Index of the first frame, used to continue the alternation of
+            evenly stacked transforms. Defaults to :code:`0`.
+        scale : float, optional
+            Factor the samples are multiplied by during windowing. Defaults
+            to :code:`1`.
+        out : array_like, optional
+            Array of :attr:`result_type` to write the coefficients to, may be
+            a view. Defaults to a new array.
+
+        Returns
+        -------
+        out : array_like
+            Coefficients in the shape of :code:`... x frames x bins`.
+
+        """
+        frames = framing._asarray(frames)
+        if frames.shape[-1] != self.framelength:
+            raise ValueError(
+                "Frames must be of length {0}".format(self.framelength)
+            )
+
+        shape = frames.shape[:-1] + (self.bins,)
+        if out is None:
+            out = numpy.empty(shape, dtype=self.result_type)
+        elif out.shape != shape:
+            raise ValueError(
+                "Output of shape {0} does not match coefficients of shape "
+                "{1}".format(out.shape, shape)
+            )
+
+        single = frames.ndim == 1
+        if single:
+            frames = frames[None]
+            out = out[None]
+
+        N = self.framelength // 2
+        pre = self._pre if scale == 1 else self._pre * scale
+
+        if self.odd:
+            A = scipy.fft.fft(
+                jit.multiply(
+                    frames, pre,
+                    numpy.empty(frames.shape[:-1] + (N,), dtype=pre.dtype)
+                ),
+                axis=-1,
+                overwrite_x=True,
+            )
+            head = A[..., :(N + 1) // 2]
+            tail = A[..., :(N - 1) // 2:-1]
+            post = self._post[0]
+
+            if self.kind == 'cmdct':
+                numpy.multiply(head, post[0::2], out=out[..., 0::2])
+                numpy.multiply(
+                    numpy.conj(tail), post[1::2], out=out[..., 1::2]
+                )
+            else:
+                jit.postmultiply(head, post[0::2], out[..., 0::2])
+                jit.postmultiply(
+                    tail, numpy.conj(post[1::2]), out[..., 1::2]
+                )
+        else:
+            X = scipy.fft.rfft(
+                jit.multiply(
+                    frames, pre, numpy.empty(frames.shape, dtype=pre.dtype)
+                ),
+                axis=-1,
+            )
+
+            if self.kind == 'cmdct':
+                numpy.multiply(X, self._post[0], out=out)
+            else:
+                self._cycle(jit.postmultiply, X, self._post, out, first)
+
+        if single:
+            out = out[0]
+
+        return out
+
+    @staticmethod
+    def _cycle(function, X, tables, out, first):
+        """ Apply function to consecutive frames, cycling over tables
+
+        """
+        step = len(tables)
+        for i, table in enumerate(tables):
+            which = (i - first) % step
+            function(
+                X[..., which::step, :], table, out[..., which::step, :]
+            )
+
+    def inverse_frames(self, X, first=0):
+        """ Inverse transform and window frames
+
+        Parameters
+        ----------
+        X : array_like
+            Coefficients in the shape of :code:`... x frames x bins`, or the
+            coefficients of a single frame.
+        first : int, optional
+            Index of the first frame, used to continue the alternation of
+            evenly stacked transforms. Defaults to :code:`0`.
+
+        Returns
+        -------
+        out : array_like
+            Frames in the shape of :code:`... x frames x framelength`.
+
+        """
+        X = framing._asarray(X)
+        if X.shape[-1] != self.bins:
+            raise ValueError(
+                "Frames must have {0} coefficients".format(self.bins)
+            )
+
+        single = X.ndim == 1
+        if single:
+            X = X[None]
+
+        out = numpy.empty(X.shape[:-1] + (self.framelength,), dtype=self.dtype)
+        jit.postmultiply(self._spectra(X, first), self._ipost, out)
+
+        if single:
+            out = out[0]
+
+        return out
+
+    def _spectra(self, X, first=0):
+        """ Return inverse FFT of the twiddled coefficients
+
+        For oddly stacked transforms, the result is the folded frame of
+        length :code:`framelength // 2`, which is unfolded by the complex
+        post-processing table.
+
+        """
+        N = self.framelength // 2
+
+        if self.odd:
+            ipre = self._ipre[0]
+            B = numpy.empty(X.shape[:-1] + (N,), dtype=ipre.dtype)
+            numpy.multiply(
+                X[..., 0::2], ipre[0::2], out=B[..., :(N + 1) // 2]
+            )
+            numpy.multiply(
+                numpy.conj(X[..., 1::2][..., ::-1]),
+                numpy.conj(ipre[1::2][::-1]),
+                out=B[..., (N + 1) // 2:],
+            )
+
+            return scipy.fft.ifft(B, axis=-1, overwrite_x=True)
+        else:
+            H = numpy.empty(X.shape, dtype=self._ipre[0].dtype)
+            self._cycle(numpy.multiply, X, self._ipre, H, first)
+
+            return scipy.fft.irfft(H, n=2 * N, axis=-1, overwrite_x=True)
+
+    def forward(
+        self,
+        x,
+        scale=None,
+        save_settings=True,
+        layout='channels_last',
+        frames_first=None,
+        out=None,
+    ):
+        """ Calculate the lapped transform of a signal
+
+        Parameters
+        ----------
+        x : array_like
+            The signal to be transformed, see :func:`mdct.mdct`.
+        scale : float, optional
+            Factor the samples are multiplied by during windowing. Defaults to
+            normalizing integer PCM to full scale.
+        save_settings : boolean, optional
+            Return a :class:`mdct.types.Spectrogram` carrying the settings of
+            the plan. Defaults to :code:`True`.
+        layout : str, optional
+            Memory layout of multichannel data, see :func:`mdct.mdct`.
+            Defaults to :code:`'channels_last'`.
+        frames_first : boolean, optional
+            Return :code:`frames x bins` instead of :code:`bins x frames`
+            spectrograms. Defaults to :code:`True` for
+            :code:`'channels_first'` layout and :code:`False` otherwise.
+        out : array_like, optional
+            Array of :attr:`result_type` to write the spectrogram to, in the
+            shape and layout of the result. Defaults to a new array.
+
+        Returns
+        -------
+        out : array_like
+            The spectrogram (or tensor of spectrograms).
+
+        """
+        if frames_first is None:
+            frames_first = layout == 'channels_first'
+
+        x = framing._canonical(framing._signed(framing._asarray(x)), layout)
+        outlength = x.shape[-1]
+        scale = framing._scale(x.dtype, scale)
+
+        count, chunks = framing._chunks(
+            x, self.framelength, self.hopsize, self.centered
+        )
+        if out is None:
+            out = framing._orient(
+                numpy.empty(
+                    x.shape[:-1] + (count, self.bins), dtype=self.result_type
+                ),
+                layout, frames_first,
+            )
+
+        data = framing._canonical(out, layout, frames_first, spectral=True)
+        if data.shape != x.shape[:-1] + (count, self.bins):
+            raise ValueError(
+                "Output of shape {0} does not match the spectrogram of "
+                "{1} frames".format(out.shape, count)
+            )
+
+        for start, frames in chunks:
+            self.forward_frames(
+                frames, first=start, scale=scale,
+                out=data[..., start:start + frames.shape[-2], :],
+            )
+
+        if save_settings:
+            out = Spectrogram(
+                out, self._settings(outlength, layout, frames_first)
+            )
+
+        return out
+
+    def _settings(self, outlength, layout, frames_first):
+        """ Return the settings of a spectrogram computed using this plan
+
+        """
+        return Settings(
+            kind=self.kind,
+            odd=self.odd,
+            framelength=self.framelength,
+            hopsize=self.hopsize,
+            window=self.window,
+            centered=self.centered,
+            padding=0,
+            outlength=outlength,
+            layout=layout,
+            frames_first=frames_first,
+        )
+
+    def inverse(
+        self,
+        X,
+        outlength=None,
+        dtype=None,
+        scale=None,
+        layout=None,
+        frames_first=None,
+    ):
+        """ Calculate the inverse lapped transform of a spectrogram
+
+        Parameters
+        ----------
+        X : array_like
+            The spectrogram to be inverted, see :func:`mdct.imdct`.
+        outlength : int, optional
+            Crop output signal to length. Defaults to infer from data.
+        dtype : numpy.dtype, optional
+            Output data type. Integer types will yield rounded and clipped
+            integer PCM. Defaults to floating point output.
+        scale : float, optional
+            Factor the samples were multiplied by during the forward
+            transform. Defaults to the full scale of :code:`dtype`.
+        layout : str, optional
+            Memory layout of multichannel data. Defaults to infer from data.
+        frames_first : boolean, optional
+            The frames axis is before the bins axis. Defaults to infer from
+            data.
+
+        Returns
+        -------
+        out : array_like
+            The signal (or matrix of signals).
+
+        """
+        if outlength is None:
+            outlength = framing._infer(X, 'outlength', None)
+        if layout is None:
+            layout = framing._infer(X, 'layout', 'channels_last')
+        if frames_first is None:
+            frames_first = framing._infer(
+                X, 'frames_first', layout == 'channels_first'
+            )
+
+        X = framing._canonical(
+            framing._asarray(getattr(X, 'data', X)), layout, frames_first,
+            spectral=True
+        )
+        out = jit.overlap_add(self._spectra(X), self._ipost, self.hopsize)
+
+        if self.centered:
+            out = out[..., self.framelength // 2:-self.framelength // 2]
+
+        out = out[..., :outlength]
+
+        if layout == 'channels_last':
+            out = out.T
+
+        if dtype is not None:
+            out = framing._pcm(out, dtype, scale)
+
+        return out
@@ -0,0 +1,161 @@
+""" Module for resampling signals in the MDCT domain
+
+A spectrogram is resampled by truncating or zero-extending its bins and
+inverting it at a frame length scaled by the resampling factor. Truncating
+bins removes all frequencies above the new Nyquist frequency, so no separate
+lowpass filter is needed.
+
+.. code-block:: python
+
+    spectrum = mdct.storage.load('spec.mdct')
+    preview = mdct.resampling.resample(spectrum, down=4)
+
+"""
+
+from __future__ import division
+
+import fractions
+
+import numpy
+import stft
+
+from . import autotune, framing
+
+__all__ = [
+    'resample',
+]
+
+
+def resample(
+    X,
+    up=1,
+    down=1,
+    dtype=None,
+    scale=None,
+    transforms=None,
+):
+    """ Invert a spectrogram at a different sample rate
+
+    Parameters
+    ----------
+    X : array_like
+        The spectrogram, carrying the settings of the forward transform, e.g.
+        a :class:`mdct.types.Spectrogram` or a spectrogram loaded using
+        :func:`mdct.storage.load`.
+    up : int, optional
+        Upsampling factor. Defaults to :code:`1`.
+    down : int, optional
+        Downsampling factor. Defaults to :code:`1`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+
+    Returns
+    -------
+    out : array_like
+        The signal at :code:`up / down` times the original sample rate, in
+        the layout of the original signal.
+
+    Notes
+    -----
+    Frame length and hopsize multiplied by :code:`up / down` must be
+    integers. Coefficients are scaled by :code:`sqrt(up / down)` to preserve
+    the amplitude of the signal. The window is stretched to the new frame
+    length by interpolation.
+
+    Samples are aligned to the centers of the spans of the original samples,
+    i.e. output sample :code:`m` lies at input sample :code:`(m + 1/2) * down
+    / up - 1/2`.
+
+    """
+    settings = framing._settings(X)
+    if not settings:
+        raise TypeError(
+            "Spectrogram must carry its settings, please compute it using "
+            "save_settings=True"
+        )
+
+    ratio = fractions.Fraction(up, down)
+    framelength = settings['framelength'] * ratio
+    hopsize = settings['hopsize'] * ratio
+    if framelength.denominator != 1 or hopsize.denominator != 1:
+        raise ValueError(
+            "Frame length {0} and hopsize {1} cannot be resampled by "
+            "{2}/{3}".format(
+                settings['framelength'], settings['hopsize'], up, down
+            )
+        )
+    framelength = int(framelength)
+    hopsize = int(hopsize)
+
+    if settings.get('padding'):
+        raise ValueError("Spectrograms of padded frames cannot be resampled")
+
+    odd = settings['odd']
+    layout = settings['layout']
+    kind = settings['kind']
+
+    X = framing._canonical(
+        framing._asarray(X), layout, settings['frames_first'], spectral=True
+    )
+    bins = framelength // 2 + (0 if odd else 1)
+    if bins <= X.shape[-1]:
+        X = X[..., :bins]
+    else:
+        padtuple = [(0, 0)] * X.ndim
+        padtuple[-1] = (0, bins - X.shape[-1])
+        X = numpy.pad(X, padtuple, mode='constant')
+
+    outlength = settings.get('outlength')
+    if outlength is not None:
+        outlength = -(-outlength * ratio.numerator // ratio.denominator)
+
+    out = framing.ispectrogram(
+        X * numpy.sqrt(float(ratio)),
+        transform=framing._transforms(
+            autotune._resolve(transforms), 'i' + kind, odd
+        ),
+        framelength=framelength,
+        hopsize=hopsize,
+        centered=settings['centered'],
+        window=_window(
+            settings['window'], settings['framelength'], framelength
+        ),
+        padding=0,
+        outlength=outlength,
+        dtype=dtype,
+        scale=scale,
+        layout='channels_first',
+        frames_first=True,
+    )
+
+    if layout == 'channels_last':
+        out = out.T
+
+    return out
+
+
+def _window(window, framelength, target):
+    """ Return synthesis window for the target frame length
+
+    """
+    if window is False:
+        return False
+
+    window = framing._window(window, framelength, synthesis=True)
+    if numpy.allclose(window, stft.stft.cosine(framelength)):
+        return stft.stft.cosine(target)
+
+    # Sample the window at the centers of the samples of the target length
+    return numpy.interp(
+        (numpy.arange(target) + 0.5) * framelength / target - 0.5,
+        numpy.arange(framelength),
+        window,
+    )
@@ -175,7 +175,7 @@ def trans(x, func, odd=True):
         The output signal
 
     """
-    N = len(x) // 2
+    N = x.shape[-1] // 2
     if odd:
         outlen = N
         offset = 0.5
@@ -183,23 +183,24 @@ def trans(x, func, odd=True):
         outlen = N + 1
         offset = 0.0
 
-    X = numpy.zeros(outlen, dtype=numpy.complex)
-    n = numpy.arange(len(x))
+    X = numpy.zeros(x.shape[:-1] + (outlen,), dtype=complex)
+    n = numpy.arange(x.shape[-1])
 
-    for k in range(len(X)):
-        X[k] = numpy.sum(
+    for k in range(outlen):
+        X[..., k] = numpy.sum(
             x * func(
                 (numpy.pi / N) * (
                     n + 0.5 + N / 2
                 ) * (
                     k + offset
                 )
-            )
+            ),
+            axis=-1
         )
 
     if not odd:
-        X[0] *= numpy.sqrt(0.5)
-        X[-1] *= numpy.sqrt(0.5)
+        X[..., 0] *= numpy.sqrt(0.5)
+        X[..., -1] *= numpy.sqrt(0.5)
 
     return X * numpy.sqrt(1 / N)
 
@@ -225,7 +226,7 @@ def itrans(X, func, odd=True):
         The output signal
 
     """
-    if not odd and len(X) % 2 == 0:
+    if not odd and X.shape[-1] % 2 == 0:
         raise ValueError(
             "Even inverse CMDCT requires an odd number "
             "of coefficients"
@@ -234,27 +235,28 @@ def itrans(X, func, odd=True):
     X = X.copy()
 
     if odd:
-        N = len(X)
+        N = X.shape[-1]
         offset = 0.5
     else:
-        N = len(X) - 1
+        N = X.shape[-1] - 1
         offset = 0.0
 
-        X[0] *= numpy.sqrt(0.5)
-        X[-1] *= numpy.sqrt(0.5)
+        X[..., 0] *= numpy.sqrt(0.5)
+        X[..., -1] *= numpy.sqrt(0.5)
 
-    x = numpy.zeros(N * 2, dtype=numpy.complex)
-    k = numpy.arange(len(X))
+    x = numpy.zeros(X.shape[:-1] + (N * 2,), dtype=complex)
+    k = numpy.arange(X.shape[-1])
 
-    for n in range(len(x)):
-        x[n] = numpy.sum(
+    for n in range(N * 2):
+        x[..., n] = numpy.sum(
             X * func(
                 (numpy.pi / N) * (
                     n + 0.5 + N / 2
                 ) * (
                     k + offset
                 )
-            )
+            ),
+            axis=-1
         )
 
     return numpy.real(x) * numpy.sqrt(1 / N)
@@ -0,0 +1,180 @@
+""" Module for sparse lapped transforms keeping the largest coefficients
+
+The signal is transformed in blocks of frames, see :func:`mdct.iter_mdct`,
+and only the largest coefficients of each frame are kept, so that the dense
+spectrogram is never held in memory. The result is a
+:class:`mdct.types.SparseSpectrogram`, which all lapped inverse transforms
+accept.
+
+.. code-block:: python
+
+    spectrum = mdct.sparse.mdct(signal, k=32)
+    output = mdct.imdct(spectrum)
+
+"""
+
+from __future__ import division
+
+import numpy
+import stft
+
+from . import framing, streaming
+from .types import Settings, SparseSpectrogram
+
+__all__ = [
+    'mdct', 'mdst', 'cmdct',
+]
+
+
+def mdct(x, k=None, threshold=None, odd=True, blocksize=256, **kwargs):
+    """ Calculate lapped MDCT of input signal, keeping the largest
+    coefficients of each frame
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed, see :func:`mdct.iter_mdct`.
+    k : int, optional
+        Number of coefficients of largest magnitude kept per frame and
+        channel. Defaults to keeping all coefficients above
+        :code:`threshold`.
+    threshold : float, optional
+        Minimum magnitude of kept coefficients. Defaults to no threshold.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    blocksize : int, optional
+        Number of frames transformed at once. Defaults to :code:`256`.
+    **kwargs, optional
+        Additional keyword arguments passed to
+        :class:`mdct.streaming.Analyzer`
+
+    Returns
+    -------
+    out : SparseSpectrogram
+        The kept coefficients, in bins of ascending order per frame.
+
+    """
+    return _sparse('mdct', x, k, threshold, odd, blocksize, kwargs)
+
+
+def mdst(x, k=None, threshold=None, odd=True, blocksize=256, **kwargs):
+    """ Calculate lapped MDST of input signal, keeping the largest
+    coefficients of each frame
+
+    See :func:`mdct` for all parameters.
+
+    """
+    return _sparse('mdst', x, k, threshold, odd, blocksize, kwargs)
+
+
+def cmdct(x, k=None, threshold=None, odd=True, blocksize=256, **kwargs):
+    """ Calculate lapped complex MDCT/MCLT of input signal, keeping the
+    largest coefficients of each frame
+
+    See :func:`mdct` for all parameters.
+
+    """
+    return _sparse('cmdct', x, k, threshold, odd, blocksize, kwargs)
+
+
+def _sparse(kind, x, k, threshold, odd, blocksize, kwargs):
+    if k is None and threshold is None:
+        raise ValueError("Either k or threshold must be given")
+    if k is not None and k < 1:
+        raise ValueError("k must be positive")
+
+    window = kwargs.pop('window', None)
+    if window is None:
+        window = stft.stft.cosine
+    kwargs.setdefault('framelength', 2048)
+
+    analyzer = streaming.Analyzer(kind, odd=odd, window=window, **kwargs)
+
+    # The analyzer forgets the signal length when flushed
+    samples = [0]
+    if isinstance(x, numpy.ndarray):
+        samples[0] = len(x)
+    else:
+        x = _counted(x, samples)
+
+    bins = analyzer.bins
+    index_dtype = numpy.min_scalar_type(bins - 1)
+
+    indices = []
+    values = []
+    counts = []
+    frames = 0
+    channels = ()
+    for block in streaming._stream(analyzer, x, blocksize):
+        channels = block.shape[2:]
+        frames += block.shape[1]
+
+        # Rows of frames x channels, with the bins on the last axis
+        rows = numpy.moveaxis(block, 0, -1).reshape(-1, bins)
+        index, value, count = _select(rows, k, threshold)
+
+        indices.append(index.astype(index_dtype))
+        values.append(value)
+        counts.append(count)
+
+    offsets = numpy.zeros(frames * int(numpy.prod(channels)) + 1, numpy.intp)
+    if counts:
+        numpy.cumsum(numpy.concatenate(counts), out=offsets[1:])
+
+    return SparseSpectrogram(
+        numpy.concatenate(indices) if indices else
+        numpy.zeros(0, index_dtype),
+        numpy.concatenate(values) if values else numpy.zeros(0),
+        offsets,
+        (bins, frames) + channels,
+        Settings(
+            kind=kind,
+            odd=odd,
+            framelength=analyzer.framelength,
+            hopsize=analyzer.hopsize,
+            window=window,
+            centered=analyzer.centered,
+            padding=0,
+            outlength=samples[0],
+            layout='channels_last',
+            frames_first=False,
+        ),
+    )
+
+
+def _counted(chunks, samples):
+    """ Yield chunks, adding up their lengths in samples[0]
+
+    """
+    for chunk in chunks:
+        chunk = framing._asarray(chunk)
+        samples[0] += len(chunk)
+        yield chunk
+
+
+def _select(rows, k, threshold):
+    """ Return indices, values and number of the kept coefficients of rows
+
+    """
+    magnitude = numpy.abs(rows)
+
+    if k is not None and k < rows.shape[-1]:
+        index = numpy.sort(
+            numpy.argpartition(-magnitude, k - 1, axis=-1)[:, :k], axis=-1
+        )
+        value = numpy.take_along_axis(rows, index, axis=-1)
+        if threshold is None:
+            return (
+                index.ravel(), value.ravel(),
+                numpy.full(len(rows), k, dtype=numpy.intp),
+            )
+
+        keep = numpy.take_along_axis(magnitude, index, axis=-1) >= threshold
+        return index[keep], value[keep], keep.sum(axis=-1)
+
+    if threshold is None:
+        keep = numpy.ones(rows.shape, dtype=bool)
+    else:
+        keep = magnitude >= threshold
+
+    return numpy.nonzero(keep)[1], rows[keep], keep.sum(axis=-1)
@@ -0,0 +1,495 @@
+""" Module for storing spectrograms in a compact, memory mappable format
+
+Coefficients are stored either as :code:`float16` or quantized to
+:code:`int8` or :code:`int16` using one scale factor per frequency bin,
+together with all settings needed to invert the spectrogram.
+
+.. code-block:: python
+
+    mdct.storage.save('spec.mdct', mdct.mdct(signal), dtype='int16')
+    output = mdct.imdct(mdct.storage.load('spec.mdct'))
+
+Spectrograms too large to be held in memory can be written frame by frame
+into a file created using :func:`open_memmap`.
+
+"""
+
+from __future__ import division
+
+import json
+
+import numpy
+
+from . import framing
+from .types import Settings
+
+__all__ = [
+    'save', 'load', 'open_memmap', 'QuantizedSpectrogram',
+]
+
+magic = b'\x93MDCT'
+version = 1
+alignment = 64
+dtypes = ('float16', 'int8', 'int16')
+
+
+class QuantizedSpectrogram(object):
+    """ Spectrogram stored as (possibly memory mapped) quantized coefficients
+
+    Coefficients are only dequantized when they are accessed, either as a
+    whole using :attr:`data` or by frames using :meth:`dequantize`. The object
+    can be passed directly to the inverse lapped transforms.
+
+    Parameters
+    ----------
+    codes : array_like
+        Quantized coefficients in the shape of :code:`channels x frames x
+        bins`, or :code:`... x frames x bins` for spectrograms computed
+        along an :code:`axis` of N-D signals. Complex coefficients are
+        stored as interleaved real and imaginary parts.
+    scales : array_like
+        Scale factor per bin, or :code:`None` for floating point codes.
+    settings : Settings
+        The settings of the forward transform.
+    complex : boolean
+        The coefficients are complex.
+    metadata : dict, optional
+        Additional information stored along with the spectrogram, e.g. the
+        sample rate. Defaults to an empty dict.
+
+    """
+    __slots__ = ('codes', 'scales', 'settings', 'complex', 'metadata')
+
+    def __init__(self, codes, scales, settings, complex=False, metadata=None):
+        self.codes = codes
+        self.scales = scales
+        self.settings = settings
+        self.complex = complex
+        self.metadata = metadata or {}
+
+    def quantize(self, data, start=0):
+        """ Quantize frames and store them
+
+        Parameters
+        ----------
+        data : array_like
+            Frames in the layout the spectrogram was originally computed in.
+        start : int, optional
+            Index of the first frame. Defaults to :code:`0`.
+
+        """
+        data = _canonical(numpy.asarray(data), self.settings)
+        if self.complex:
+            data = numpy.ascontiguousarray(data, dtype=numpy.complex128)
+            data = data.view(numpy.float64)
+
+        self.codes[..., start:start + data.shape[-2], :] = _encode(
+            data, self.codes.dtype, self.scales
+        )
+
+    def dequantize(self, start=None, stop=None):
+        """ Dequantize frames
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            Range of frames to dequantize. Defaults to all frames.
+
+        Returns
+        -------
+        out : array_like
+            The spectrogram, in the layout it was originally computed in.
+
+        """
+        out = self.codes[..., start:stop, :].astype(numpy.float64)
+
+        if self.scales is not None:
+            out *= self.scales
+
+        if self.complex:
+            out = out.view(numpy.complex128)
+
+        return _orient(out, self.settings)
+
+    @property
+    def data(self):
+        return self.dequantize()
+
+    @property
+    def shape(self):
+        shape = self.codes.shape
+        if self.complex:
+            shape = shape[:-1] + (shape[-1] // 2,)
+
+        return _orient(numpy.broadcast_to(0, shape), self.settings).shape
+
+    @property
+    def dtype(self):
+        return numpy.dtype(numpy.complex128 if self.complex else numpy.float64)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("Unable to avoid copy while dequantizing")
+        return numpy.asarray(self.dequantize(), dtype=dtype)
+
+    def __len__(self):
+        return self.shape[0]
+
+
+def save(file, spectrogram, dtype='float16', metadata=None):
+    """ Save spectrogram in compact format
+
+    Parameters
+    ----------
+    file : str, file
+        Filename or file object opened in binary mode, positioned at its
+        start.
+    spectrogram : mdct.types.Spectrogram
+        The spectrogram, as returned by the lapped transforms with
+        :code:`save_settings=True`.
+    dtype : str, optional
+        Storage type of the coefficients. Either :code:`'float16'`, or
+        :code:`'int8'` or :code:`'int16'` for quantization using one scale
+        factor per frequency bin. Defaults to :code:`'float16'`, which
+        raises a :code:`ValueError` for coefficients above its maximum of
+        :code:`65504`.
+    metadata : dict, optional
+        Additional JSON serializable information to be stored along with the
+        spectrogram, e.g. the sample rate.
+
+    """
+    _check(dtype)
+
+    settings = getattr(spectrogram, 'settings', None)
+    if not isinstance(settings, Settings):
+        raise TypeError(
+            "Spectrogram must carry its settings, please compute it using "
+            "save_settings=True"
+        )
+
+    data = _canonical(numpy.asarray(spectrogram), settings)
+    is_complex = numpy.iscomplexobj(data)
+    if is_complex:
+        data = numpy.ascontiguousarray(data, dtype=numpy.complex128)
+        data = data.view(numpy.float64)
+
+    if dtype == 'float16':
+        scales = None
+    else:
+        scales = _scales(_peak(data), numpy.dtype(dtype))
+    codes = _encode(data, numpy.dtype(dtype), scales)
+
+    header, blocks = _blocks(
+        settings, codes.shape, is_complex, dtype, scales, metadata
+    )
+    blocks.append(('codes', codes))
+
+    if hasattr(file, 'write'):
+        if file.tell() != 0:
+            raise ValueError(
+                "File offsets are relative to the start of the file, cannot "
+                "save at position {0}".format(file.tell())
+            )
+        _write(file, header, blocks)
+    else:
+        with open(file, 'wb') as f:
+            _write(f, header, blocks)
+
+
+def open_memmap(
+    file,
+    settings,
+    shape,
+    complex=False,
+    dtype='float16',
+    peak=None,
+    metadata=None,
+):
+    """ Create spectrogram file to be filled frame by frame
+
+    Parameters
+    ----------
+    file : str
+        Filename.
+    settings : mdct.types.Settings
+        The settings of the forward transform.
+    shape : tuple
+        Shape of the spectrogram as :code:`channels x frames x bins`, or
+        :code:`frames x bins` for single channel spectrograms. Spectrograms
+        of N-D signals computed using :code:`axis` have any number of
+        leading axes.
+    complex : boolean, optional
+        The coefficients are complex. Defaults to :code:`False`.
+    dtype : str, optional
+        Storage type of the coefficients, see :func:`save`. Defaults to
+        :code:`'float16'`.
+    peak : array_like, optional
+        Maximum absolute value per bin, required for quantization to
+        :code:`'int8'` or :code:`'int16'`. Complex coefficients need
+        separate maxima for real and imaginary parts, interleaved.
+    metadata : dict, optional
+        Additional JSON serializable information to be stored along with the
+        spectrogram, e.g. the sample rate.
+
+    Returns
+    -------
+    out : QuantizedSpectrogram
+        The spectrogram with writeable memory mapped coefficients, to be
+        filled using :meth:`QuantizedSpectrogram.quantize`.
+
+    """
+    _check(dtype)
+
+    shape = tuple(shape)
+    if complex:
+        shape = shape[:-1] + (shape[-1] * 2,)
+
+    if dtype == 'float16':
+        scales = None
+        if peak is not None:
+            _finite(numpy.max(peak, initial=0))
+    elif peak is None:
+        raise ValueError(
+            "Quantization to {0} requires the peak per bin".format(dtype)
+        )
+    else:
+        scales = _scales(numpy.asarray(peak), numpy.dtype(dtype))
+
+    header, blocks = _blocks(settings, shape, complex, dtype, scales, metadata)
+
+    with open(file, 'wb') as f:
+        offset = _write(f, header, blocks, (numpy.dtype(dtype), shape))
+
+    codes = numpy.memmap(
+        file, dtype=dtype, mode='r+', offset=offset, shape=shape
+    )
+
+    return QuantizedSpectrogram(
+        codes, scales, settings, complex=complex, metadata=metadata
+    )
+
+
+def load(file, mmap=True):
+    """ Load spectrogram saved using :func:`save`
+
+    Parameters
+    ----------
+    file : str
+        Filename.
+    mmap : boolean, optional
+        Memory map the coefficients instead of reading them. Defaults to
+        :code:`True`.
+
+    Returns
+    -------
+    out : QuantizedSpectrogram
+        The spectrogram, can be passed directly to the inverse lapped
+        transforms.
+
+    """
+    with open(file, 'rb') as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError("Not a spectrogram file")
+
+        length = int(numpy.frombuffer(f.read(4), dtype='<u4')[0])
+        header = json.loads(f.read(length).decode('utf-8'))
+
+        if header['version'] > version:
+            raise ValueError(
+                "Unsupported file version {0}".format(header['version'])
+            )
+
+        arrays = {}
+        for name, offset, dtype, shape in header['blocks']:
+            if name == 'codes' and mmap:
+                arrays[name] = numpy.memmap(
+                    file, dtype=dtype, mode='r', offset=offset,
+                    shape=tuple(shape)
+                )
+            else:
+                f.seek(offset)
+                arrays[name] = numpy.fromfile(
+                    f, dtype=dtype, count=int(numpy.prod(shape))
+                ).reshape(shape)
+
+    window = arrays['window']
+    if numpy.array_equal(window[0], window[1]):
+        window = window[0]
+    else:
+        window = tuple(window)
+
+    settings = Settings(**dict(header['settings'], window=window))
+
+    return QuantizedSpectrogram(
+        arrays['codes'],
+        arrays.get('scales'),
+        settings,
+        complex=header['complex'],
+        metadata=header.get('metadata'),
+    )
+
+
+def _check(dtype):
+    if dtype not in dtypes:
+        raise ValueError(
+            "Unknown dtype {0!r}, must be one of {1}".format(dtype, dtypes)
+        )
+
+
+def _blocks(settings, shape, is_complex, dtype, scales, metadata):
+    """ Return header and all blocks but the coefficients
+
+    """
+    window = numpy.stack((
+        framing._window(settings.window, settings.framelength),
+        framing._window(
+            settings.window, settings.framelength, synthesis=True
+        ),
+    ))
+    header = {
+        'version': version,
+        'dtype': dtype,
+        'shape': [int(n) for n in shape],
+        'complex': bool(is_complex),
+        'settings': dict(settings._asdict(), window=None),
+        'metadata': metadata or {},
+    }
+    blocks = [('window', window.astype(numpy.float64))]
+    if scales is not None:
+        blocks.append(('scales', scales))
+
+    return header, blocks
+
+
+def _canonical(data, settings):
+    """ Return view of spectrogram data as :code:`... x frames x bins`
+
+    """
+    if getattr(settings, 'axis', None) is None:
+        return framing._canonical(
+            data, settings.layout, settings.frames_first, spectral=True
+        )
+
+    return framing._unplace(
+        data, framing._axis(settings.axis, data.ndim - 1),
+        settings.frames_first,
+    )
+
+
+def _orient(codes, settings):
+    """ Return view of :code:`... x frames x bins` codes in the layout the
+    spectrogram was computed in
+
+    """
+    if getattr(settings, 'axis', None) is None:
+        return framing._orient(codes, settings.layout, settings.frames_first)
+
+    return framing._place(
+        codes, framing._axis(settings.axis, codes.ndim - 1),
+        settings.frames_first,
+    )
+
+
+def _peak(data):
+    """ Return maximum absolute value per bin on the last axis
+
+    """
+    return numpy.max(
+        numpy.abs(data.reshape(-1, data.shape[-1])), axis=0, initial=0
+    )
+
+
+def _scales(peak, dtype):
+    """ Return scale factors quantizing values up to peak to dtype
+
+    """
+    scales = peak / numpy.iinfo(dtype).max
+    scales[scales == 0] = 1
+    return scales.astype(numpy.float64)
+
+
+def _encode(data, dtype, scales):
+    """ Convert data to codes of dtype using scales, if any
+
+    """
+    if scales is None:
+        _finite(max(data.max(initial=0), -data.min(initial=0)))
+        return numpy.ascontiguousarray(data, dtype=dtype)
+
+    info = numpy.iinfo(dtype)
+    codes = numpy.rint(data / scales)
+    numpy.clip(codes, info.min, info.max, out=codes)
+    return codes.astype(dtype)
+
+
+def _finite(peak):
+    """ Raise if coefficients up to peak overflow :code:`float16`
+
+    """
+    limit = numpy.finfo(numpy.float16).max
+    if peak > limit:
+        raise ValueError(
+            "Coefficients up to {0:g} exceed the float16 maximum of {1:g}, "
+            "use dtype='int16' to store them with one scale per bin".format(
+                peak, limit
+            )
+        )
+
+
+def _native(value):
+    """ Return NumPy scalars, e.g. settings computed using NumPy, as the
+    Python scalars JSON supports
+
+    """
+    if isinstance(value, numpy.generic):
+        return value.item()
+    raise TypeError(
+        "Object of type {0} is not JSON serializable".format(
+            type(value).__name__
+        )
+    )
+
+
+def _write(f, header, blocks, reserve=None):
+    """ Write header and aligned blocks to file
+
+    If given, room for an array of :code:`(dtype, shape)` is reserved in a
+    final :code:`'codes'` block, whose offset is returned.
+
+    """
+    def serialize(header):
+        return json.dumps(
+            header, sort_keys=True, default=_native
+        ).encode('utf-8')
+
+    layout = [(name, array.dtype, array.shape) for name, array in blocks]
+    if reserve is not None:
+        layout.append(('codes',) + tuple(reserve))
+
+    # Offsets depend on the header length and vice versa, allocate enough
+    # room for the offsets first
+    header['blocks'] = [
+        (name, 2 ** 62, dtype.str, shape) for name, dtype, shape in layout
+    ]
+    offset = len(magic) + 4 + len(serialize(header))
+    offset += -offset % alignment
+
+    header['blocks'] = []
+    for name, dtype, shape in layout:
+        header['blocks'].append((name, offset, dtype.str, shape))
+        offset += int(numpy.prod(shape)) * dtype.itemsize
+        offset += -offset % alignment
+
+    encoded = serialize(header)
+    f.write(magic)
+    f.write(numpy.array(len(encoded), dtype='<u4').tobytes())
+    f.write(encoded)
+
+    for (name, array), (_, offset, _, _) in zip(blocks, header['blocks']):
+        f.write(b'\0' * (offset - f.tell()))
+        f.write(memoryview(numpy.ascontiguousarray(array)).cast('B'))
+
+    if reserve is not None:
+        _, offset, dtype, shape = header['blocks'][-1]
+        f.truncate(offset + int(numpy.prod(shape)) * reserve[0].itemsize)
+        return offset
@@ -0,0 +1,482 @@
+""" Module for calculating lapped MDCT on signals arriving in chunks
+
+The classes defined here keep the overlap state between consecutive chunks,
+so that feeding a signal chunk by chunk yields the same frames as
+transforming the whole signal using :py:mod:`mdct` at once.
+
+The generators :func:`iter_mdct`, :func:`iter_mdst` and :func:`iter_cmdct`
+yield the spectrogram of a signal in blocks of frames, without ever holding
+the whole spectrogram in memory.
+
+"""
+
+from __future__ import division
+
+import math
+
+import numpy
+
+from . import autotune
+from .framing import (
+    _analysis, _asarray, _count, _frames, _hopsize, _normalize, _pcm,
+    _resynthesis, _scale, _signed, _support, _transforms, _window,
+)
+
+__all__ = [
+    'Analyzer', 'Synthesizer',
+    'iter_mdct', 'iter_mdst', 'iter_cmdct',
+]
+
+
+class Analyzer(object):
+    """ Stateful lapped forward transform of a chunked signal
+
+    Parameters
+    ----------
+    kind : str, optional
+        The transform to use, one of :code:`'mdct'`, :code:`'mdst'` and
+        :code:`'cmdct'`. Defaults to :code:`'mdct'`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    framelength : int
+        The signal frame length. Defaults to :code:`2048`.
+    hopsize : int
+        The signal frame hopsize. Defaults to :code:`None`. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Defaults to :code:`2`.
+    centered : boolean
+        Pad input signal so that the first and last window are centered around
+        the beginning of the signal. Defaults to :code:`True`.
+    window : callable, array_like, tuple
+        Window to be used for deringing. Can be :code:`False` to disable
+        windowing, or a pair of analysis and synthesis windows. Defaults to
+        :code:`scipy.signal.cosine`.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    scale : float, optional
+        Factor the samples are multiplied by during windowing. Defaults to
+        normalizing integer PCM to full scale.
+
+    Notes
+    -----
+    Chunks may be of arbitrary length. Frames are emitted as soon as all of
+    their samples not suppressed by trailing zeros of the window have been
+    seen, the remaining frames are emitted by :meth:`flush`.
+
+    """
+    def __init__(
+        self,
+        kind='mdct',
+        odd=True,
+        framelength=2048,
+        hopsize=None,
+        overlap=None,
+        centered=True,
+        window=None,
+        transforms=None,
+        scale=None,
+    ):
+        transforms = autotune._resolve(transforms)
+
+        self.scale = scale
+        self.kind = kind
+        self.odd = odd
+        self.framelength = framelength
+        self.hopsize = _hopsize(framelength, hopsize, overlap)
+        self.centered = centered
+        self.window = _window(window, framelength)
+        self.transforms = _transforms(transforms, kind, odd)
+        self._lookahead = min(
+            _support(self.window)[1], self.framelength - self.hopsize
+        )
+        self.reset()
+
+    def reset(self):
+        """ Discard all state and start over with a new signal
+
+        """
+        self._buffer = None
+        self._samples = 0
+        self._frames = 0
+
+    def _append(self, x):
+        if self._buffer is None:
+            self._scaled = self.window * _scale(x.dtype, self.scale)
+
+            if self.centered:
+                pad = numpy.zeros(
+                    (self.framelength // 2,) + x.shape[1:], dtype=x.dtype
+                )
+                self._buffer = numpy.concatenate((pad, x))
+            else:
+                self._buffer = x
+        else:
+            self._buffer = numpy.concatenate((self._buffer, x))
+
+    def _transform(self, count):
+        buffer = self._buffer
+        missing = (count - 1) * self.hopsize + self.framelength - len(buffer)
+        if count and missing > 0:
+            buffer = numpy.concatenate((
+                buffer,
+                numpy.zeros((missing,) + buffer.shape[1:], dtype=buffer.dtype)
+            ))
+
+        frames = _frames(
+            numpy.moveaxis(buffer, 0, -1),
+            self.framelength,
+            self.hopsize,
+            count,
+        )
+        out = _analysis(
+            frames, self._scaled, self.transforms, first=self._frames
+        )
+        _normalize(out, self.framelength, self.hopsize)
+
+        self._frames += count
+        self._buffer = self._buffer[count * self.hopsize:]
+
+        return out.T
+
+    @property
+    def bins(self):
+        """ Number of coefficients per frame
+
+        """
+        return self.framelength // 2 + (0 if self.odd else 1)
+
+    def process(self, x):
+        """ Transform the next chunk of the signal
+
+        Parameters
+        ----------
+        x : array_like
+            The next chunk, either a 1D vector of samples or a 2D matrix of
+            :code:`samples x channels`.
+
+        Returns
+        -------
+        out : array_like
+            All frames completed by this chunk, in the shape of :code:`bins x
+            frames` or :code:`bins x frames x channels`. May contain zero
+            frames.
+
+        """
+        x = _signed(_asarray(x))
+        self._samples += len(x)
+        self._append(x)
+        count = max(
+            (len(self._buffer) + self._lookahead - self.framelength) //
+            self.hopsize + 1,
+            0
+        )
+        return self._transform(count)
+
+    def flush(self):
+        """ Pad the end of the signal and transform all remaining frames
+
+        Returns
+        -------
+        out : array_like
+            The remaining frames. The analyzer is reset afterwards.
+
+        """
+        if self._buffer is None:
+            self._append(numpy.zeros(0))
+
+        padded = self._samples_padded()
+        offset = self._frames * self.hopsize
+        missing = padded - offset - len(self._buffer)
+        self._buffer = numpy.concatenate((
+            self._buffer,
+            numpy.zeros(
+                (missing,) + self._buffer.shape[1:], dtype=self._buffer.dtype
+            )
+        ))
+        count = _count(padded, self.framelength, self.hopsize) - self._frames
+        out = self._transform(max(count, 0))
+        self.reset()
+        return out
+
+    def _samples_padded(self):
+        length = self._samples
+        if self.centered:
+            length += self.framelength // 2 * 2
+        return int(
+            math.ceil(length / self.framelength) * self.framelength
+        )
+
+
+class Synthesizer(object):
+    """ Stateful lapped inverse transform of a chunked spectrogram
+
+    Parameters
+    ----------
+    kind : str, optional
+        The transform to use, one of :code:`'imdct'`, :code:`'imdst'` and
+        :code:`'icmdct'`. Defaults to :code:`'imdct'`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    framelength : int
+        The signal frame length. Defaults to :code:`2048`.
+    hopsize : int
+        The signal frame hopsize. Defaults to :code:`None`. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Defaults to :code:`2`.
+    centered : boolean
+        Remove the padding added by a centered forward transform. Defaults to
+        :code:`True`.
+    window : callable, array_like, tuple
+        Window to be used for deringing. Can be :code:`False` to disable
+        windowing. If a pair of analysis and synthesis windows is given,
+        the synthesis window is used. Defaults to :code:`scipy.signal.cosine`.
+    outlength : int
+        Crop output signal to length. Not setting this value will disable
+        cropping, the output data may be longer than expected.
+    transforms : module, optional
+        Module reference to core transforms. Defaults to
+        :mod:`mdct.fast.transforms`, or the autotuner enabled using
+        :func:`mdct.autotune.enable`.
+    dtype : numpy.dtype, optional
+        Output data type. Integer types will yield rounded and clipped
+        integer PCM. Defaults to floating point output.
+    scale : float, optional
+        Factor the samples were multiplied by during the forward transform.
+        Defaults to the full scale of :code:`dtype`.
+
+    Notes
+    -----
+    Samples are emitted as soon as all overlapping frames have been added,
+    taking leading zeros of the window into account, the remaining samples
+    are emitted by :meth:`flush`.
+
+    """
+    def __init__(
+        self,
+        kind='imdct',
+        odd=True,
+        framelength=2048,
+        hopsize=None,
+        overlap=None,
+        centered=True,
+        window=None,
+        outlength=None,
+        transforms=None,
+        dtype=None,
+        scale=None,
+    ):
+        transforms = autotune._resolve(transforms)
+
+        self.dtype = dtype
+        self.scale = scale
+        self.framelength = framelength
+        self.hopsize = _hopsize(framelength, hopsize, overlap)
+        self.centered = centered
+        self.window = _window(window, framelength, synthesis=True)
+        self._lookahead = min(
+            _support(self.window)[0], self.framelength - self.hopsize
+        )
+        self.outlength = outlength
+        self.transforms = _transforms(transforms, kind, odd)
+        self.reset()
+
+    def reset(self):
+        """ Discard all state and start over with a new spectrogram
+
+        """
+        self._tail = None
+        self._frames = 0
+        self._samples = 0
+        self._skip = self.framelength // 2 if self.centered else 0
+
+    def _emit(self, y):
+        skip = min(self._skip, len(y))
+        y = y[skip:]
+        self._skip -= skip
+
+        if self.outlength is not None:
+            y = y[:max(self.outlength - self._samples, 0)]
+
+        self._samples += len(y)
+
+        if self.dtype is not None:
+            y = _pcm(y, self.dtype, self.scale)
+
+        return y
+
+    def process(self, X):
+        """ Inverse transform the next frames of the spectrogram
+
+        Parameters
+        ----------
+        X : array_like
+            The next frames, in the shape of :code:`bins x frames` or
+            :code:`bins x frames x channels`.
+
+        Returns
+        -------
+        out : array_like
+            All samples completed by these frames. May be empty.
+
+        """
+        X = _asarray(X).T
+        count = X.shape[-2]
+
+        if count == 0:
+            return self._emit(numpy.zeros(X.shape[:-2][::-1] + (0,)).T)
+
+        out = _resynthesis(
+            X, self.window, self.transforms, self.framelength, self.hopsize,
+            first=self._frames,
+        )
+
+        # Samples covered by leading zeros of the next frame's window have
+        # already been emitted with the previous frames
+        start = 0 if self._tail is None else self._lookahead
+        stop = count * self.hopsize + self._lookahead
+        if self._tail is not None:
+            out[..., start:start + self._tail.shape[-1]] += self._tail
+
+        self._tail = out[..., stop:]
+        self._frames += count
+        return self._emit(out[..., start:stop].T)
+
+    def flush(self):
+        """ Emit the remaining samples
+
+        Returns
+        -------
+        out : array_like
+            The remaining samples. The synthesizer is reset afterwards.
+
+        """
+        if self._tail is None:
+            self.reset()
+            return numpy.zeros(0)
+
+        tail = self._tail.T
+        if self.centered:
+            tail = tail[:max(len(tail) - self.framelength // 2, 0)]
+
+        out = self._emit(tail)
+        self.reset()
+        return out
+
+
+def _blocks(out, blocksize):
+    for start in range(0, out.shape[1], blocksize):
+        yield out[:, start:start + blocksize]
+
+
+def _iterate(kind, x, odd, blocksize, kwargs):
+    """ Yield blocks of frames of a signal given as array or chunks
+
+    """
+    kwargs.setdefault('framelength', 2048)
+    return _stream(Analyzer(kind, odd=odd, **kwargs), x, blocksize)
+
+
+def _stream(analyzer, x, blocksize):
+    """ Yield blocks of frames of a signal transformed by analyzer
+
+    """
+    if isinstance(x, numpy.ndarray):
+        step = blocksize * analyzer.hopsize
+        chunks = (x[start:start + step] for start in range(0, len(x), step))
+    else:
+        chunks = x
+
+    for chunk in chunks:
+        for block in _blocks(analyzer.process(chunk), blocksize):
+            yield block
+
+    for block in _blocks(analyzer.flush(), blocksize):
+        yield block
+
+
+def iter_mdct(x, odd=True, blocksize=1, **kwargs):
+    """ Calculate lapped MDCT of input signal, block by block
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed. Either an array, e.g. a
+        :code:`numpy.memmap`, which is read block by block, or an iterable
+        of chunks of arbitrary length. The signal or its chunks may be a 1D
+        vector of samples or a 2D matrix of :code:`samples x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    blocksize : int, optional
+        Maximum number of frames per block. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`. Concatenated along the frames axis, the blocks
+        equal the output of :func:`mdct.mdct`.
+
+    """
+    return _iterate('mdct', x, odd, blocksize, kwargs)
+
+
+def iter_mdst(x, odd=True, blocksize=1, **kwargs):
+    """ Calculate lapped MDST of input signal, block by block
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed. Either an array, e.g. a
+        :code:`numpy.memmap`, which is read block by block, or an iterable
+        of chunks of arbitrary length. The signal or its chunks may be a 1D
+        vector of samples or a 2D matrix of :code:`samples x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    blocksize : int, optional
+        Maximum number of frames per block. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`. Concatenated along the frames axis, the blocks
+        equal the output of :func:`mdct.mdst`.
+
+    """
+    return _iterate('mdst', x, odd, blocksize, kwargs)
+
+
+def iter_cmdct(x, odd=True, blocksize=1, **kwargs):
+    """ Calculate lapped complex MDCT/MCLT of input signal, block by block
+
+    Parameters
+    ----------
+    x : array_like, iterable
+        The signal to be transformed. Either an array, e.g. a
+        :code:`numpy.memmap`, which is read block by block, or an iterable
+        of chunks of arbitrary length. The signal or its chunks may be a 1D
+        vector of samples or a 2D matrix of :code:`samples x channels`.
+    odd : boolean, optional
+        Switch to oddly stacked transform. Defaults to :code:`True`.
+    blocksize : int, optional
+        Maximum number of frames per block. Defaults to :code:`1`.
+    **kwargs, optional
+        Additional keyword arguments passed to :class:`Analyzer`
+
+    Yields
+    ------
+    out : array_like
+        Blocks of frames in the shape of :code:`bins x frames` or :code:`bins
+        x frames x channels`. Concatenated along the frames axis, the blocks
+        equal the output of :func:`mdct.cmdct`.
+
+    """
+    return _iterate('cmdct', x, odd, blocksize, kwargs)
@@ -0,0 +1,321 @@
+""" Module for the result types of the lapped transforms
+
+"""
+
+import collections
+
+import numpy
+
+__all__ = [
+    'Settings', 'Spectrogram', 'SparseSpectrogram',
+]
+
+
+Settings = collections.namedtuple('Settings', [
+    'kind',
+    'odd',
+    'framelength',
+    'hopsize',
+    'window',
+    'centered',
+    'padding',
+    'outlength',
+    'layout',
+    'frames_first',
+    'axis',
+])
+# Settings stored before the axis was recorded were transformed along the
+# sample axis of their layout
+Settings.__new__.__defaults__ = (None,)
+Settings.__doc__ = """ Immutable settings of a lapped transform
+
+Parameters
+----------
+kind : str
+    The forward transform, one of :code:`'mdct'`, :code:`'mdst'` and
+    :code:`'cmdct'`.
+odd : boolean
+    Oddly stacked transform.
+framelength : int
+    The signal frame length.
+hopsize : int
+    The signal frame hopsize.
+window : callable, array_like, tuple
+    The window or pair of analysis and synthesis windows, arrays are stored
+    read-only.
+centered : boolean
+    The input signal was padded so that the first and last window are
+    centered around the beginning of the signal.
+padding : int
+    Frames were zero-padded with x times the number of samples.
+outlength : int
+    Length of the original signal.
+layout : str
+    Memory layout of multichannel data.
+frames_first : boolean
+    The frames axis is before the bins axis.
+axis : int, optional
+    The transformed axis of an N-D signal, replaced by the bins and frames
+    axes. :code:`None` for the sample axis of :code:`layout`.
+
+"""
+
+
+def _unwrap(value):
+    if isinstance(value, Spectrogram):
+        return value.data
+    elif isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    else:
+        return value
+
+
+def _readonly(window):
+    if isinstance(window, numpy.ndarray):
+        window = window.copy()
+        window.setflags(write=False)
+    return window
+
+
+def _binary(ufunc):
+    def forward(self, other):
+        return ufunc(self.data, _unwrap(other))
+
+    def reflected(self, other):
+        return ufunc(_unwrap(other), self.data)
+
+    return forward, reflected
+
+
+def _unary(ufunc):
+    def function(self):
+        return ufunc(self.data)
+
+    return function
+
+
+class Spectrogram(object):
+    """ Spectrogram along with the settings used to compute it
+
+    A lightweight wrapper around a plain :code:`numpy.ndarray`. It can be
+    passed to all NumPy functions, which operate on and return plain arrays.
+    All other attributes and methods of :attr:`data` are forwarded, e.g.
+    :code:`spec.copy()`, :code:`spec.sum()`, :code:`spec.astype(float32)`
+    or :code:`spec.flags`, and likewise return plain arrays without
+    settings. The inverse lapped transforms infer all their parameters from
+    :attr:`settings` and use :attr:`data` without copying it.
+
+    Parameters
+    ----------
+    data : array_like
+        The spectrogram.
+    settings : Settings
+        The settings of the forward transform.
+
+    """
+    __slots__ = ('data', 'settings')
+
+    def __init__(self, data, settings):
+        if isinstance(settings.window, tuple):
+            settings = settings._replace(
+                window=tuple(_readonly(w) for w in settings.window)
+            )
+        else:
+            settings = settings._replace(window=_readonly(settings.window))
+
+        self.data = numpy.asarray(data)
+        self.settings = settings
+
+    def __reduce__(self):
+        return (Spectrogram, (self.data, self.settings))
+
+    def __getattr__(self, name):
+        # Only called for attributes not found otherwise. Unset slots and
+        # private names are not forwarded, which also keeps protocols like
+        # copying and pickling from recursing into data.
+        if name in Spectrogram.__slots__ or name.startswith('_'):
+            raise AttributeError(
+                "{0!r} object has no attribute {1!r}".format(
+                    type(self).__name__, name
+                )
+            )
+        return getattr(self.data, name)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return numpy.array(self.data, dtype=dtype, copy=True)
+
+        out = numpy.asarray(self.data, dtype=dtype)
+        if copy is False and out is not self.data:
+            raise ValueError(
+                "Unable to avoid copy while converting {0} to {1}".format(
+                    self.data.dtype, out.dtype
+                )
+            )
+        return out
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if 'out' in kwargs:
+            kwargs['out'] = _unwrap(kwargs['out'])
+
+        return getattr(ufunc, method)(*_unwrap(inputs), **kwargs)
+
+    def __repr__(self):
+        return "Spectrogram({0!r}, {1!r})".format(self.data, self.settings)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self):
+        return self.data.ndim
+
+    @property
+    def size(self):
+        return self.data.size
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def T(self):
+        return self.data.T
+
+    @property
+    def real(self):
+        return self.data.real
+
+    @property
+    def imag(self):
+        return self.data.imag
+
+    __add__, __radd__ = _binary(numpy.add)
+    __sub__, __rsub__ = _binary(numpy.subtract)
+    __mul__, __rmul__ = _binary(numpy.multiply)
+    __truediv__, __rtruediv__ = _binary(numpy.true_divide)
+    __floordiv__, __rfloordiv__ = _binary(numpy.floor_divide)
+    __mod__, __rmod__ = _binary(numpy.remainder)
+    __pow__, __rpow__ = _binary(numpy.power)
+    __matmul__, __rmatmul__ = _binary(numpy.matmul)
+    __lt__, __gt__ = _binary(numpy.less)
+    __le__, __ge__ = _binary(numpy.less_equal)
+    __eq__ = _binary(numpy.equal)[0]
+    __ne__ = _binary(numpy.not_equal)[0]
+    __neg__ = _unary(numpy.negative)
+    __pos__ = _unary(numpy.positive)
+    __abs__ = _unary(numpy.absolute)
+    __hash__ = None
+
+
+class SparseSpectrogram(object):
+    """ Selected coefficients of each frame of a spectrogram, along with the
+    settings used to compute it
+
+    Frames are stored in compressed sparse rows: the coefficients of row
+    :code:`i` are :code:`values[offsets[i]:offsets[i + 1]]` in bins
+    :code:`indices[offsets[i]:offsets[i + 1]]`, in ascending order. Rows are
+    ordered frame by frame, with the channels of each frame adjacent. All
+    lapped inverse transforms accept sparse spectrograms.
+
+    Parameters
+    ----------
+    indices : array_like
+        Bin indices of the coefficients.
+    values : array_like
+        The coefficients.
+    offsets : array_like
+        Index of the first coefficient of each row in :code:`indices` and
+        :code:`values`, followed by the total number of coefficients.
+    shape : tuple of int
+        Shape of the dense spectrogram, :code:`bins x frames` or
+        :code:`bins x frames x channels`.
+    settings : Settings
+        The settings of the forward transform.
+
+    """
+    __slots__ = ('indices', 'values', 'offsets', 'shape', 'settings')
+
+    def __init__(self, indices, values, offsets, shape, settings):
+        self.indices = numpy.asarray(indices)
+        self.values = numpy.asarray(values)
+        self.offsets = numpy.asarray(offsets)
+        self.shape = tuple(shape)
+        self.settings = settings
+
+        rows = int(numpy.prod(self.shape[1:]))
+        if (
+            len(self.offsets) != rows + 1 or
+            len(self.indices) != len(self.values) or
+            self.offsets[-1] != len(self.values)
+        ):
+            raise ValueError(
+                "Offsets of {0} coefficients do not match {1} frames and "
+                "channels".format(len(self.values), rows)
+            )
+
+    def __reduce__(self):
+        return (SparseSpectrogram, (
+            self.indices, self.values, self.offsets, self.shape,
+            self.settings,
+        ))
+
+    def __repr__(self):
+        return "SparseSpectrogram({0!r}, {1!r}, {2!r}, {3!r}, {4!r})".format(
+            self.indices, self.values, self.offsets, self.shape,
+            self.settings,
+        )
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("Unable to avoid copy while densifying")
+        return numpy.asarray(self.toarray(), dtype=dtype)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nnz(self):
+        """ Number of stored coefficients
+
+        """
+        return len(self.values)
+
+    def toarray(self):
+        """ Return the dense spectrogram, with all other coefficients zero
+
+        Returns
+        -------
+        out : array_like
+            The spectrogram in the shape of :attr:`shape`.
+
+        """
+        bins = self.shape[0]
+        rows = len(self.offsets) - 1
+
+        out = numpy.zeros((rows, bins), dtype=self.values.dtype)
+        out[
+            numpy.repeat(numpy.arange(rows), numpy.diff(self.offsets)),
+            self.indices,
+        ] = self.values
+
+        # Rows are frames x channels, the dense shape bins x frames x channels
+        return numpy.moveaxis(out.reshape(self.shape[1:] + (bins,)), -1, 0)
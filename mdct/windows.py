@@ -6,8 +6,13 @@ from __future__ import division
 import numpy as np
 from scipy.signal import kaiser
 
+from . import framing
+
 __all__ = [
     'kaiser_derived',
+    'low_overlap',
+    'low_delay',
+    'latency',
 ]
 
 
@@ -61,3 +66,177 @@ def kaiser_derived(M, beta):
     w[-M//2:] = halfw[::-1]
 
     return w
+
+
+def low_overlap(M, overlap):
+    """ Return a symmetric low-overlap window.
+
+    The window consists of zeros, a sine slope of length :code:`overlap`,
+    ones, a falling sine slope and zeros again. Consecutive frames only
+    overlap in the slopes, reducing the algorithmic latency of the
+    transform at the cost of frequency selectivity.
+
+    Parameters
+    ----------
+    M : int
+        Number of points in the output window.
+    overlap : int
+        Length of the window slopes, at most :code:`M // 2`.
+
+    Returns
+    -------
+    w : ndarray
+        The window, normalized to fulfil the Princen-Bradley condition.
+
+    Notes
+    -----
+    This window is only defined for an even number of taps and slopes
+    leaving an even number of zeros, i.e. :code:`M // 2 - overlap` must be
+    even.
+
+    See Also
+    --------
+    low_delay : asymmetric low-delay window pair
+    latency : algorithmic latency of a window
+
+    """
+    N, zeros = _low_overlap_shape(M, overlap)
+
+    w = np.zeros(M)
+    slope = _slope(overlap)
+    w[zeros:zeros + overlap] = slope
+    w[zeros + overlap:N + zeros] = 1
+    w[N + zeros:M - zeros] = slope[::-1]
+
+    return w
+
+
+def low_delay(M, overlap):
+    """ Return an asymmetric low-delay analysis and synthesis window pair.
+
+    The analysis window rises slowly over the first half of the frame and
+    falls within a short slope of length :code:`overlap`, followed by zeros.
+    The synthesis window is the time-reversed analysis window, scaled so
+    that the pair is biorthogonal. Compared to :func:`low_overlap`, the
+    long analysis slope improves frequency selectivity at the same
+    algorithmic latency.
+
+    Parameters
+    ----------
+    M : int
+        Number of points in each output window.
+    overlap : int
+        Length of the short window slopes, at most :code:`M // 2`.
+
+    Returns
+    -------
+    analysis, synthesis : ndarray
+        The analysis and synthesis window, to be passed as a pair using
+        the :code:`window` parameter of the lapped transforms. The
+        transforms are perfect reconstructing when using hopsize
+        :code:`M // 2`.
+
+    Notes
+    -----
+    This window is only defined for an even number of taps and slopes
+    leaving an even number of zeros, i.e. :code:`M // 2 - overlap` must be
+    even.
+
+    See Also
+    --------
+    low_overlap : symmetric low-overlap window
+    latency : algorithmic latency of a window
+
+    """
+    N, zeros = _low_overlap_shape(M, overlap)
+
+    analysis = np.zeros(M)
+    analysis[:N] = _slope(N)
+    analysis[N:N + zeros] = 1
+    analysis[N + zeros:M - zeros] = _slope(overlap)[::-1]
+
+    # The pair fulfils the time domain aliasing cancellation conditions
+    # f[n] g[n] + f[n + N] g[n + N] = 1 and f[n] g[N - 1 - n] =
+    # f[n + N] g[2N - 1 - n]
+    n = np.arange(N)
+    norm = (
+        analysis[n] * analysis[M - 1 - n] +
+        analysis[N - 1 - n] * analysis[N + n]
+    )
+    synthesis = analysis[::-1] / np.tile(norm, 2)
+
+    return analysis, synthesis
+
+
+def latency(framelength, window=None, hopsize=None, overlap=None):
+    """ Return the algorithmic latency of a lapped transform.
+
+    The latency is the number of samples between a sample entering the
+    analysis and the same sample leaving the synthesis, when processing
+    the signal frame by frame. Trailing zeros of the analysis window and
+    leading zeros of the synthesis window reduce the latency, as these
+    samples do not need to be waited for.
+
+    Parameters
+    ----------
+    framelength : int
+        The signal frame length.
+    window : callable, array_like, tuple
+        Window, or pair of analysis and synthesis windows. Defaults to
+        :code:`scipy.signal.cosine`.
+    hopsize : int
+        The signal frame hopsize. Defaults to :code:`None`. Setting this
+        value will override :code:`overlap`.
+    overlap : int
+        The signal frame overlap coefficient. Defaults to :code:`2`.
+
+    Returns
+    -------
+    latency : int
+        Latency in samples.
+
+    Notes
+    -----
+    The latency does not depend on :code:`centered`. The chunked
+    transforms in :mod:`mdct.streaming` emit frames and samples as soon as
+    this latency permits.
+
+    """
+    limit = framelength - framing._hopsize(framelength, hopsize, overlap)
+    analysis = framing._window(window, framelength)
+    synthesis = framing._window(window, framelength, synthesis=True)
+
+    return int(
+        framelength -
+        min(framing._support(analysis)[1], limit) -
+        min(framing._support(synthesis)[0], limit)
+    )
+
+
+def _low_overlap_shape(M, overlap):
+    """ Return half window length and number of zeros at each end
+
+    """
+    M = int(M)
+    overlap = int(overlap)
+
+    if M % 2:
+        raise ValueError(
+            "Low-overlap windows are only defined for even number of taps"
+        )
+
+    N = M // 2
+    if not 0 < overlap <= N or (N - overlap) % 2:
+        raise ValueError(
+            "Overlap must be positive, at most M // 2 and leave an even "
+            "number of zeros"
+        )
+
+    return N, (N - overlap) // 2
+
+
+def _slope(length):
+    """ Return rising sine slope of length
+
+    """
+    return np.sin(np.pi / 2 * (np.arange(length) + 0.5) / length)
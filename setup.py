@@ -14,6 +14,12 @@ if __name__ == "__main__":
 
         license='MIT',
         packages=setuptools.find_packages(),
+        python_requires='>=3.7',
+        entry_points={
+            'console_scripts': [
+                'mdct = mdct.cli:main',
+            ],
+        },
 
         install_requires=[
             'numpy>=1.6',
@@ -32,6 +38,9 @@ if __name__ == "__main__":
                 'sphinx_rtd_theme',
                 'numpydoc',
             ],
+            'jit': [
+                'numba',
+            ],
         },
         tests_require=[
             'pytest',
@@ -44,8 +53,8 @@ if __name__ == "__main__":
             'Intended Audience :: Telecommunications Industry',
             'Intended Audience :: Science/Research',
             'License :: OSI Approved :: MIT License',
-            'Programming Language :: Python :: 2.7',
             'Programming Language :: Python :: 3',
+            'Programming Language :: Python :: 3 :: Only',
             'Topic :: Multimedia :: Sound/Audio :: Analysis',
             'Topic :: Multimedia :: Sound/Audio :: Sound Synthesis'
         ],
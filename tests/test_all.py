@@ -236,3 +236,53 @@ def test_unlapped_backwards_equality(backsig, function, odd):
 
     assert outsig.shape == outsig2.shape
     assert numpy.allclose(outsig, outsig2)
+
+
+@pytest.mark.parametrize("N", (1, 5, 63, 64))
+def test_unlapped_lengths(N, odd, random):
+    #
+    # Test if fast unlapped transforms are equal to slow ones for frame
+    # halves of odd and even length.
+    #
+    sig = numpy.random.rand(3, N * 2)
+    spec = numpy.random.rand(3, N + (0 if odd else 1)) * 1j
+
+    assert numpy.allclose(
+        mdct.fast.transforms.cmdct(sig, odd=odd),
+        mdct.slow.transforms.cmdct(sig, odd=odd),
+    )
+
+    if odd or N % 2 == 0:
+        assert numpy.allclose(
+            mdct.fast.transforms.icmdct(spec, odd=odd),
+            mdct.slow.transforms.icmdct(spec, odd=odd),
+        )
+
+
+@pytest.mark.parametrize("padding", (1, 2, 3))
+@pytest.mark.parametrize("function", ('mdct', 'mdst', 'cmdct'))
+def test_unlapped_padding(function, padding, odd, random):
+    #
+    # Test if implicitly padded frames equal explicitly zero-padded frames
+    #
+    sig = numpy.random.rand(3, 64)
+    padded = numpy.pad(sig, ((0, 0), (0, 64 * padding)), mode='constant')
+
+    assert numpy.allclose(
+        getattr(mdct.fast.transforms, function)(
+            sig, odd=odd, padding=padding
+        ),
+        getattr(mdct.slow.transforms, function)(padded, odd=odd),
+    )
+
+
+@pytest.mark.parametrize("function", forward_functions)
+def test_padding_equality(sig, function, odd, window):
+    #
+    # Test if fast lapped transforms skipping the padding equal slow ones
+    #
+    spec = function[0](sig, odd=odd, window=window, padding=1)
+    spec2 = function[1](sig, odd=odd, window=window, padding=1)
+
+    assert spec.shape == spec2.shape
+    assert numpy.allclose(spec, spec2)
@@ -0,0 +1,102 @@
+import json
+import pytest
+import numpy
+import mdct
+import mdct.autotune
+import mdct.fast.engines
+import mdct.fast.transforms
+
+
+@pytest.fixture(params=(
+    mdct.fast.engines.DCT4(),
+    mdct.fast.engines.GEMM(),
+))
+def engine(request):
+    return request.param
+
+
+@pytest.fixture
+def tuner(monkeypatch):
+    monkeypatch.setattr(mdct.autotune, 'tuner', None)
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("length", (16, 20, 256, 1024))
+def test_engine(engine, kind, length, odd, random):
+    #
+    # Test if engines equal the FFT core transforms
+    #
+    if not engine.supports(length, odd):
+        pytest.skip("Configuration not supported by engine")
+
+    x = numpy.random.randn(7, length)
+    X = getattr(mdct.fast.transforms, kind)(x, odd=odd)
+
+    assert numpy.allclose(getattr(engine, kind)(x, odd=odd), X)
+    assert numpy.allclose(
+        getattr(engine, 'i' + kind)(X, odd=odd),
+        getattr(mdct.fast.transforms, 'i' + kind)(X, odd=odd),
+    )
+
+
+def test_dct4_even():
+    with pytest.raises(ValueError):
+        mdct.fast.engines.DCT4().mdct(numpy.zeros(16), odd=False)
+
+
+def test_autotune(tmpdir, tuner, sig, odd):
+    #
+    # Test if enabled autotuning routes lapped transforms and caches winners
+    #
+    path = str(tmpdir.join('cache', 'autotune.json'))
+    spec = mdct.mdct(sig, odd=odd, framelength=256)
+
+    tuner = mdct.autotune.enable(path, repeat=1)
+    assert mdct.autotune.tuner is tuner
+
+    spec2 = mdct.mdct(sig, odd=odd, framelength=256)
+    assert numpy.allclose(spec, spec2)
+    assert numpy.allclose(mdct.imdct(spec2), sig)
+    assert tuner.winners['mdct/256/{0}/float64'.format(
+        'odd' if odd else 'even'
+    )] in tuner.engines
+
+    assert mdct.autotune.Autotuner(path).winners == tuner.winners
+
+    mdct.autotune.disable()
+    assert mdct.autotune.tuner is None
+
+
+def test_warmup(tuner):
+    #
+    # Test if warming up benchmarks all configurations
+    #
+    mdct.autotune.enable(repeat=1)
+    mdct.autotune.warmup([64, 256], odd=(True,), kinds=('mdct', 'icmdct'))
+
+    assert sorted(mdct.autotune.tuner.winners) == [
+        'icmdct/256/odd/float64', 'icmdct/64/odd/float64',
+        'mdct/256/odd/float64', 'mdct/64/odd/float64',
+    ]
+
+
+def test_other_host(tmpdir):
+    #
+    # Test if winners cached by other hosts are ignored
+    #
+    path = str(tmpdir.join('autotune.json'))
+    with open(path, 'w') as f:
+        json.dump({'host': {}, 'winners': {'mdct/64/odd/float64': 'gemm'}}, f)
+
+    assert mdct.autotune.Autotuner(path).winners == {}
+
+
+def test_transforms(sig):
+    #
+    # Test if autotuners can be passed as core transforms
+    #
+    tuner = mdct.autotune.Autotuner(repeat=1)
+    spec = mdct.cmdct(sig, framelength=256, transforms=tuner)
+
+    assert numpy.allclose(spec, mdct.cmdct(sig, framelength=256))
+    assert numpy.allclose(mdct.icmdct(spec, transforms=tuner), sig)
@@ -0,0 +1,100 @@
+import pytest
+import numpy
+import mdct
+
+
+@pytest.mark.parametrize("function", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("axis", (0, 1, 2, -1))
+def test_axis(function, axis, odd, random):
+    #
+    # Test if transforms along any axis equal transforms of the transposed
+    # signal, and invert back to the signal
+    #
+    forward = getattr(mdct, function)
+    inverse = getattr(mdct, 'i' + function)
+    x = numpy.random.rand(3, 4, 5)
+    x = numpy.random.rand(*(
+        4096 if i == axis % 3 else n for i, n in enumerate(x.shape)
+    ))
+
+    spec = forward(x, odd=odd, axis=axis, framelength=256)
+
+    # Reference transforms the batch as channels of a 2D signal
+    batch = numpy.moveaxis(x, axis, -1)
+    expected = forward(
+        batch.reshape(-1, 4096), odd=odd, framelength=256,
+        layout='channels_first', frames_first=False,
+    )
+    expected = numpy.asarray(expected).reshape(
+        batch.shape[:-1] + expected.shape[-2:]
+    )
+
+    axis = axis % 3
+    assert spec.shape[:axis] == x.shape[:axis]
+    assert spec.shape[axis + 2:] == x.shape[axis + 1:]
+    assert numpy.allclose(
+        numpy.moveaxis(spec, (axis, axis + 1), (-2, -1)), expected
+    )
+    assert spec.settings.axis == axis
+
+    out = inverse(spec)
+    assert out.shape == x.shape
+    assert numpy.allclose(out, x)
+
+
+def test_frames_first(random):
+    x = numpy.random.rand(2, 4096, 3)
+
+    spec = mdct.mdct(x, axis=1, framelength=256, frames_first=True)
+
+    assert spec.shape == (2, 33, 128, 3)
+    assert numpy.allclose(mdct.imdct(spec), x)
+    assert numpy.allclose(
+        mdct.imdct(spec.data, axis=1, framelength=256, frames_first=True,
+                   outlength=4096),
+        x,
+    )
+
+
+@pytest.mark.parametrize("axes", ((-2, -1), (0, 2), (1,), (0, 1, 2)))
+def test_mdct2(axes, odd, random):
+    x = numpy.random.rand(64, 32, 128)
+
+    spec = mdct.mdct2(x, axes=axes, odd=odd, framelength=16)
+
+    expected = x
+    for axis in sorted(a % 3 for a in axes)[::-1]:
+        expected = mdct.mdct(
+            expected, axis=axis, odd=odd, framelength=16,
+            save_settings=False,
+        )
+    assert numpy.allclose(spec, expected)
+
+    out = mdct.imdct2(
+        spec, axes=axes, odd=odd, framelength=16,
+        outlength=[x.shape[a] for a in sorted(a % 3 for a in axes)],
+    )
+    assert out.shape == x.shape
+    assert numpy.allclose(out, x)
+
+
+def test_image():
+    image = (numpy.arange(64 * 96).reshape(64, 96) % 251).astype(numpy.uint8)
+
+    spec = mdct.mdct2(image, framelength=16)
+    out = mdct.imdct2(
+        spec, framelength=16, outlength=image.shape, dtype=numpy.uint8
+    )
+
+    assert spec.shape == (8, 9, 8, 13)
+    assert numpy.array_equal(out, image)
+
+
+def test_errors(random):
+    x = numpy.random.rand(4, 256)
+
+    with pytest.raises(ValueError):
+        mdct.mdct(x, axis=2)
+
+    with pytest.raises(ValueError):
+        mdct.mdct2(x, axes=(1, -1))
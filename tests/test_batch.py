@@ -0,0 +1,75 @@
+import pytest
+import numpy
+import mdct
+import mdct.batch
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+def test_batch(sig, kind, odd):
+    #
+    # Test if batch transforms equal the lapped transforms
+    #
+    signals = [
+        sig,
+        numpy.stack((sig, sig[::-1]), axis=1)[:-37],
+        (sig[:1000] * 32767).astype(numpy.int16),
+    ]
+
+    with mdct.batch.forward(
+        signals, processes=2, kind=kind, odd=odd, framelength=1024
+    ) as batch:
+        assert len(batch) == len(signals)
+
+        for x, spec in zip(signals, batch):
+            spec2 = getattr(mdct, kind)(x, odd=odd, framelength=1024)
+
+            assert spec.shape == spec2.shape
+            assert spec.settings.outlength == len(x)
+            assert numpy.allclose(spec, spec2)
+
+            assert numpy.allclose(
+                getattr(mdct, 'i' + kind)(spec),
+                x * mdct.framing._scale(x.dtype)
+            )
+        del spec
+
+
+def test_batch_layout(sig):
+    #
+    # Test if batch transforms support channels_first layout
+    #
+    signals = [numpy.stack((sig, sig[::-1]))]
+
+    with mdct.batch.forward(
+        signals, processes=1, layout='channels_first', save_settings=False
+    ) as batch:
+        assert numpy.allclose(
+            batch[0], mdct.mdct(signals[0], layout='channels_first')
+        )
+
+
+def test_batch_empty():
+    #
+    # Test if an empty batch can be transformed
+    #
+    with mdct.batch.forward([], processes=1) as batch:
+        assert len(batch) == 0
+
+
+def test_batch_lifetime(sig):
+    #
+    # Test if the batch can only be closed once all views are dropped
+    #
+    batch = mdct.batch.forward([sig], processes=1, framelength=1024)
+    spec = batch[0]
+    copy = numpy.array(spec.data)
+
+    with pytest.raises(BufferError):
+        batch.close()
+
+    del spec
+    batch.close()
+
+    assert numpy.allclose(copy, mdct.mdct(sig, framelength=1024))
@@ -0,0 +1,107 @@
+import pytest
+import numpy
+import scipy.io.wavfile
+import mdct
+import mdct.cli
+import mdct.storage
+
+
+@pytest.fixture
+def inputs(tmpdir, sig):
+    directory = tmpdir.mkdir('inputs')
+    pcm = (numpy.stack((sig, sig[::-1]), axis=1) * 16384).astype(numpy.int16)
+
+    scipy.io.wavfile.write(str(directory.join('a.wav')), 22050, pcm)
+    numpy.save(str(directory.join('b.npy')), sig)
+
+    return directory, pcm, sig
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+@pytest.mark.parametrize("dtype", ('float16', 'int16'))
+def test_roundtrip(tmpdir, inputs, odd, jobs, dtype, capsys):
+    #
+    # Test if files are transformed to spectrogram files and back
+    #
+    directory, pcm, sig = inputs
+    specs = str(tmpdir.join('specs'))
+    outputs = str(tmpdir.join('outputs'))
+    options = ['-j', str(jobs), '--blocksize', '3']
+    if not odd:
+        options.append('--even')
+
+    mdct.cli.main(
+        ['forward', '--dtype', dtype, '--framelength', '1024', '-o', specs,
+         str(directory)] + options
+    )
+    assert capsys.readouterr().out.count('Msamples/s') == 2
+
+    loaded = mdct.storage.load(str(tmpdir.join('specs', 'b.mdct')))
+    spec = mdct.mdct(sig, odd=odd, framelength=1024)
+    assert loaded.shape == spec.shape
+    assert loaded.metadata == {'samplerate': None}
+    assert numpy.allclose(loaded, spec, atol=1e-3 * numpy.abs(spec).max())
+
+    mdct.cli.main(['inverse', '-o', outputs, specs, '-j', str(jobs)])
+    mdct.cli.main(
+        ['inverse', '--format', 'npy', '-o', outputs,
+         str(tmpdir.join('specs', 'b.mdct'))]
+    )
+
+    samplerate, outpcm = scipy.io.wavfile.read(
+        str(tmpdir.join('outputs', 'a.wav'))
+    )
+    assert samplerate == 22050
+    assert outpcm.shape == pcm.shape
+    assert numpy.abs(outpcm.astype(int) - pcm).max() <= 16
+
+    outsig = numpy.load(str(tmpdir.join('outputs', 'b.npy')))
+    assert outsig.shape == sig.shape
+    assert numpy.allclose(outsig, sig, atol=1e-3)
+
+
+@pytest.mark.parametrize("kind", ('mdst', 'cmdct'))
+def test_kind(tmpdir, inputs, kind):
+    #
+    # Test if other transforms are stored in spectrogram files
+    #
+    directory, pcm, sig = inputs
+    specs = str(tmpdir.join('specs'))
+
+    mdct.cli.main(
+        ['forward', '--kind', kind, '--window', 'kbd', '--dtype', 'int16',
+         '-o', specs, str(directory.join('b.npy'))]
+    )
+
+    loaded = mdct.storage.load(str(tmpdir.join('specs', 'b.mdct')))
+    assert numpy.allclose(getattr(mdct, 'i' + kind)(loaded), sig, atol=1e-3)
+
+
+def test_unsigned(tmpdir, sig):
+    #
+    # Test if 8 bit WAV files are centered around their midpoint
+    #
+    pcm = numpy.round(sig * 255).astype(numpy.uint8)
+    source = str(tmpdir.join('a.wav'))
+    scipy.io.wavfile.write(source, 8000, pcm)
+
+    mdct.cli.main(['forward', '-o', str(tmpdir.join('specs')), source])
+
+    loaded = mdct.storage.load(str(tmpdir.join('specs', 'a.mdct')))
+    spec = mdct.mdct((pcm - 128.) / 128)
+    assert numpy.allclose(loaded, spec, atol=1e-3 * numpy.abs(spec).max())
+
+
+def test_collision(tmpdir, inputs, capsys):
+    #
+    # Test if inputs written to the same output file are rejected
+    #
+    directory, pcm, sig = inputs
+    numpy.save(str(directory.join('a.npy')), sig)
+
+    with pytest.raises(SystemExit):
+        mdct.cli.main(['forward', '-o', str(tmpdir.join('specs')),
+                       str(directory)])
+
+    assert 'a.npy' in capsys.readouterr().err
+    assert not tmpdir.join('specs').check()
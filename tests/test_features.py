@@ -0,0 +1,86 @@
+import pytest
+import numpy
+import mdct
+import mdct.features
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("blocksize", (1, 3, 256))
+def test_reduce(sig, odd, framelength, kind, blocksize):
+    #
+    # Test if features reduced block by block equal those of the full
+    # spectrogram
+    #
+    spec = getattr(mdct, kind)(sig, odd=odd, framelength=framelength)
+    power = numpy.abs(spec) ** 2
+    magnitude = numpy.abs(spec)
+    edges = mdct.features.bands(framelength, 16, odd=odd)
+
+    energy, rms, flux = mdct.features.reduce(
+        sig,
+        [
+            mdct.features.BandEnergy(edges),
+            mdct.features.RMS(),
+            mdct.features.Flux(),
+        ],
+        kind=kind, odd=odd, blocksize=blocksize, framelength=framelength,
+    )
+
+    assert energy.shape == (16, spec.shape[1])
+    assert numpy.allclose(energy, [
+        power[start:stop].sum(axis=0)
+        for start, stop in zip(edges[:-1], edges[1:])
+    ])
+    assert numpy.allclose(rms, numpy.sqrt(power.mean(axis=0)))
+    assert numpy.allclose(flux, numpy.maximum(
+        numpy.diff(magnitude, axis=1, prepend=0), 0
+    ).sum(axis=0))
+
+
+def test_channels(sig, odd):
+    sig = numpy.stack((sig, sig[::-1]), axis=-1)
+    spec = mdct.mdct(sig, odd=odd)
+    edges = [0, 10, 100, spec.shape[0]]
+
+    energy = mdct.features.band_energy(sig, edges, odd=odd, blocksize=4)
+    rms = mdct.features.rms(sig, odd=odd, blocksize=4)
+    flux = mdct.features.flux(sig, odd=odd, blocksize=4)
+
+    assert energy.shape == (3,) + spec.shape[1:]
+    assert numpy.allclose(energy[1], (spec[10:100] ** 2).sum(axis=0))
+    assert rms.shape == spec.shape[1:]
+    assert numpy.allclose(rms, numpy.sqrt((spec ** 2).mean(axis=0)))
+    assert flux.shape == spec.shape[1:]
+
+
+def test_chunks(sig):
+    chunks = numpy.array_split(sig, 7)
+
+    assert numpy.allclose(
+        mdct.features.rms(chunks, blocksize=2), mdct.features.rms(sig)
+    )
+
+
+@pytest.mark.parametrize("scale", mdct.features.scales)
+@pytest.mark.parametrize("count", (1, 24, 128, 1024))
+def test_bands(framelength, odd, scale, count):
+    bins = framelength // 2 + (0 if odd else 1)
+    if count > bins:
+        with pytest.raises(ValueError):
+            mdct.features.bands(framelength, count, scale=scale, odd=odd)
+        return
+
+    edges = mdct.features.bands(framelength, count, scale=scale, odd=odd)
+
+    assert len(edges) == count + 1
+    assert edges[0] == 0
+    assert edges[-1] == bins
+    assert numpy.all(numpy.diff(edges) > 0)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        mdct.features.BandEnergy([0, 10, 10])
+
+    with pytest.raises(ValueError):
+        mdct.features.bands(2048, 24, scale='erb')
@@ -0,0 +1,82 @@
+import pytest
+import numpy
+import mdct.framing
+
+
+@pytest.mark.parametrize("length", (0, 1, 100, 1000, 4099))
+@pytest.mark.parametrize("hopsize", (64, 128, 256))
+@pytest.mark.parametrize("centered", (True, False))
+def test_virtual_padding(length, hopsize, centered):
+    #
+    # Test if virtually padded frames equal frames of the padded signal
+    #
+    x = numpy.random.rand(2, length)
+    front = 128 if centered else 0
+    padded = numpy.pad(
+        x, [(0, 0), (front, -(length + 2 * front) % 256 + front)],
+        mode='constant',
+    )
+    frames = mdct.framing._frames(padded, 256, hopsize)
+
+    count, chunks = mdct.framing._chunks(x, 256, hopsize, centered)
+
+    assert count == frames.shape[-2]
+    assert numpy.array_equal(
+        numpy.concatenate([chunk for _, chunk in chunks], axis=-2), frames
+    )
+
+    start = 0
+    for first, chunk in chunks:
+        assert first == start
+        start += chunk.shape[-2]
+
+
+def test_interior_view():
+    x = numpy.random.rand(10000)
+    count, chunks = mdct.framing._chunks(x, 256, 128, True)
+
+    assert len(chunks) == 3
+    assert numpy.shares_memory(chunks[1][1], x)
+    assert not numpy.shares_memory(chunks[0][1], x)
+    assert not numpy.shares_memory(chunks[2][1], x)
+
+
+@pytest.mark.parametrize("blocksize", (1, 700))
+@pytest.mark.parametrize("kind", ('mdct', 'cmdct'))
+def test_blocks(monkeypatch, sig, odd, kind, blocksize):
+    #
+    # Test if transforming blocks of frames equals transforming all at once
+    #
+    spec = getattr(mdct, kind)(sig, odd=odd, framelength=256)
+
+    monkeypatch.setattr(mdct.framing, 'blocksize', blocksize)
+    blocks = getattr(mdct, kind)(sig, odd=odd, framelength=256)
+
+    assert numpy.allclose(spec, blocks)
+    assert numpy.allclose(
+        getattr(mdct, 'i' + kind)(blocks, outlength=len(sig)), sig
+    )
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'imdct'))
+@pytest.mark.parametrize("centered", (True, False))
+def test_peak_memory(kind, centered):
+    #
+    # Test if transforms allocate little more than their output
+    #
+    tracemalloc = pytest.importorskip('tracemalloc')
+    x = numpy.random.rand(2 ** 20)
+    if kind.startswith('i'):
+        x = mdct.mdct(x, framelength=2048, centered=centered)
+
+    # Load any compiled kernels before measuring
+    getattr(mdct, kind)(x[..., :4096], framelength=2048, centered=centered)
+
+    tracemalloc.start()
+    try:
+        getattr(mdct, kind)(x, framelength=2048, centered=centered)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 3 * numpy.asarray(x).nbytes
@@ -0,0 +1,92 @@
+import pytest
+import numpy
+import mdct
+import mdct.incremental
+
+
+@pytest.mark.parametrize("function", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("region", ((0, 1), (1000, 1500), (3000, 5120)))
+def test_update(sig, function, region, odd, window, framelength):
+    #
+    # Test if updated spectrograms and signals equal transforms of the
+    # edited signal
+    #
+    forward = getattr(mdct, function)
+    inverse = getattr(mdct, 'i' + function)
+    start, stop = region
+
+    spec = forward(sig, odd=odd, window=window, framelength=framelength)
+    out = inverse(spec)
+
+    edited = sig.copy()
+    edited[start:stop] = numpy.random.rand(len(edited[start:stop]))
+    expected = forward(edited, odd=odd, window=window, framelength=framelength)
+
+    first, last = mdct.incremental.update(spec, edited, start, stop)
+
+    assert numpy.allclose(spec, expected)
+    assert first < last
+
+    # Only the returned frames changed
+    unchanged = forward(sig, odd=odd, window=window, framelength=framelength)
+    assert numpy.array_equal(spec[:, :first], unchanged[:, :first])
+    assert numpy.array_equal(spec[:, last:], unchanged[:, last:])
+
+    begin, end = mdct.incremental.iupdate(out, spec, first, last)
+
+    assert begin <= start and end >= stop
+    assert numpy.allclose(out, inverse(expected))
+    assert numpy.allclose(out, edited)
+
+
+def test_layouts(sig, odd):
+    sig = numpy.stack((sig, sig[::-1]))
+    spec = mdct.mdct(sig, odd=odd, layout='channels_first')
+    out = mdct.imdct(spec)
+
+    edited = sig.copy()
+    edited[1, 2000:2100] = 0
+    frames = mdct.incremental.update(spec, edited, 2000, 2100)
+    mdct.incremental.iupdate(out, spec, *frames)
+
+    assert numpy.allclose(
+        spec, mdct.mdct(edited, odd=odd, layout='channels_first')
+    )
+    assert numpy.allclose(out, edited)
+
+
+def test_pcm(sig):
+    sig = (sig * 20000).astype(numpy.int16)
+    sig = numpy.stack((sig, sig[::-1]), axis=-1)
+    spec = mdct.mdct(sig)
+    out = mdct.imdct(spec, dtype=numpy.int16)
+
+    sig[500:600] = 0
+    frames = mdct.incremental.update(spec, sig, 500, 600)
+    mdct.incremental.iupdate(out, spec, *frames)
+
+    assert out.dtype == numpy.int16
+    assert numpy.array_equal(out, sig)
+
+
+def test_errors(sig):
+    spec = mdct.mdct(sig)
+
+    with pytest.raises(ValueError):
+        mdct.incremental.update(spec, sig[:-4096], 0, 10)
+
+    with pytest.raises(TypeError):
+        mdct.incremental.update(spec.data, sig, 0, 10)
+
+
+@pytest.mark.parametrize("kwargs", (
+    {'overlap': 4}, {'padding': 1}, {'centered': False},
+))
+def test_settings(sig, odd, kwargs):
+    spec = mdct.mdct(sig, odd=odd, **kwargs)
+
+    edited = sig.copy()
+    edited[4000:4100] = 0
+    mdct.incremental.update(spec, edited, 4000, 4100)
+
+    assert numpy.allclose(spec, mdct.mdct(edited, odd=odd, **kwargs))
@@ -0,0 +1,126 @@
+import array
+import pytest
+import numpy
+import mdct
+import mdct.fast.transforms
+
+
+class Namespace(object):
+    """ Minimal Array API namespace wrapping NumPy arrays
+
+    """
+    @staticmethod
+    def asarray(x):
+        return Tensor(numpy.asarray(x))
+
+
+class Tensor(object):
+    """ Minimal foreign array exposing its data through the array interface
+
+    """
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def __array_interface__(self):
+        return self.data.__array_interface__
+
+    def __array_namespace__(self, api_version=None):
+        return Namespace
+
+
+def test_buffer(sig):
+    #
+    # Test if buffer protocol producers are transformed without copying
+    #
+    buffer = array.array('d', sig)
+
+    assert numpy.allclose(mdct.mdct(buffer), mdct.mdct(sig))
+    assert numpy.allclose(
+        mdct.fast.transforms.mdct(memoryview(buffer)[:1024]),
+        mdct.fast.transforms.mdct(sig[:1024]),
+    )
+    assert numpy.shares_memory(
+        mdct.framing._asarray(buffer), numpy.frombuffer(buffer)
+    )
+
+
+def test_array_interface(sig):
+    #
+    # Test if foreign arrays are used without copying
+    #
+    tensor = Tensor(sig)
+
+    assert numpy.shares_memory(mdct.framing._asarray(tensor), sig)
+    assert numpy.allclose(mdct.mdct(tensor), mdct.mdct(sig))
+
+
+def test_like(sig, odd):
+    #
+    # Test if results are returned in the namespace of like
+    #
+    tensor = Tensor(sig)
+
+    spec = mdct.mdct(tensor, odd=odd, like=tensor)
+    assert isinstance(spec, Tensor)
+    assert numpy.allclose(spec.data, mdct.mdct(sig, odd=odd))
+
+    out = mdct.imdct(
+        spec, odd=odd, framelength=2048, outlength=len(sig), like=tensor
+    )
+    assert isinstance(out, Tensor)
+    assert numpy.allclose(out.data, sig)
+
+    specs = mdct.multiresolution(tensor, [256, 1024], like=tensor)
+    assert all(isinstance(spec, Tensor) for spec in specs)
+
+
+def test_like_numpy(sig):
+    spec = mdct.mdct(sig, like=sig)
+
+    assert isinstance(spec, mdct.types.Spectrogram)
+
+
+def test_like_unknown(sig):
+    with pytest.raises(TypeError):
+        mdct.mdct(sig, like=array.array('d'))
+
+
+@pytest.mark.skipif(
+    not hasattr(numpy, 'from_dlpack'), reason="NumPy without DLPack"
+)
+def test_dlpack(sig):
+    class Producer(object):
+        def __init__(self, data):
+            self.data = data
+
+        def __dlpack__(self, stream=None):
+            return self.data.__dlpack__()
+
+        def __dlpack_device__(self):
+            return self.data.__dlpack_device__()
+
+    x = mdct.framing._asarray(Producer(sig))
+
+    assert numpy.shares_memory(x, sig)
+    assert numpy.allclose(mdct.mdct(Producer(sig)), mdct.mdct(sig))
+
+
+def test_arrow(sig):
+    #
+    # Test if Arrow arrays are transformed without copying
+    #
+    pyarrow = pytest.importorskip('pyarrow')
+
+    x = pyarrow.array(sig)
+    for y in (x, pyarrow.chunked_array([x])):
+        out = mdct.framing._asarray(y)
+        assert out.ctypes.data == x.buffers()[1].address
+        assert numpy.allclose(mdct.mdct(y), mdct.mdct(sig))
+
+    # Arrays with nulls or several chunks are copied
+    chunked = pyarrow.chunked_array([sig[:1000], sig[1000:]])
+    assert numpy.array_equal(mdct.framing._asarray(chunked), sig)
+    assert numpy.isnan(
+        mdct.framing._asarray(pyarrow.array([1.0, None]))[1]
+    )
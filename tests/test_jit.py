@@ -0,0 +1,122 @@
+import pytest
+import numpy
+import mdct
+import mdct.fast.jit
+import mdct.slow.transforms
+
+
+@pytest.fixture(params=(True, False))
+def enabled(request, monkeypatch):
+    if request.param and not mdct.fast.jit.available:
+        pytest.skip("Numba not installed")
+
+    monkeypatch.setattr(mdct.fast.jit, 'enabled', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+def test_backends(sig, kind, odd, enabled):
+    #
+    # Test if plans give the same results with and without compiled kernels
+    #
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    plan = mdct.MDCTPlan(512, odd=odd, kind=kind)
+
+    spec = plan.forward(sig)
+    spec2 = getattr(mdct, kind)(sig, odd=odd, framelength=512)
+
+    assert numpy.allclose(spec, spec2)
+    assert numpy.allclose(plan.inverse(spec), sig)
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("padding", (0, 1))
+def test_default_path(sig, kind, odd, padding, enabled):
+    #
+    # Test if the lapped transforms using the fast core transforms equal
+    # the slow ones, with and without compiled kernels
+    #
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    forward = getattr(mdct, kind)
+    inverse = getattr(mdct, 'i' + kind)
+
+    spec = forward(sig, odd=odd, framelength=256, padding=padding)
+    spec2 = forward(
+        sig, odd=odd, framelength=256, padding=padding,
+        transforms=mdct.slow.transforms,
+    )
+
+    assert numpy.allclose(spec, spec2)
+    assert numpy.allclose(
+        inverse(spec), inverse(spec, transforms=mdct.slow.transforms)
+    )
+
+    if not padding:
+        assert numpy.allclose(inverse(spec, outlength=len(sig)), sig)
+
+
+def test_kernels(enabled):
+    frames = numpy.random.rand(2, 7, 16)
+    table = numpy.exp(1j * numpy.random.rand(16))
+
+    out = mdct.fast.jit.multiply(
+        frames, table, numpy.empty(frames.shape, dtype=complex)
+    )
+    assert numpy.allclose(out, frames * table)
+
+    out = mdct.fast.jit.postmultiply(
+        out, table[:8], numpy.empty((2, 7, 8))
+    )
+    assert numpy.allclose(out, numpy.real(frames[..., :8] * table[:8] ** 2))
+
+    out = mdct.fast.jit.overlap_add(frames, table, 8)
+    assert out.shape == (2, 64)
+    assert numpy.allclose(out[:, 8:16], numpy.real(
+        frames[:, 0, 8:] * table[8:] + frames[:, 1, :8] * table[:8]
+    ))
+
+
+def test_folding(enabled):
+    frames = numpy.random.rand(3, 16)
+    table = numpy.random.rand(16)
+
+    product = frames * table
+
+    out = mdct.fast.jit.multiply(frames, table, numpy.empty((3, 8)))
+    assert numpy.allclose(out, product[:, :8] + product[:, 8:])
+
+    out = mdct.fast.jit.postmultiply(
+        frames[:, :8], table, numpy.empty((3, 16))
+    )
+    assert numpy.allclose(out, numpy.tile(frames[:, :8], 2) * table)
+
+
+@pytest.mark.parametrize("length", (16, 8))
+def test_numba(length, monkeypatch):
+    #
+    # Test if compiled kernels equal the NumPy fallbacks
+    #
+    pytest.importorskip('numba')
+
+    # Strided frames like the views returned by framing
+    signal = numpy.random.rand(2, 200)
+    frames = numpy.lib.stride_tricks.as_strided(
+        signal, (2, 11, 16), signal.strides + signal.strides[-1:]
+    )
+    table = numpy.exp(1j * numpy.random.rand(16))
+    X = numpy.random.rand(2, 11, length) + 1j
+
+    results = []
+    for enabled in (True, False):
+        monkeypatch.setattr(mdct.fast.jit, 'enabled', enabled)
+        results.append((
+            mdct.fast.jit.multiply(
+                frames, table, numpy.empty((2, 11, length), dtype=complex)
+            ),
+            mdct.fast.jit.postmultiply(X, table, numpy.empty((2, 11, 16))),
+            mdct.fast.jit.overlap_add(X, table, length // 2),
+        ))
+
+    for compiled, fallback in zip(*results):
+        assert compiled.shape == fallback.shape
+        assert numpy.allclose(compiled, fallback)
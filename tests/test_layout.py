@@ -0,0 +1,99 @@
+import pytest
+import numpy
+import mdct
+
+
+@pytest.fixture
+def multisig(sig):
+    return numpy.stack((sig, sig[::-1], -sig), axis=1)
+
+
+@pytest.mark.parametrize("function", [
+    (mdct.mdct, mdct.imdct),
+    (mdct.mdst, mdct.imdst),
+    (mdct.cmdct, mdct.icmdct),
+])
+def test_channels_first(multisig, function, odd, framelength):
+    #
+    # Test if channels first layout equals transposed channels last layout
+    #
+    spec = function[0](multisig, odd=odd, framelength=framelength)
+    spec2 = function[0](
+        multisig.T, odd=odd, framelength=framelength, layout='channels_first'
+    )
+
+    assert spec2.shape == spec.shape[::-1]
+    assert numpy.asarray(spec2).flags.c_contiguous
+    assert numpy.allclose(spec2, spec.T)
+
+    outsig = function[1](
+        spec2, odd=odd, framelength=framelength, layout='channels_first',
+        outlength=len(multisig)
+    )
+
+    assert outsig.shape == multisig.T.shape
+    assert numpy.allclose(outsig, multisig.T)
+
+
+def test_channels_first_mono(sig):
+    spec = mdct.mdct(sig, layout='channels_first')
+
+    assert numpy.allclose(spec, mdct.mdct(sig).T)
+
+
+def test_even_channels(multisig, framelength):
+    #
+    # Test if all channels of evenly stacked transforms start with the same
+    # modulation, regardless of the number of frames
+    #
+    spec = mdct.mdct(multisig[:-framelength // 2], odd=False)
+
+    for i in range(multisig.shape[1]):
+        assert numpy.allclose(
+            spec[..., i],
+            mdct.mdct(multisig[:-framelength // 2, i], odd=False)
+        )
+
+
+def test_unknown_layout(sig):
+    with pytest.raises(ValueError):
+        mdct.mdct(sig, layout='frames_first')
+
+
+@pytest.mark.parametrize("function", [
+    (mdct.mdct, mdct.imdct),
+    (mdct.mdst, mdct.imdst),
+    (mdct.cmdct, mdct.icmdct),
+])
+def test_frames_first(sig, function, odd, framelength):
+    #
+    # Test if frames first output equals transposed bins first output
+    #
+    spec = function[0](sig, odd=odd, framelength=framelength)
+    spec2 = function[0](
+        sig, odd=odd, framelength=framelength, frames_first=True
+    )
+
+    assert numpy.asarray(spec2).flags.c_contiguous
+    assert numpy.allclose(spec2, spec.T)
+
+    outsig = function[1](
+        spec2, odd=odd, framelength=framelength, frames_first=True
+    )
+
+    assert numpy.allclose(outsig, sig)
+
+
+def test_frames_first_channels(multisig):
+    spec = mdct.mdct(multisig)
+    spec2 = mdct.mdct(multisig, frames_first=True)
+    spec3 = mdct.mdct(multisig.T, layout='channels_first', frames_first=False)
+
+    assert numpy.allclose(spec2, numpy.swapaxes(spec, 0, 1))
+    assert numpy.allclose(spec3, numpy.moveaxis(spec, -1, 0))
+
+    assert numpy.allclose(mdct.imdct(spec2, frames_first=True), multisig)
+    assert numpy.allclose(
+        mdct.imdct(spec3, layout='channels_first', frames_first=False),
+        multisig.T
+    )
@@ -0,0 +1,70 @@
+import pytest
+import numpy
+import mdct
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("centered", (True, False))
+def test_multiresolution(sig, kind, odd, centered):
+    #
+    # Test if all resolutions equal separate transforms
+    #
+    sig = numpy.stack((sig[:-100], sig[100:]), axis=1)
+    framelengths = [256, 1024, 4096]
+
+    specs = mdct.multiresolution(
+        sig, framelengths, kind=kind, odd=odd, centered=centered
+    )
+
+    assert len(specs) == len(framelengths)
+    for framelength, spec in zip(framelengths, specs):
+        spec2 = getattr(mdct, kind)(
+            sig, odd=odd, framelength=framelength, centered=centered
+        )
+
+        assert spec.shape == spec2.shape
+        assert spec.settings == spec2.settings
+        assert numpy.allclose(spec, spec2)
+
+        if centered:
+            outsig = getattr(mdct, 'i' + kind)(spec)
+            assert numpy.allclose(outsig, sig)
+
+
+def test_layout(sig):
+    sig = numpy.stack((sig, sig[::-1]))
+    specs = mdct.multiresolution(
+        (sig * 10000).astype(numpy.int16), [512, 2048],
+        layout='channels_first', overlap=4,
+    )
+
+    for spec in specs:
+        assert spec.data.flags['C_CONTIGUOUS']
+        assert numpy.allclose(
+            spec,
+            mdct.mdct(
+                (sig * 10000).astype(numpy.int16),
+                framelength=spec.settings.framelength,
+                layout='channels_first', overlap=4,
+            )
+        )
+
+
+def test_kind(sig):
+    with pytest.raises(ValueError):
+        mdct.multiresolution(sig, [256], kind='dct')
+
+
+def test_window(sig):
+    window = mdct.windows.kaiser_derived(256, beta=4.)
+
+    specs = mdct.multiresolution(sig, [256], window=window)
+    assert numpy.allclose(specs[0], mdct.mdct(
+        sig, window=window, framelength=256
+    ))
+
+    with pytest.raises(ValueError, match='frame length 1024'):
+        mdct.multiresolution(sig, [256, 1024], window=window)
+
+    with pytest.raises(ValueError, match='frame length 1024'):
+        mdct.mdct(sig, window=window, framelength=1024)
@@ -0,0 +1,109 @@
+import pytest
+import numpy
+import mdct
+import mdct.streaming
+
+
+def test_integer_input(sig, odd, framelength):
+    #
+    # Test if integer PCM is normalized to full scale and can be written back
+    #
+    pcm = numpy.round((sig - 0.5) * 32767).astype(numpy.int16)
+
+    spec = mdct.mdct(pcm, odd=odd, framelength=framelength)
+    spec2 = mdct.mdct(pcm / 32768, odd=odd, framelength=framelength)
+
+    assert numpy.allclose(spec, spec2)
+
+    outsig = mdct.imdct(
+        spec, odd=odd, framelength=framelength, dtype=numpy.int16
+    )
+
+    assert outsig.dtype == numpy.int16
+    assert numpy.array_equal(outsig, pcm)
+
+
+def test_integer_scale(sig):
+    pcm = numpy.round(sig * 1000).astype(numpy.int32)
+
+    spec = mdct.mdct(pcm, scale=1)
+    spec2 = mdct.mdct(pcm.astype(float))
+
+    assert numpy.allclose(spec, spec2)
+    assert numpy.array_equal(mdct.imdct(spec, dtype=numpy.int32, scale=1), pcm)
+
+
+def test_integer_clipping():
+    spec = mdct.mdct(numpy.linspace(-2, 2, 4096), framelength=256)
+    outsig = mdct.imdct(spec, framelength=256, dtype=numpy.int16)
+
+    assert outsig.min() == -32768
+    assert outsig.max() == 32767
+
+
+def test_integer_memory():
+    #
+    # Test if integer PCM is converted block by block, allocating little
+    # more than the floating point output
+    #
+    tracemalloc = pytest.importorskip('tracemalloc')
+    pcm = numpy.random.randint(-1000, 1000, 2 ** 20).astype(numpy.int16)
+    mdct.mdct(pcm[:4096], framelength=2048)
+
+    tracemalloc.start()
+    try:
+        spec = mdct.mdct(pcm, framelength=2048, save_settings=False)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1.5 * spec.nbytes
+
+
+def test_integer_streaming(sig):
+    pcm = numpy.round((sig - 0.5) * 32767).astype(numpy.int16)
+
+    analyzer = mdct.streaming.Analyzer(framelength=256)
+    synthesizer = mdct.streaming.Synthesizer(
+        framelength=256, dtype=numpy.int16
+    )
+    spec = numpy.concatenate(
+        (analyzer.process(pcm), analyzer.flush()), axis=1
+    )
+    outsig = numpy.concatenate(
+        (synthesizer.process(spec), synthesizer.flush())
+    )
+
+    assert numpy.allclose(spec, mdct.mdct(pcm, framelength=256))
+    assert numpy.array_equal(outsig, pcm)
+
+
+def test_unsigned(sig, odd):
+    #
+    # Test if unsigned PCM is centered around its midpoint
+    #
+    pcm = numpy.round(sig * 255).astype(numpy.uint8)
+
+    spec = mdct.mdct(pcm, odd=odd, framelength=256)
+    spec2 = mdct.mdct((pcm - 128.) / 128, odd=odd, framelength=256)
+
+    assert numpy.allclose(spec, spec2)
+
+    analyzer = mdct.streaming.Analyzer(odd=odd, framelength=256)
+    assert numpy.allclose(numpy.concatenate(
+        (analyzer.process(pcm), analyzer.flush()), axis=1
+    ), spec2)
+
+    outsig = mdct.imdct(spec, framelength=256, dtype=numpy.uint8)
+
+    assert outsig.dtype == numpy.uint8
+    assert numpy.array_equal(outsig, pcm)
+
+    # Silence is at the midpoint, clipping at both ends
+    outsig = mdct.imdct(
+        mdct.mdct(numpy.linspace(-2, 2, 4096), framelength=256),
+        framelength=256, dtype=numpy.uint8,
+    )
+    assert outsig.min() == 0
+    assert outsig.max() == 255
+    assert outsig[2047] == 128 or outsig[2048] == 128
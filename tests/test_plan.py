@@ -0,0 +1,126 @@
+import pickle
+import pytest
+import numpy
+import mdct
+import mdct.plan
+
+
+@pytest.fixture(params=(
+    ('mdct', mdct.mdct, mdct.imdct),
+    ('mdst', mdct.mdst, mdct.imdst),
+    ('cmdct', mdct.cmdct, mdct.icmdct),
+))
+def function(request):
+    return request.param
+
+
+def test_plan(sig, function, odd, window, framelength):
+    #
+    # Test if plans equal the lapped transforms
+    #
+    kind, forward, inverse = function
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    plan = mdct.MDCTPlan(framelength, odd=odd, window=window, kind=kind)
+
+    spec = plan.forward(sig)
+    spec2 = forward(sig, odd=odd, window=window, framelength=framelength)
+
+    assert spec.shape == spec2.shape
+    assert numpy.allclose(spec, spec2)
+
+    outsig = plan.inverse(spec)
+
+    assert outsig.shape == sig.shape
+    assert numpy.allclose(outsig, sig)
+    assert numpy.allclose(inverse(spec), sig)
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(overlap=4),
+    dict(centered=False),
+    dict(window=mdct.windows.low_delay(256, 64)),
+])
+def test_plan_settings(sig, function, odd, kwargs):
+    kind, forward, inverse = function
+    plan = mdct.MDCTPlan(256, odd=odd, kind=kind, **kwargs)
+
+    spec = plan.forward(sig)
+    spec2 = forward(sig, odd=odd, framelength=256, **kwargs)
+
+    assert numpy.allclose(spec, spec2)
+    assert numpy.allclose(plan.inverse(spec), inverse(spec2))
+
+
+def test_frames(sig, function, odd):
+    #
+    # Test if single frames continue the alternation of even transforms
+    #
+    kind = function[0]
+    plan = mdct.MDCTPlan(256, odd=odd, kind=kind, centered=False)
+    spec = plan.forward(sig, frames_first=True)
+    frames = mdct.framing._frames(sig, 256, 128)
+
+    for i in (0, 1, 5):
+        assert numpy.allclose(plan.forward_frames(frames[i], first=i), spec[i])
+        assert numpy.allclose(
+            plan.inverse_frames(spec[i], first=i),
+            plan.inverse_frames(spec.data, first=0)[i],
+        )
+
+    assert numpy.allclose(plan.forward_frames(frames[3:], first=3), spec[3:])
+
+    with pytest.raises(ValueError):
+        plan.forward_frames(numpy.zeros(100))
+
+    with pytest.raises(ValueError):
+        plan.inverse_frames(numpy.zeros(100))
+
+
+def test_pickle(sig, odd):
+    plan = mdct.MDCTPlan(1024, odd=odd, kind='cmdct')
+    plan2 = pickle.loads(pickle.dumps(plan))
+
+    assert numpy.allclose(plan.forward(sig), plan2.forward(sig))
+
+
+def test_dtype(sig, odd):
+    plan = mdct.MDCTPlan(1024, odd=odd, dtype=numpy.float32)
+    spec = plan.forward(sig)
+
+    assert spec.dtype == numpy.float32
+    assert numpy.allclose(plan.inverse(spec), sig, atol=1e-5)
+
+    pcm = (sig * 10000).astype(numpy.int16)
+    plan = mdct.MDCTPlan(1024, odd=odd)
+    assert numpy.array_equal(
+        plan.inverse(plan.forward(pcm), dtype=numpy.int16), pcm
+    )
+
+
+@pytest.mark.parametrize("layout", ('channels_last', 'channels_first'))
+def test_out(sig, function, odd, layout):
+    #
+    # Test if spectrograms are written into given arrays
+    #
+    kind, forward, inverse = function
+    axis = 0 if layout == 'channels_first' else 1
+    sig = numpy.stack((sig, sig[::-1]), axis=axis)
+    plan = mdct.MDCTPlan(512, odd=odd, kind=kind)
+
+    spec = plan.forward(sig, layout=layout, save_settings=False)
+    out = numpy.zeros(spec.shape, dtype=plan.result_type)
+    result = plan.forward(sig, layout=layout, save_settings=False, out=out)
+
+    assert result is out
+    assert numpy.array_equal(out, spec)
+    assert numpy.allclose(
+        out, forward(sig, odd=odd, framelength=512, layout=layout)
+    )
+
+    with pytest.raises(ValueError):
+        plan.forward(sig, layout=layout, out=out[..., 1:])
+
+
+def test_kind():
+    with pytest.raises(ValueError):
+        mdct.MDCTPlan(kind='dct')
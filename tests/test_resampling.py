@@ -0,0 +1,81 @@
+import pytest
+import numpy
+import mdct
+import mdct.resampling
+import mdct.storage
+
+
+def tone(length, frequency, ratio=1):
+    time = (numpy.arange(length) + 0.5) / ratio - 0.5
+    return numpy.sin(2 * numpy.pi * frequency * time)
+
+
+@pytest.mark.parametrize("function", (mdct.mdct, mdct.mdst, mdct.cmdct))
+@pytest.mark.parametrize("factors", ((1, 2), (1, 4), (2, 1), (3, 2)))
+def test_resample(function, factors, odd, window):
+    #
+    # Test if resampled spectrograms equal the tone at the new sample rate
+    #
+    up, down = factors
+    sig = tone(16384, 0.02)
+    spec = function(sig, odd=odd, window=window)
+
+    out = mdct.resampling.resample(spec, up=up, down=down)
+
+    # Windows other than the cosine window do not exactly cancel aliasing
+    # at the new sample rate
+    margin = 2048 * up // down
+    assert len(out) == -(-len(sig) * up // down)
+    assert numpy.allclose(
+        out[margin:-margin], tone(len(out), 0.02, up / down)[margin:-margin],
+        atol=1e-2
+    )
+
+
+def test_identity(sig, odd):
+    spec = mdct.mdct(sig, odd=odd)
+
+    assert numpy.allclose(mdct.resampling.resample(spec), mdct.imdct(spec))
+
+
+def test_lowpass():
+    #
+    # Test if frequencies above the new Nyquist frequency are removed
+    #
+    spec = mdct.mdct(tone(16384, 0.3))
+    out = mdct.resampling.resample(spec, down=2)
+
+    assert numpy.allclose(out[1024:-1024], 0, atol=1e-2)
+
+
+def test_storage(tmpdir):
+    #
+    # Test if stored spectrograms with window arrays are resampled
+    #
+    sig = numpy.stack((tone(16384, 0.02), tone(16384, 0.01)), axis=1)
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, mdct.mdct(sig), dtype='int16')
+
+    out = mdct.resampling.resample(mdct.storage.load(filename), down=2)
+
+    assert out.shape == (8192, 2)
+    assert numpy.allclose(
+        out[1024:-1024, 1], tone(8192, 0.01, 0.5)[1024:-1024], atol=1e-3
+    )
+
+
+def test_layout():
+    sig = numpy.stack((tone(16384, 0.02), tone(16384, 0.01)))
+    spec = mdct.mdct(sig, layout='channels_first')
+
+    out = mdct.resampling.resample(spec, down=2)
+
+    assert out.shape == (2, 8192)
+
+
+def test_errors(sig):
+    with pytest.raises(ValueError):
+        mdct.resampling.resample(mdct.mdct(sig, framelength=1000), down=16)
+
+    with pytest.raises(TypeError):
+        mdct.resampling.resample(mdct.mdct(sig, save_settings=False), down=2)
@@ -0,0 +1,106 @@
+import pickle
+import pytest
+import numpy
+import mdct
+import mdct.sparse
+
+
+def dense_topk(spec, k):
+    # Zero all but the k largest coefficients of each frame
+    spec = numpy.array(spec)
+    order = numpy.argsort(-numpy.abs(spec), axis=0)
+    numpy.put_along_axis(spec, order[k:], 0, axis=0)
+    return spec
+
+
+@pytest.mark.parametrize("kind", ('mdct', 'mdst', 'cmdct'))
+@pytest.mark.parametrize("blocksize", (1, 7, 256))
+def test_topk(sig, odd, window, kind, blocksize):
+    #
+    # Test if sparse spectrograms keep the largest coefficients of the dense
+    # spectrogram, and invert like the thinned out dense spectrogram
+    #
+    spec = getattr(mdct, kind)(
+        sig, odd=odd, window=window, framelength=1024
+    )
+    sparse = getattr(mdct.sparse, kind)(
+        sig, k=16, odd=odd, window=window, blocksize=blocksize,
+        framelength=1024,
+    )
+    expected = dense_topk(spec, 16)
+
+    assert sparse.shape == spec.shape
+    assert sparse.nnz == 16 * spec.shape[1]
+    assert numpy.all(numpy.diff(sparse.offsets) == 16)
+    assert numpy.allclose(sparse.toarray(), expected)
+    assert numpy.allclose(
+        getattr(mdct, 'i' + kind)(sparse),
+        getattr(mdct, 'i' + kind)(mdct.types.Spectrogram(
+            expected, spec.settings
+        )),
+    )
+
+
+def test_threshold(sig, odd):
+    spec = mdct.mdct(sig, odd=odd)
+    sparse = mdct.sparse.mdct(sig, threshold=0.5, odd=odd)
+
+    assert numpy.allclose(
+        sparse.toarray(), numpy.where(numpy.abs(spec) >= 0.5, spec, 0)
+    )
+
+    both = mdct.sparse.mdct(sig, k=4, threshold=0.5, odd=odd)
+    assert numpy.allclose(
+        both.toarray(), numpy.where(numpy.abs(spec) >= 0.5, dense_topk(
+            spec, 4
+        ), 0)
+    )
+
+
+def test_all(sig, odd):
+    sparse = mdct.sparse.mdct(sig, k=4096, odd=odd)
+
+    assert numpy.allclose(sparse.toarray(), mdct.mdct(sig, odd=odd))
+    assert numpy.allclose(mdct.imdct(sparse), sig)
+
+
+def test_channels(sig, odd):
+    sig = numpy.stack((sig, sig[::-1]), axis=-1)
+    spec = mdct.mdct(sig, odd=odd)
+    sparse = mdct.sparse.mdct(sig, k=8, odd=odd, blocksize=3)
+
+    assert sparse.shape == spec.shape
+    assert len(sparse.offsets) == spec.shape[1] * 2 + 1
+    for channel in range(2):
+        assert numpy.allclose(
+            sparse.toarray()[..., channel], dense_topk(spec[..., channel], 8)
+        )
+    assert mdct.imdct(sparse).shape == sig.shape
+
+
+def test_chunks(sig):
+    sparse = mdct.sparse.mdct(numpy.array_split(sig, 5), k=8)
+
+    assert numpy.allclose(
+        sparse.toarray(), mdct.sparse.mdct(sig, k=8).toarray()
+    )
+
+
+def test_compact(sig):
+    sparse = mdct.sparse.mdct(sig, k=8)
+
+    assert sparse.indices.dtype == numpy.uint16
+    copy = pickle.loads(pickle.dumps(sparse))
+    assert numpy.array_equal(copy.toarray(), sparse.toarray())
+    assert copy.settings == sparse.settings
+
+
+def test_errors(sig):
+    with pytest.raises(ValueError):
+        mdct.sparse.mdct(sig)
+
+    with pytest.raises(ValueError):
+        mdct.sparse.mdct(sig, k=0)
+
+    with pytest.raises(ValueError):
+        mdct.types.SparseSpectrogram([0], [1.], [0, 1, 1], (4, 1), None)
@@ -0,0 +1,234 @@
+import io
+import pytest
+import numpy
+import mdct
+import mdct.storage
+
+
+@pytest.fixture(params=(
+    ('float16', 1e-3),
+    ('int8', 2e-2),
+    ('int16', 1e-4),
+))
+def storage(request):
+    return request.param
+
+
+@pytest.mark.parametrize("function", [
+    (mdct.mdct, mdct.imdct),
+    (mdct.cmdct, mdct.icmdct),
+])
+def test_roundtrip(tmpdir, sig, function, odd, window, storage):
+    #
+    # Test if stored spectrograms reconstruct within quantization error
+    #
+    dtype, tolerance = storage
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    spec = function[0](sig, odd=odd, window=window)
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype=dtype)
+    loaded = mdct.storage.load(filename)
+
+    assert loaded.shape == spec.shape
+    assert loaded.settings.odd == odd
+    assert numpy.allclose(
+        loaded, spec, rtol=0, atol=tolerance * numpy.abs(spec).max()
+    )
+
+    outsig = function[1](loaded)
+
+    assert outsig.shape == sig.shape
+    assert numpy.allclose(outsig, sig, rtol=0, atol=tolerance)
+
+
+def test_layout(tmpdir, sig):
+    sig = numpy.stack((sig, sig[::-1]))
+    spec = mdct.mdct(sig, layout='channels_first', frames_first=False)
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype='int16')
+    loaded = mdct.storage.load(filename)
+
+    assert loaded.shape == spec.shape
+    assert numpy.allclose(mdct.imdct(loaded), sig, atol=1e-4)
+
+
+def test_mmap(tmpdir, sig):
+    spec = mdct.mdct(sig)
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype='int8')
+
+    loaded = mdct.storage.load(filename)
+    assert isinstance(loaded.codes, numpy.memmap)
+    assert loaded.codes.dtype == numpy.int8
+
+    loaded2 = mdct.storage.load(filename, mmap=False)
+    assert not isinstance(loaded2.codes, numpy.memmap)
+    assert numpy.array_equal(loaded.codes, loaded2.codes)
+
+    frames = loaded.dequantize(2, 5)
+    assert numpy.allclose(frames, loaded.data[:, 2:5])
+
+
+def test_file_object(tmpdir, sig):
+    spec = mdct.mdct(sig)
+
+    f = io.BytesIO()
+    mdct.storage.save(f, spec)
+
+    filename = tmpdir.join('spec.mdct')
+    filename.write_binary(f.getvalue())
+    loaded = mdct.storage.load(str(filename))
+
+    assert numpy.allclose(loaded, spec, rtol=1e-3, atol=1e-3)
+
+    # Offsets in the header are relative to the start of the file
+    f = io.BytesIO(b'prefix')
+    f.seek(0, io.SEEK_END)
+    with pytest.raises(ValueError):
+        mdct.storage.save(f, spec)
+
+
+@pytest.mark.parametrize("frames_first", (True, False))
+def test_axis(tmpdir, frames_first):
+    sig = numpy.random.rand(2, 4096, 3)
+    spec = mdct.mdct(
+        sig, axis=1, framelength=256, frames_first=frames_first
+    )
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype='int16')
+    loaded = mdct.storage.load(filename)
+
+    assert loaded.settings.axis == 1
+    assert loaded.shape == spec.shape
+    assert numpy.allclose(loaded, spec, atol=1e-3)
+    assert numpy.allclose(
+        loaded.dequantize(2, 5),
+        numpy.take(spec.data, range(2, 5), axis=1 if frames_first else 2),
+        atol=1e-3,
+    )
+    assert numpy.allclose(mdct.imdct(loaded), sig, atol=1e-3)
+
+
+def test_errors(tmpdir, sig):
+    filename = str(tmpdir.join('spec.mdct'))
+
+    with pytest.raises(ValueError):
+        mdct.storage.save(filename, mdct.mdct(sig), dtype='int32')
+
+    with pytest.raises(TypeError):
+        mdct.storage.save(filename, mdct.mdct(sig, save_settings=False))
+
+    tmpdir.join('spec.mdct').write_binary(b'garbage')
+    with pytest.raises(ValueError):
+        mdct.storage.load(filename)
+
+
+def test_window_pair(tmpdir, sig):
+    window = mdct.windows.low_delay(2048, 512)
+    spec = mdct.mdct(sig, window=window, centered=False)
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype='int16')
+    loaded = mdct.storage.load(filename)
+
+    assert numpy.allclose(loaded.settings.window[1], window[1])
+    assert numpy.allclose(
+        mdct.imdct(loaded)[2048:-2048], sig[2048:-2048], atol=1e-4
+    )
+
+
+def test_open_memmap(tmpdir, sig, storage):
+    #
+    # Test if spectrograms written frame by frame equal saved ones
+    #
+    dtype, tolerance = storage
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    spec = mdct.cmdct(sig)
+    canonical = numpy.moveaxis(spec.data, -1, 0).swapaxes(-1, -2)
+    peak = numpy.stack((
+        numpy.abs(canonical.real).max(axis=(0, 1)),
+        numpy.abs(canonical.imag).max(axis=(0, 1)),
+    ), axis=-1).ravel()
+
+    filename = str(tmpdir.join('spec.mdct'))
+    written = mdct.storage.open_memmap(
+        filename, spec.settings, canonical.shape, complex=True, dtype=dtype,
+        peak=peak, metadata={'samplerate': 8000},
+    )
+    for start in range(0, spec.shape[1], 3):
+        written.quantize(spec[:, start:start + 3], start)
+    written.codes.flush()
+
+    mdct.storage.save(str(tmpdir.join('saved.mdct')), spec, dtype=dtype)
+    loaded = mdct.storage.load(filename)
+    saved = mdct.storage.load(str(tmpdir.join('saved.mdct')))
+
+    assert loaded.metadata == {'samplerate': 8000}
+    assert numpy.array_equal(loaded.codes, saved.codes)
+    assert numpy.allclose(mdct.icmdct(loaded), sig, atol=tolerance)
+
+
+def test_open_memmap_peak(tmpdir, sig):
+    spec = mdct.mdct(sig)
+
+    with pytest.raises(ValueError):
+        mdct.storage.open_memmap(
+            str(tmpdir.join('spec.mdct')), spec.settings, spec.shape[::-1],
+            dtype='int8',
+        )
+
+
+def test_float16_overflow(tmpdir, sig):
+    #
+    # Test if coefficients too large for float16 are rejected, not stored
+    # as infinity
+    #
+    spec = mdct.mdct(sig * 1e5)
+    filename = str(tmpdir.join('spec.mdct'))
+
+    with pytest.raises(ValueError):
+        mdct.storage.save(filename, spec)
+
+    with pytest.raises(ValueError):
+        mdct.storage.open_memmap(
+            filename, spec.settings, spec.shape[::-1],
+            peak=numpy.abs(spec.data).max(axis=1),
+        )
+
+    written = mdct.storage.open_memmap(
+        filename, spec.settings, spec.shape[::-1]
+    )
+    with pytest.raises(ValueError):
+        written.quantize(spec)
+
+    mdct.storage.save(filename, spec, dtype='int16')
+    assert numpy.isfinite(mdct.storage.load(filename).data).all()
+
+
+def test_numpy_settings(tmpdir, sig):
+    #
+    # Test if settings given as NumPy scalars are stored as plain numbers
+    #
+    spec = mdct.mdct(
+        sig, framelength=numpy.int64(512), hopsize=numpy.int32(256),
+        centered=numpy.bool_(True),
+    )
+    spec = mdct.types.Spectrogram(
+        spec.data, spec.settings._replace(outlength=numpy.int64(len(sig)))
+    )
+
+    filename = str(tmpdir.join('spec.mdct'))
+    mdct.storage.save(filename, spec, dtype='int16', metadata={
+        'samplerate': numpy.int64(8000),
+    })
+    loaded = mdct.storage.load(filename)
+
+    assert loaded.settings.framelength == 512
+    assert loaded.settings.hopsize == 256
+    assert loaded.settings.outlength == len(sig)
+    assert loaded.metadata == {'samplerate': 8000}
+    assert numpy.allclose(mdct.imdct(loaded), sig, atol=1e-4)
@@ -0,0 +1,184 @@
+import asyncio
+import functools
+import pytest
+import numpy
+import mdct
+import mdct.aio
+import mdct.streaming
+import mdct.windows
+
+
+@pytest.fixture(params=('mdct', 'mdst', 'cmdct'))
+def kind(request):
+    return request.param
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def aiterate(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+async def collect(generator):
+    return [item async for item in generator]
+
+
+def test_analyzer(sig, kind, odd, framelength):
+    #
+    # Test if chunked analysis equals transforming the whole signal
+    #
+    sig = sig[:-100]
+    spec = getattr(mdct, kind)(sig, odd=odd, framelength=framelength)
+
+    analyzer = mdct.streaming.Analyzer(
+        kind, odd=odd, framelength=framelength
+    )
+    blocks = [analyzer.process(chunk) for chunk in numpy.array_split(sig, 7)]
+    blocks.append(analyzer.flush())
+    spec2 = numpy.concatenate(blocks, axis=1)
+
+    assert spec.shape == spec2.shape
+    assert numpy.allclose(spec, spec2)
+
+
+def test_synthesizer(sig, kind, odd, framelength):
+    #
+    # Test if chunked synthesis is perfect reconstructing
+    #
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    analyzer = mdct.streaming.Analyzer(
+        kind, odd=odd, framelength=framelength
+    )
+    spec = numpy.concatenate(
+        (analyzer.process(sig), analyzer.flush()), axis=1
+    )
+
+    synthesizer = mdct.streaming.Synthesizer(
+        'i' + kind, odd=odd, framelength=framelength, outlength=len(sig)
+    )
+    chunks = [
+        synthesizer.process(block)
+        for block in numpy.array_split(spec, 5, axis=1)
+    ]
+    chunks.append(synthesizer.flush())
+    outsig = numpy.concatenate(chunks)
+
+    assert outsig.shape == sig.shape
+    assert numpy.allclose(outsig, sig)
+
+
+def test_aio(sig, odd):
+    #
+    # Test if asynchronous transforms are perfect reconstructing
+    #
+    spec = numpy.concatenate(run(collect(
+        mdct.aio.mdct(aiterate(numpy.array_split(sig, 9)), odd=odd)
+    )), axis=1)
+
+    assert numpy.allclose(spec, mdct.mdct(sig, odd=odd))
+
+    outsig = numpy.concatenate(run(collect(
+        mdct.aio.imdct(
+            aiterate(numpy.array_split(spec, 3, axis=1)),
+            odd=odd,
+            outlength=len(sig),
+            maxsize=2,
+        )
+    )))
+
+    assert numpy.allclose(outsig, sig)
+
+
+def test_aio_error():
+    async def failing():
+        yield numpy.zeros(100)
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        run(collect(mdct.aio.mdct(failing())))
+
+
+def test_aio_close(sig):
+    #
+    # Test if closing the generator early awaits the reader
+    #
+    async def first():
+        chunks = aiterate(numpy.array_split(sig, 9))
+        generator = mdct.aio.mdct(chunks, framelength=256)
+        out = await generator.__anext__()
+        await generator.aclose()
+        return out, [
+            task for task in asyncio.all_tasks()
+            if task is not asyncio.current_task()
+        ]
+
+    out, pending = run(first())
+
+    assert out.size
+    assert pending == []
+
+
+@pytest.mark.parametrize("window", [
+    None,
+    functools.partial(mdct.windows.low_overlap, overlap=16),
+    functools.partial(mdct.windows.low_delay, overlap=16),
+])
+@pytest.mark.parametrize("centered", (True, False))
+def test_latency(window, kind, centered):
+    #
+    # Test if samples are emitted as soon as the latency permits
+    #
+    framelength = 64
+    sig = numpy.random.rand(500)
+    latency = mdct.windows.latency(framelength, window)
+
+    analyzer = mdct.streaming.Analyzer(
+        kind, framelength=framelength, window=window, centered=centered
+    )
+    synthesizer = mdct.streaming.Synthesizer(
+        'i' + kind, framelength=framelength, window=window,
+        centered=centered, outlength=len(sig)
+    )
+
+    chunks = []
+    delays = []
+    for n, sample in enumerate(sig, 1):
+        chunks.append(synthesizer.process(analyzer.process(sig[n - 1:n])))
+        emitted = sum(len(c) for c in chunks)
+        delays.append(emitted - max(n - latency + 1, 0))
+
+    chunks.append(synthesizer.process(analyzer.flush()))
+    chunks.append(synthesizer.flush())
+
+    # Non-centered transforms cannot reconstruct the first half frame
+    assert min(delays[framelength:]) == 0
+    assert numpy.allclose(numpy.concatenate(chunks)[64:-64], sig[64:-64])
+
+
+@pytest.mark.parametrize("blocksize", (1, 3))
+def test_iterate(tmpdir, sig, kind, odd, blocksize):
+    #
+    # Test if blocks of frames equal the transform of the whole signal
+    #
+    sig = numpy.stack((sig, sig[::-1]), axis=1)
+    spec = getattr(mdct, kind)(sig, odd=odd, framelength=1024)
+
+    filename = str(tmpdir.join('signal.raw'))
+    sig.tofile(filename)
+    memmap = numpy.memmap(filename, dtype=sig.dtype, shape=sig.shape)
+
+    for source in (memmap, numpy.array_split(sig, 7)):
+        blocks = list(getattr(mdct, 'iter_' + kind)(
+            source, odd=odd, framelength=1024, blocksize=blocksize
+        ))
+
+        assert all(0 < block.shape[1] <= blocksize for block in blocks)
+        assert numpy.allclose(numpy.concatenate(blocks, axis=1), spec)
@@ -0,0 +1,101 @@
+import pickle
+import threading
+import pytest
+import numpy
+import mdct
+import mdct.autotune
+import mdct.fast.engines
+
+
+def concurrently(function, count=8):
+    """ Call function from count threads at once, return their results
+
+    """
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        results[i] = function(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+@pytest.mark.parametrize("function", ('mdct', 'mdst', 'cmdct'))
+def test_transforms(sig, odd, function):
+    #
+    # Test if concurrent transforms of fresh frame lengths equal serial ones
+    #
+    mdct.fast.transforms._twiddles.clear()
+    forward = getattr(mdct, function)
+    inverse = getattr(mdct, 'i' + function)
+
+    def transform(i):
+        framelength = (i % 4 + 1) * 256
+        spec = forward(sig, odd=odd, framelength=framelength)
+        return framelength, spec, inverse(spec)
+
+    for framelength, spec, out in concurrently(transform):
+        assert numpy.allclose(
+            spec, forward(sig, odd=odd, framelength=framelength)
+        )
+        assert numpy.allclose(out, sig)
+
+
+def test_gemm(odd, random):
+    engine = mdct.fast.engines.GEMM()
+    frames = numpy.random.rand(16, 256)
+
+    results = concurrently(lambda i: engine.mdct(frames, odd=odd))
+
+    assert len(engine._matrices) == 1
+    for result in results:
+        assert numpy.allclose(
+            result, mdct.fast.transforms.mdct(frames, odd=odd)
+        )
+
+
+def test_autotuner(random):
+    tuner = mdct.autotune.Autotuner(frames=4, repeat=1)
+    frames = numpy.random.rand(16, 256)
+    benchmarks = []
+    benchmark = tuner._benchmark
+
+    def counting(*args):
+        benchmarks.append(args)
+        return benchmark(*args)
+
+    tuner._benchmark = counting
+    results = concurrently(lambda i: tuner.mdct(frames))
+
+    assert len(benchmarks) == 1
+    for result in results:
+        assert numpy.allclose(result, mdct.fast.transforms.mdct(frames))
+
+
+def test_cached():
+    cache = {}
+
+    value = mdct.framing._cached(cache, 'a', lambda: numpy.zeros(3))
+
+    assert not value.flags.writeable
+    assert mdct.framing._cached(cache, 'a', lambda: None) is value
+    for i in range(4):
+        mdct.framing._cached(cache, i, lambda: i, maxsize=2)
+    assert len(cache) <= 2
+
+
+def test_pickle():
+    tuner = mdct.autotune.Autotuner()
+    tuner.winners['mdct/256/odd/float64'] = 'fft'
+
+    copy = pickle.loads(pickle.dumps(tuner))
+
+    assert copy.winners == tuner.winners
+    assert copy.select('mdct', 256, True, numpy.float64).name == 'fft'
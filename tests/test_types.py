@@ -0,0 +1,115 @@
+import pickle
+import pytest
+import numpy
+import mdct
+import mdct.sparse
+import mdct.types
+
+
+@pytest.mark.parametrize("function", [
+    (mdct.mdct, mdct.imdct),
+    (mdct.mdst, mdct.imdst),
+    (mdct.cmdct, mdct.icmdct),
+])
+def test_infer_settings(sig, function, odd, window, framelength):
+    #
+    # Test if inverse transforms infer all settings from the spectrogram
+    #
+    spec = function[0](
+        sig[:-10], odd=odd, window=window, framelength=framelength
+    )
+
+    assert isinstance(spec, mdct.types.Spectrogram)
+    assert spec.settings.framelength == framelength
+    assert spec.settings.odd == odd
+
+    outsig = function[1](spec)
+
+    assert outsig.shape == sig[:-10].shape
+    assert numpy.allclose(outsig, sig[:-10])
+
+
+def test_spectrogram_type(sig):
+    spec = mdct.mdct(sig)
+
+    assert not hasattr(spec, '__dict__')
+    assert numpy.asarray(spec) is spec.data
+    assert type(spec ** 2) is numpy.ndarray
+    assert type(numpy.abs(spec)) is numpy.ndarray
+    assert numpy.allclose(spec * 2, 2 * spec.data)
+    assert numpy.allclose(spec[:, 0], spec.data[:, 0])
+
+    with pytest.raises(AttributeError):
+        spec.settings.framelength = 1024
+
+
+def test_forwarding(sig):
+    #
+    # Test if array methods and attributes are forwarded to the data
+    #
+    spec = mdct.mdct(numpy.stack((sig, sig[::-1]), axis=1))
+
+    assert type(spec.copy()) is numpy.ndarray
+    assert numpy.array_equal(spec.copy(), spec.data)
+    assert spec.reshape(-1).shape == (spec.size,)
+    assert spec.sum() == spec.data.sum()
+    assert spec.max() == spec.data.max()
+    assert spec.astype(numpy.float32).dtype == numpy.float32
+    assert spec.flags.c_contiguous
+
+    with pytest.raises(AttributeError):
+        spec.missing
+
+    with pytest.raises(AttributeError):
+        mdct.types.Spectrogram.__new__(mdct.types.Spectrogram).data
+
+
+def test_array_copy(sig):
+    #
+    # Test the copy keyword of the NumPy 2 array protocol
+    #
+    spec = mdct.mdct(sig)
+
+    assert spec.__array__(copy=None) is spec.data
+    assert spec.__array__(copy=False) is spec.data
+    copy = spec.__array__(copy=True)
+    assert copy is not spec.data
+    assert numpy.array_equal(copy, spec.data)
+    assert spec.__array__(numpy.float32, copy=True).dtype == numpy.float32
+
+    with pytest.raises(ValueError):
+        spec.__array__(numpy.float32, copy=False)
+
+    sparse = mdct.sparse.mdct(sig, k=8)
+    assert numpy.array_equal(
+        sparse.__array__(copy=True), sparse.__array__(copy=None)
+    )
+
+    with pytest.raises(ValueError):
+        sparse.__array__(copy=False)
+
+
+def test_pickle(sig):
+    spec = mdct.mdct(
+        sig, window=mdct.windows.kaiser_derived(2048, beta=4.)
+    )
+    spec2 = pickle.loads(pickle.dumps(spec))
+
+    assert numpy.array_equal(spec2, spec)
+    assert numpy.array_equal(spec2.settings.window, spec.settings.window)
+    assert numpy.allclose(mdct.imdct(spec2), sig)
+
+
+def test_readonly_window(sig):
+    window = mdct.windows.kaiser_derived(2048, beta=4.)
+    spec = mdct.mdct(sig, window=window)
+    window[:] = 0
+
+    assert not spec.settings.window.flags.writeable
+    assert numpy.allclose(mdct.imdct(spec), sig)
+
+
+def test_plain_array(sig):
+    spec = mdct.mdct(sig, save_settings=False)
+
+    assert type(spec) is numpy.ndarray
@@ -1,5 +1,7 @@
+import functools
 import pytest
 import numpy
+import mdct
 import mdct.windows
 
 
@@ -23,3 +25,53 @@ def test_kbd():
     assert numpy.allclose(
         mdct.windows.kaiser_derived(6, beta=numpy.pi/2)[:3],
         [0.436168993154, 0.707106781187, 0.899864772847])
+
+
+def test_low_overlap():
+    M = 256
+    w = mdct.windows.low_overlap(M, 64)
+
+    assert numpy.allclose(w[:M//2] ** 2 + w[-M//2:] ** 2, 1.)
+    assert numpy.allclose(w, w[::-1])
+    assert numpy.all(w[:32] == 0)
+
+    with pytest.raises(ValueError):
+        mdct.windows.low_overlap(M, 63)
+
+    with pytest.raises(ValueError):
+        mdct.windows.low_overlap(M, 256)
+
+
+@pytest.mark.parametrize("function", [
+    (mdct.mdct, mdct.imdct),
+    (mdct.mdst, mdct.imdst),
+    (mdct.cmdct, mdct.icmdct),
+])
+@pytest.mark.parametrize("window", [
+    functools.partial(mdct.windows.low_overlap, overlap=64),
+    functools.partial(mdct.windows.low_delay, overlap=64),
+    mdct.windows.low_delay(256, 128),
+])
+def test_low_delay(sig, function, window, odd):
+    #
+    # Test if low-overlap and low-delay windows are perfect reconstructing
+    #
+    spec = function[0](
+        sig, odd=odd, framelength=256, window=window, centered=False
+    )
+    outsig = function[1](spec)
+
+    assert numpy.allclose(outsig[256:-256], sig[256:-256])
+
+    spec = function[0](sig, odd=odd, framelength=256, window=window)
+    assert numpy.allclose(function[1](spec), sig)
+
+
+def test_latency():
+    assert mdct.windows.latency(256) == 256
+    assert mdct.windows.latency(
+        256, functools.partial(mdct.windows.low_overlap, overlap=64)
+    ) == 192
+    assert mdct.windows.latency(
+        256, functools.partial(mdct.windows.low_delay, overlap=32)
+    ) == 160